@@ -1,55 +1,31 @@
 import argparse
-from typing import Any, Optional
+import sys
+from pathlib import Path
+from typing import Any
 
-try:
-    import win32com.client  # type: ignore
-    import pythoncom  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
-    pythoncom = None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
-
-
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
+from QF_auto.connection import dispatch_qf_app, get_active_problem, _com_mods
 
 
 def _dump_methods(title: str, obj: Any) -> None:
+    _, pythoncom = _com_mods()
     if pythoncom is None:
         raise RuntimeError("pythoncom not available; install pywin32")
     ti = obj._oleobj_.GetTypeInfo()
     attr = ti.GetTypeAttr()
-    method_names = []
+    # Property get/put entries share a memid; only fetch names once per memid.
+    seen_memids: set[int] = set()
+    name_set: set[str] = set()
     for i in range(attr.cFuncs):
         fd = ti.GetFuncDesc(i)
+        if fd.memid in seen_memids:
+            continue
+        seen_memids.add(fd.memid)
         names = ti.GetNames(fd.memid)
         if names:
-            method_names.append(names[0])
-    method_names = sorted(set(method_names))
+            name_set.add(names[0])
+    method_names = sorted(name_set)
     print(f"{title} methods ({len(method_names)}):")
     for name in method_names:
         print(f"- {name}")
@@ -108,8 +84,8 @@ def main() -> int:
     parser.add_argument("--label", default="", help="Label name to get a ShapeRange via LabeledAs")
     args = parser.parse_args()
 
-    qf = _dispatch_app()
-    prb = _get_active_problem(qf)
+    qf = dispatch_qf_app()
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found. Open a problem in QuickField and retry.")
         return 2
@@ -1,141 +1,132 @@
+import functools
+import sys
+from pathlib import Path
 from typing import Any, Optional
 
-try:
-    import win32com.client  # type: ignore
-    import pythoncom  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
-    pythoncom = None
-
-
-VT_MAP = {
-    pythoncom.VT_EMPTY: "VT_EMPTY",
-    pythoncom.VT_NULL: "VT_NULL",
-    pythoncom.VT_I2: "VT_I2",
-    pythoncom.VT_I4: "VT_I4",
-    pythoncom.VT_R4: "VT_R4",
-    pythoncom.VT_R8: "VT_R8",
-    pythoncom.VT_CY: "VT_CY",
-    pythoncom.VT_DATE: "VT_DATE",
-    pythoncom.VT_BSTR: "VT_BSTR",
-    pythoncom.VT_DISPATCH: "VT_DISPATCH",
-    pythoncom.VT_ERROR: "VT_ERROR",
-    pythoncom.VT_BOOL: "VT_BOOL",
-    pythoncom.VT_VARIANT: "VT_VARIANT",
-    pythoncom.VT_UNKNOWN: "VT_UNKNOWN",
-    pythoncom.VT_DECIMAL: "VT_DECIMAL",
-    pythoncom.VT_I1: "VT_I1",
-    pythoncom.VT_UI1: "VT_UI1",
-    pythoncom.VT_UI2: "VT_UI2",
-    pythoncom.VT_UI4: "VT_UI4",
-    pythoncom.VT_I8: "VT_I8",
-    pythoncom.VT_UI8: "VT_UI8",
-    pythoncom.VT_INT: "VT_INT",
-    pythoncom.VT_UINT: "VT_UINT",
-    pythoncom.VT_ARRAY: "VT_ARRAY",
-    pythoncom.VT_BYREF: "VT_BYREF",
-}
-
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
-
-
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from QF_auto.connection import (
+    collection_count,
+    dispatch_qf_app,
+    get_active_problem,
+    item_at,
+    _com_mods,
+)
+
+
+_VT_NAMES = (
+    "VT_EMPTY",
+    "VT_NULL",
+    "VT_I2",
+    "VT_I4",
+    "VT_R4",
+    "VT_R8",
+    "VT_CY",
+    "VT_DATE",
+    "VT_BSTR",
+    "VT_DISPATCH",
+    "VT_ERROR",
+    "VT_BOOL",
+    "VT_VARIANT",
+    "VT_UNKNOWN",
+    "VT_DECIMAL",
+    "VT_I1",
+    "VT_UI1",
+    "VT_UI2",
+    "VT_UI4",
+    "VT_I8",
+    "VT_UI8",
+    "VT_INT",
+    "VT_UINT",
+    "VT_ARRAY",
+    "VT_BYREF",
+)
 
 
 def _get_first_in_collection(collection: Any, label: str) -> Optional[Any]:
-    try:
-        count = int(collection.Count)
-    except Exception:
-        count = 0
-    if count <= 0:
+    if collection_count(collection) <= 0:
         print(f"No items found in {label}.")
         return None
     try:
-        return collection.Item(1)
+        return item_at(collection, 1)
     except Exception:
-        try:
-            return collection(1)
-        except Exception:
-            print(f"Failed to access first item in {label}.")
-            return None
+        print(f"Failed to access first item in {label}.")
+        return None
+
+
+@functools.cache
+def _vt_map() -> dict[int, str]:
+    # Resolved on first use so importing this script does not touch pythoncom.
+    _, pythoncom = _com_mods()
+    return {getattr(pythoncom, name): name for name in _VT_NAMES}
 
 
+@functools.cache
 def _vt_name(vt: int) -> str:
-    name = VT_MAP.get(vt, f"VT_{vt}")
-    return name
+    return _vt_map().get(vt, f"VT_{vt}")
 
 
 def _param_count(fd: Any) -> int:
+    # PyFUNCDESC is a sequence; index 2 holds the ELEMDESC tuple of arguments.
     try:
-        return int(getattr(fd, "cParams"))
+        return len(fd[2])
     except Exception:
-        pass
+        return int(getattr(fd, "cParams", 0))
+
+
+def _param_vt(fd: Any, index: int) -> int:
+    # ELEMDESC is (typedesc, flags, default); typedesc is a VT code or a
+    # (VT_PTR/VT_SAFEARRAY, inner) tuple.
+    tdesc = fd[2][index][0]
+    if isinstance(tdesc, tuple):
+        return tdesc[0]
+    return tdesc
+
+
+def _move_funcdescs(ti: Any) -> list[Any]:
+    # Bind jumps straight to the FUNCDESC by name; scan cFuncs only if the
+    # type info does not expose ITypeComp.
+    _, pythoncom = _com_mods()
     try:
-        params = getattr(fd, "lprgelemdescParam")
-        return len(params)
+        kind, fd = ti.GetTypeComp().Bind("Move", pythoncom.INVOKE_FUNC)
+        if kind == pythoncom.DESCKIND_FUNCDESC and fd is not None:
+            return [fd]
+        return []
     except Exception:
         pass
-    try:
-        return int(getattr(fd, "cParamsOpt"))
-    except Exception:
-        return 0
+
+    found = []
+    attr = ti.GetTypeAttr()
+    for i in range(attr.cFuncs):
+        fd = ti.GetFuncDesc(i)
+        names = ti.GetNames(fd.memid)
+        if names and names[0] == "Move":
+            found.append(fd)
+    return found
 
 
 def _dump_move_signature(shape: Any) -> None:
+    _, pythoncom = _com_mods()
     if pythoncom is None:
         raise RuntimeError("pythoncom not available; install pywin32")
     ti = shape._oleobj_.GetTypeInfo()
-    attr = ti.GetTypeAttr()
-    found = False
-    for i in range(attr.cFuncs):
-        fd = ti.GetFuncDesc(i)
-        names = ti.GetNames(fd.memid)
-        if not names:
-            continue
-        if names[0] != "Move":
-            continue
-        found = True
+    funcdescs = _move_funcdescs(ti)
+    for fd in funcdescs:
         params = []
         pcount = _param_count(fd)
         for p in range(pcount):
             try:
-                td = fd.lprgelemdescParam[p].tdesc
-                vt = td.vt
-                params.append(_vt_name(vt))
+                params.append(_vt_name(_param_vt(fd, p)))
             except Exception:
                 params.append("UNKNOWN")
         print(f"Move method: params={pcount} types={params}")
-    if not found:
+    if not funcdescs:
         print("Move method signature not found in type info.")
 
 
 def main() -> int:
-    qf = _dispatch_app()
-    prb = _get_active_problem(qf)
+    qf = dispatch_qf_app()
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found. Open a problem in QuickField and retry.")
         return 2
@@ -1,39 +1,12 @@
 import argparse
+import sys
+from pathlib import Path
 from typing import Any, Optional, Sequence
 
-try:
-    import win32com.client  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
-
-
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
+from QF_auto.cli import _labels
+from QF_auto.connection import dispatch_qf_app, get_active_problem, rebuild_model
 
 
 def _get_shapes_by_label(model: Any, label_name: str) -> Any:
@@ -42,15 +15,6 @@ def _get_shapes_by_label(model: Any, label_name: str) -> Any:
     return shapes.LabeledAs(label_name)
 
 
-def _rebuild(qf: Any, prb: Any) -> None:
-    # Try common rebuild hooks; ignore failures.
-    for obj in (prb, qf):
-        try:
-            obj.Rebuild()
-        except Exception:
-            pass
-
-
 def _try_moves(target: Any, qf: Any, dx: float, dy: float) -> Optional[str]:
     # ActiveField Move signature is not explicit in some docs; try common variants.
     attempts: Sequence[tuple[str, tuple[Any, ...]]] = []
@@ -145,15 +109,12 @@ def _shape_label_name(shape: Any) -> str:
     return ""
 
 
-def _parse_labels(value: str) -> list[str]:
-    return [v.strip() for v in value.split(",") if v.strip()]
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(description="ActiveField label move test")
     parser.add_argument(
         "--label",
         required=True,
+        type=_labels,
         help="Exact label name(s), comma-separated (block labels)",
     )
     parser.add_argument("--delta", type=float, default=0.5, help="Delta X (mm)")
@@ -161,8 +122,8 @@ def main() -> int:
     parser.add_argument("--no-restore", action="store_true", help="Do not restore original position")
     args = parser.parse_args()
 
-    qf = _dispatch_app()
-    prb = _get_active_problem(qf)
+    qf = dispatch_qf_app()
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found. Open a problem in QuickField and retry.")
         return 2
@@ -176,7 +137,7 @@ def main() -> int:
             print(f"Model not loaded: {exc}")
             return 3
 
-    labels = _parse_labels(args.label)
+    labels = list(args.label)
     if not labels:
         print("No label names provided.")
         return 4
@@ -217,7 +178,7 @@ def main() -> int:
                 print(f"Move failed for '{name}'. Could not find a compatible Move signature.")
                 return 7
     print(f"Moved shapes using {move_used} (dx={args.delta}, dy={args.dy})")
-    _rebuild(qf, prb)
+    rebuild_model(qf, prb)
 
     if not args.no_restore:
         for name, shapes in shape_ranges:
@@ -226,7 +187,7 @@ def main() -> int:
                 if move_back is None:
                     print(f"Restore move failed for '{name}'.")
                     return 6
-        _rebuild(qf, prb)
+        rebuild_model(qf, prb)
         print("Restored shapes to original position.")
 
     return 0
@@ -1,39 +1,11 @@
 import argparse
-from typing import Any, Optional, Sequence, Tuple
+import sys
+from pathlib import Path
+from typing import Any, Sequence, Tuple
 
-try:
-    import win32com.client  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
-
-
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
+from QF_auto.connection import dispatch_qf_app, get_active_problem, rebuild_model
 
 
 def _iter_all_shapes(shapes: Any):
@@ -144,14 +116,6 @@ def _try_point_assign(shape: Any, qf: Any, dx: float, dy: float) -> Tuple[bool,
         return False, f"Point set failed: {exc}"
 
 
-def _rebuild(qf: Any, prb: Any) -> None:
-    for obj in (prb, qf):
-        try:
-            obj.Rebuild()
-        except Exception:
-            pass
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(description="Try move variants on a labeled shape")
     parser.add_argument("--label", required=True, help="Exact label name")
@@ -160,8 +124,8 @@ def main() -> int:
     parser.add_argument("--no-restore", action="store_true", help="Do not restore original position")
     args = parser.parse_args()
 
-    qf = _dispatch_app()
-    prb = _get_active_problem(qf)
+    qf = dispatch_qf_app()
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found. Open a problem in QuickField and retry.")
         return 2
@@ -187,14 +151,14 @@ def main() -> int:
         return 4
 
     print(f"Moved using {how} (dx={args.delta}, dy={args.dy})")
-    _rebuild(qf, prb)
+    rebuild_model(qf, prb)
 
     if not args.no_restore:
         ok2, how2 = _try_move_variants(shape, qf, -args.delta, -args.dy)
         if not ok2:
             ok2, how2 = _try_point_assign(shape, qf, -args.delta, -args.dy)
         if ok2:
-            _rebuild(qf, prb)
+            rebuild_model(qf, prb)
             print("Restored to original position.")
         else:
             print(f"Restore failed: {how2}")
@@ -1,21 +1,10 @@
 import sys
+from pathlib import Path
 from typing import Any, Optional
 
-try:
-    import win32com.client  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-
-    # EnsureDispatch can expose constants when available; fall back to Dispatch.
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
+from QF_auto.connection import dispatch_qf_app, get_active_problem
 
 
 def _get_const(qf: Any, name: str) -> Optional[int]:
@@ -34,27 +23,6 @@ def _get_const(qf: Any, name: str) -> Optional[int]:
     return None
 
 
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
-
-
 def _safe_get(obj: Any, attr: str) -> str:
     try:
         value = getattr(obj, attr)
@@ -95,13 +63,13 @@ def _dump_labels_by_guess(doc: Any) -> None:
 def main() -> int:
     print("QuickField ActiveField COM probe")
     try:
-        qf = _dispatch_app()
+        qf = dispatch_qf_app()
     except Exception as exc:
         print(f"Failed to create QuickField.Application: {exc}")
         return 1
 
     print(f"- Version: {_safe_get(qf, 'Version')}")
-    prb = _get_active_problem(qf)
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found.")
         print("Open a problem in QuickField, then re-run this script.")
@@ -1,61 +1,21 @@
 import argparse
-from typing import Any, Optional
+import sys
+from pathlib import Path
 
-try:
-    import win32com.client  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
-
-
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
-
-
-def _rebuild(qf: Any, prb: Any) -> None:
-    for obj in (prb, qf):
-        try:
-            obj.Rebuild()
-        except Exception:
-            pass
-
-
-def _parse_labels(value: str) -> list[str]:
-    return [v.strip() for v in value.split(",") if v.strip()]
+from QF_auto.cli import _labels
+from QF_auto.connection import dispatch_qf_app, get_active_problem, rebuild_model
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Try moving Selection by adjusting Left/Right")
-    parser.add_argument("--labels", required=True, help="Comma-separated label names")
+    parser.add_argument("--labels", required=True, type=_labels, help="Comma-separated label names")
     parser.add_argument("--delta", type=float, default=1.0, help="Delta X (mm)")
     args = parser.parse_args()
 
-    qf = _dispatch_app()
-    prb = _get_active_problem(qf)
+    qf = dispatch_qf_app()
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found. Open a problem in QuickField and retry.")
         return 2
@@ -70,7 +30,7 @@ def main() -> int:
             return 3
 
     sel = model.Selection
-    labels = _parse_labels(args.labels)
+    labels = list(args.labels)
     if not labels:
         print("No labels provided.")
         return 4
@@ -113,7 +73,7 @@ def main() -> int:
         print(f"Selection.Move() failed: {exc}")
 
     if moved:
-        _rebuild(qf, prb)
+        rebuild_model(qf, prb)
         print("Rebuild done.")
     else:
         print("No movement method succeeded.")
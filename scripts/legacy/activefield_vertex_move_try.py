@@ -1,39 +1,12 @@
 import argparse
-from typing import Any, Optional
+import sys
+from pathlib import Path
+from typing import Any
 
-try:
-    import win32com.client  # type: ignore
-except Exception:  # pragma: no cover - runtime dependency
-    win32com = None
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
 
-
-def _dispatch_app() -> Any:
-    if win32com is None:
-        raise RuntimeError("pywin32 is not installed. Run: pip install pywin32")
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
-
-
-def _get_active_problem(qf: Any) -> Optional[Any]:
-    try:
-        prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
-    except Exception:
-        pass
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
-        if count > 0:
-            try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
-    except Exception:
-        pass
-    return None
+from QF_auto.cli import _labels
+from QF_auto.connection import dispatch_qf_app, get_active_problem, rebuild_model
 
 
 def _iter_collection(col: Any):
@@ -64,18 +37,6 @@ def _iter_collection(col: Any):
         i += 1
 
 
-def _parse_labels(value: str) -> list[str]:
-    return [v.strip() for v in value.split(",") if v.strip()]
-
-
-def _rebuild(qf: Any, prb: Any) -> None:
-    for obj in (prb, qf):
-        try:
-            obj.Rebuild()
-        except Exception:
-            pass
-
-
 def _move_vertex(vtx: Any, qf: Any, dx: float, dy: float) -> bool:
     # Try Point property/field first
     try:
@@ -108,13 +69,13 @@ def _move_vertex(vtx: Any, qf: Any, dx: float, dy: float) -> bool:
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Try moving vertices for labeled blocks")
-    parser.add_argument("--labels", required=True, help="Comma-separated block labels")
+    parser.add_argument("--labels", required=True, type=_labels, help="Comma-separated block labels")
     parser.add_argument("--delta", type=float, default=1.0, help="Delta X (mm)")
     parser.add_argument("--dy", type=float, default=0.0, help="Delta Y (mm)")
     args = parser.parse_args()
 
-    qf = _dispatch_app()
-    prb = _get_active_problem(qf)
+    qf = dispatch_qf_app()
+    prb = get_active_problem(qf)
     if prb is None:
         print("No active problem found. Open a problem in QuickField and retry.")
         return 2
@@ -128,7 +89,7 @@ def main() -> int:
             print(f"Model not loaded: {exc}")
             return 3
 
-    labels = _parse_labels(args.labels)
+    labels = list(args.labels)
     if not labels:
         print("No labels provided.")
         return 4
@@ -158,7 +119,7 @@ def main() -> int:
 
     print(f"Vertices moved: {moved}/{total}")
     if moved > 0:
-        _rebuild(qf, prb)
+        rebuild_model(qf, prb)
         print("Rebuild done.")
     else:
         print("No vertices moved. This COM path might be read-only.")
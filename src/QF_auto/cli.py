@@ -1,206 +1,263 @@
 ﻿from __future__ import annotations
 
 import argparse
+import importlib
 from pathlib import Path
 import sys
+from typing import Callable
 
-from .connection import cmd_probe, cmd_sweep, cmd_table, cmd_gen_cases
-from .geometry import (
-    cmd_move_block,
-    cmd_move_blocks_once,
-    cmd_list_blocks,
-    cmd_block_bounds,
-    cmd_model,
+
+def _lazy(module: str, name: str) -> Callable[[argparse.Namespace], int]:
+    # Import the command module on first call so --help and unrelated
+    # sub-commands do not pay for pywin32/tkinter imports.
+    def run(args: argparse.Namespace) -> int:
+        return getattr(importlib.import_module(module, __package__), name)(args)
+
+    return run
+
+
+def _labels(value: str) -> tuple[str, ...]:
+    # Split --labels once at parse time, dropping repeated names; interned
+    # names keep later dict lookups by label cheap.
+    return tuple(dict.fromkeys(sys.intern(s) for s in map(str.strip, value.split(",")) if s))
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {value}")
+    return number
+
+
+_PBM = ("--pbm", {"default": "", "help": "Open PBM if no active problem"})
+_PBM_OPTIONAL = ("--pbm", {"default": "", "help": "PBM path (optional if a problem is already open)"})
+_MODEL = ("--model", {"default": "", "help": "Optional path to .mod file"})
+_NO_SAVE = ("--no-save", {"action": "store_true", "help": "Leave the DataDoc unsaved (for chained commands)"})
+_OUT = ("--out", {"default": "", "help": "Output CSV path"})
+_QLM = ("--qlm", {"default": "", "help": "Path to QLM file"})
+_PRECISION = (
+    "--precision",
+    {
+        "type": int,
+        "default": None,
+        "help": "Use float positions rounded to N decimals instead of exact Decimal steps",
+    },
+)
+_JOBS = ("--jobs", {"type": int, "default": 1, "help": "Number of QLMCall runs in parallel (default 1)"})
+_BATCH_SIZE = (
+    "--batch-size",
+    {"type": int, "default": 1, "help": "Parameter rows per QLMCall --batch invocation (default 1)"},
+)
+_RANGE = (
+    ("--start", {"required": True, "help": "Start value"}),
+    ("--end", {"required": True, "help": "End value"}),
+    ("--step", {"required": True, "help": "Step value"}),
 )
-from .labels import (
-    cmd_clone_label,
-    cmd_create_coil_label,
-    cmd_assign_label,
-    cmd_set_current,
-    cmd_label_dump,
-    cmd_label_pos,
+_DELTA = (
+    ("--dx", {"required": True, "help": "Delta X"}),
+    ("--dy", {"required": True, "help": "Delta Y"}),
 )
-from .solve import (
-    cmd_circuit_dump,
-    cmd_set_circuit_current,
-    cmd_com_probe,
-    cmd_solve_force,
-    cmd_result_dump,
-    cmd_solve_integral,
+_MESH = (
+    ("--mesh", {"action": "store_true", "help": "Build mesh before solving"}),
+    ("--remesh", {"action": "store_true", "help": "Remove mesh before rebuild"}),
+)
+_SOLVE = ("--solve", {"action": "store_true", "help": "Force solve before result"})
+
+# (command, help, arguments, (module, function))
+SUBCOMMANDS: tuple[tuple[str, str, tuple[tuple[str, dict], ...], tuple[str, str]], ...] = (
+    ("probe", "Print QuickField COM probe", (), (".connection", "cmd_probe")),
+    (
+        "sweep",
+        "Sweep QLMCall over a range of parameters",
+        (_QLM, *_RANGE, _PRECISION, _OUT, _JOBS, _BATCH_SIZE),
+        (".connection", "cmd_sweep"),
+    ),
+    (
+        "table",
+        "Run QLMCall from a table of inputs",
+        (_QLM, ("--table", {"required": True, "help": "CSV table path"}), _OUT, _JOBS, _BATCH_SIZE),
+        (".connection", "cmd_table"),
+    ),
+    (
+        "gen-cases",
+        "Generate cases CSV from template",
+        (*_RANGE, _PRECISION, _OUT),
+        (".connection", "cmd_gen_cases"),
+    ),
+    (
+        "move-block",
+        "Move block with a given label",
+        (("--label", {"required": True, "help": "Block label name"}), *_DELTA, _PBM, _MODEL),
+        (".geometry", "cmd_move_block"),
+    ),
+    (
+        "move-blocks-once",
+        "Move blocks as a group (union bounds)",
+        (
+            ("--labels", {"required": True, "type": _labels, "help": "Comma-separated labels"}),
+            *_DELTA,
+            _PBM,
+            _MODEL,
+            ("--eps", {"type": _positive_float, "default": 1e-9, "help": "Distance under which vertices count as one"}),
+            ("--jobs", {"type": int, "default": 1, "help": "Threads looking up label bounds in parallel (default 1)"}),
+            ("--debug", {"action": "store_true", "help": "Verbose selection debug"}),
+        ),
+        (".geometry", "cmd_move_blocks_once"),
+    ),
+    ("list-blocks", "List block labels in the model", (_PBM, _MODEL), (".geometry", "cmd_list_blocks")),
+    (
+        "block-bounds",
+        "Get bounds for block labels",
+        (("--labels", {"required": True, "type": _labels, "help": "Comma-separated labels"}), _PBM, _MODEL),
+        (".geometry", "cmd_block_bounds"),
+    ),
+    (
+        "clone-label",
+        "Clone a label to a new name",
+        (
+            ("--src", {"required": True, "help": "Source label name"}),
+            ("--dst", {"required": True, "help": "Destination label name"}),
+            ("--amps", {"default": "", "help": "Optional coil amps override"}),
+            _PBM,
+            _NO_SAVE,
+        ),
+        (".labels", "cmd_clone_label"),
+    ),
+    (
+        "assign-label",
+        "Assign a label to blocks with another label",
+        (
+            ("--src", {"required": True, "help": "Existing label to replace"}),
+            ("--dst", {"required": True, "help": "New label to assign"}),
+            _PBM,
+            _MODEL,
+        ),
+        (".labels", "cmd_assign_label"),
+    ),
+    (
+        "create-coil-label",
+        "Create a coil label with explicit values",
+        (
+            ("--name", {"required": True, "help": "New label name (e.g., bobine_100)"}),
+            ("--amps", {"required": True, "help": "Total Ampere-Turns (e.g., 100)"}),
+            ("--mu", {"default": "1", "help": "Relative permeability (default 1)"}),
+            _PBM,
+            _NO_SAVE,
+        ),
+        (".labels", "cmd_create_coil_label"),
+    ),
+    (
+        "set-current",
+        "Set coil current on a label",
+        (
+            ("--label", {"required": True, "help": "Block label name (e.g., bobine)"}),
+            ("--amps", {"required": True, "help": "Current value"}),
+            _PBM,
+            ("--reopen", {"action": "store_true", "help": "Re-open data doc to verify"}),
+            ("--save-dms", {"default": "", "help": "Save DataDoc to .dms path"}),
+            ("--verbose", {"action": "store_true", "help": "Print Loading/TotalCurrent before and after"}),
+            _NO_SAVE,
+        ),
+        (".labels", "cmd_set_current"),
+    ),
+    (
+        "label-dump",
+        "Dump label Content properties",
+        (("--label", {"required": True, "help": "Block label name (e.g., bobine)"}), _PBM),
+        (".labels", "cmd_label_dump"),
+    ),
+    (
+        "label-pos",
+        "Print block label position",
+        (("--label", {"required": True, "help": "Block label name"}), _PBM),
+        (".labels", "cmd_label_pos"),
+    ),
+    ("circuit-dump", "Dump circuit properties/items", (_PBM,), (".solve", "cmd_circuit_dump")),
+    (
+        "set-circuit-current",
+        "Set current on circuit/element",
+        (
+            ("--name", {"default": "", "help": "Circuit element name (if applicable)"}),
+            ("--amps", {"required": True, "help": "Current value"}),
+            _PBM,
+        ),
+        (".solve", "cmd_set_circuit_current"),
+    ),
+    (
+        "model",
+        "Auto-model via ActiveField COM plan",
+        (
+            (
+                "--plan",
+                {
+                    "default": str(Path(__file__).resolve().parents[2] / "config" / "modeling.json"),
+                    "help": "Path to modeling plan JSON",
+                },
+            ),
+            ("--pbm", {"default": "", "help": "Override PBM path in plan"}),
+            ("--model", {"default": "", "help": "Override model path in plan"}),
+            ("--save-as", {"default": "", "help": "Override save_model_as in plan"}),
+            ("--use-active", {"action": "store_true", "help": "Use active problem if no PBM is provided"}),
+            ("--dry-run", {"action": "store_true", "help": "Validate plan only"}),
+        ),
+        (".geometry", "cmd_model"),
+    ),
+    ("com-probe", "Dump COM method names", (_PBM, _MODEL), (".solve", "cmd_com_probe")),
+    (
+        "solve-force",
+        "Solve and dump mechanical force",
+        (_PBM_OPTIONAL, ("--label", {"required": True, "help": "Block label"}), *_MESH, _SOLVE),
+        (".solve", "cmd_solve_force"),
+    ),
+    (
+        "result-dump",
+        "Dump result blocks/force candidates",
+        (_PBM_OPTIONAL, ("--label", {"default": "", "help": "Block label to inspect"}), _SOLVE),
+        (".solve", "cmd_result_dump"),
+    ),
+    (
+        "solve-integral",
+        "Solve and evaluate integral",
+        (
+            _PBM_OPTIONAL,
+            ("--labels", {"required": True, "type": _labels, "help": "Comma-separated block labels"}),
+            _MODEL,
+            ("--integral-id", {"default": "15", "help": "Integral ID (default 15 = Maxwell force)"}),
+            *_MESH,
+            _SOLVE,
+            ("--current-label", {"default": "", "help": "Label to update current"}),
+            ("--amps", {"default": "", "help": "Total Ampere-Turns value"}),
+            ("--debug-current", {"action": "store_true", "help": "Print current update info"}),
+        ),
+        (".solve", "cmd_solve_integral"),
+    ),
+    (
+        "batch-force",
+        "Interactive sweep: move blocks and compute force table",
+        (
+            _PBM_OPTIONAL,
+            _MODEL,
+            ("--current-label", {"default": "bobine", "help": "Current label name (default bobine)"}),
+            ("--integral-id", {"default": "15", "help": "Integral ID (default 15)"}),
+            *_MESH,
+            ("--mesh-once", {"action": "store_true", "help": "Build mesh once per case (faster, less accurate)"}),
+            ("--sleep", {"default": "0", "help": "Sleep seconds between steps (e.g., 0.5)"}),
+            ("--out", {"default": "", "help": "Optional CSV output path"}),
+        ),
+        (".workflow", "cmd_batch_force"),
+    ),
+    ("gui", "Launch GUI for batch force workflow", (), (".gui", "cmd_gui")),
 )
-from .workflow import cmd_batch_force
-from .gui import cmd_gui
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="QuickField automation helper")
     sub = parser.add_subparsers(dest="command", required=True)
-
-    p_probe = sub.add_parser("probe", help="Print QuickField COM probe")
-    p_probe.set_defaults(func=cmd_probe)
-
-    p_sweep = sub.add_parser("sweep", help="Sweep QLMCall over a range of parameters")
-    p_sweep.add_argument("--qlm", default="", help="Path to QLM file")
-    p_sweep.add_argument("--start", required=True, help="Start value")
-    p_sweep.add_argument("--end", required=True, help="End value")
-    p_sweep.add_argument("--step", required=True, help="Step value")
-    p_sweep.add_argument("--out", default="", help="Output CSV path")
-    p_sweep.set_defaults(func=cmd_sweep)
-
-    p_table = sub.add_parser("table", help="Run QLMCall from a table of inputs")
-    p_table.add_argument("--qlm", default="", help="Path to QLM file")
-    p_table.add_argument("--table", required=True, help="CSV table path")
-    p_table.add_argument("--out", default="", help="Output CSV path")
-    p_table.set_defaults(func=cmd_table)
-
-    p_cases = sub.add_parser("gen-cases", help="Generate cases CSV from template")
-    p_cases.add_argument("--start", required=True, help="Start value")
-    p_cases.add_argument("--end", required=True, help="End value")
-    p_cases.add_argument("--step", required=True, help="Step value")
-    p_cases.add_argument("--out", default="", help="Output CSV path")
-    p_cases.set_defaults(func=cmd_gen_cases)
-
-    p_move = sub.add_parser("move-block", help="Move block with a given label")
-    p_move.add_argument("--label", required=True, help="Block label name")
-    p_move.add_argument("--dx", required=True, help="Delta X")
-    p_move.add_argument("--dy", required=True, help="Delta Y")
-    p_move.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_move.add_argument("--model", default="", help="Optional path to .mod file")
-    p_move.set_defaults(func=cmd_move_block)
-
-    p_move_once = sub.add_parser("move-blocks-once", help="Move blocks as a group (union bounds)")
-    p_move_once.add_argument("--labels", required=True, help="Comma-separated labels")
-    p_move_once.add_argument("--dx", required=True, help="Delta X")
-    p_move_once.add_argument("--dy", required=True, help="Delta Y")
-    p_move_once.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_move_once.add_argument("--model", default="", help="Optional path to .mod file")
-    p_move_once.add_argument("--debug", action="store_true", help="Verbose selection debug")
-    p_move_once.set_defaults(func=cmd_move_blocks_once)
-
-    p_list = sub.add_parser("list-blocks", help="List block labels in the model")
-    p_list.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_list.add_argument("--model", default="", help="Optional path to .mod file")
-    p_list.set_defaults(func=cmd_list_blocks)
-
-    p_bounds = sub.add_parser("block-bounds", help="Get bounds for block labels")
-    p_bounds.add_argument("--labels", required=True, help="Comma-separated labels")
-    p_bounds.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_bounds.add_argument("--model", default="", help="Optional path to .mod file")
-    p_bounds.set_defaults(func=cmd_block_bounds)
-
-    p_clone = sub.add_parser("clone-label", help="Clone a label to a new name")
-    p_clone.add_argument("--src", required=True, help="Source label name")
-    p_clone.add_argument("--dst", required=True, help="Destination label name")
-    p_clone.add_argument("--amps", default="", help="Optional coil amps override")
-    p_clone.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_clone.set_defaults(func=cmd_clone_label)
-
-    p_assign = sub.add_parser("assign-label", help="Assign a label to blocks with another label")
-    p_assign.add_argument("--src", required=True, help="Existing label to replace")
-    p_assign.add_argument("--dst", required=True, help="New label to assign")
-    p_assign.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_assign.add_argument("--model", default="", help="Optional path to .mod file")
-    p_assign.set_defaults(func=cmd_assign_label)
-
-    p_coil = sub.add_parser("create-coil-label", help="Create a coil label with explicit values")
-    p_coil.add_argument("--name", required=True, help="New label name (e.g., bobine_100)")
-    p_coil.add_argument("--amps", required=True, help="Total Ampere-Turns (e.g., 100)")
-    p_coil.add_argument("--mu", default="1", help="Relative permeability (default 1)")
-    p_coil.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_coil.set_defaults(func=cmd_create_coil_label)
-
-    p_sc = sub.add_parser("set-current", help="Set coil current on a label")
-    p_sc.add_argument("--label", required=True, help="Block label name (e.g., bobine)")
-    p_sc.add_argument("--amps", required=True, help="Current value")
-    p_sc.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_sc.add_argument("--reopen", action="store_true", help="Re-open data doc to verify")
-    p_sc.add_argument("--save-dms", default="", help="Save DataDoc to .dms path")
-    p_sc.set_defaults(func=cmd_set_current)
-
-    p_ld = sub.add_parser("label-dump", help="Dump label Content properties")
-    p_ld.add_argument("--label", required=True, help="Block label name (e.g., bobine)")
-    p_ld.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_ld.set_defaults(func=cmd_label_dump)
-
-    p_lp = sub.add_parser("label-pos", help="Print block label position")
-    p_lp.add_argument("--label", required=True, help="Block label name")
-    p_lp.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_lp.set_defaults(func=cmd_label_pos)
-
-    p_cd = sub.add_parser("circuit-dump", help="Dump circuit properties/items")
-    p_cd.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_cd.set_defaults(func=cmd_circuit_dump)
-
-    p_scirc = sub.add_parser("set-circuit-current", help="Set current on circuit/element")
-    p_scirc.add_argument("--name", default="", help="Circuit element name (if applicable)")
-    p_scirc.add_argument("--amps", required=True, help="Current value")
-    p_scirc.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_scirc.set_defaults(func=cmd_set_circuit_current)
-
-    p_model = sub.add_parser("model", help="Auto-model via ActiveField COM plan")
-    p_model.add_argument(
-        "--plan",
-        default=str(Path(__file__).resolve().parents[2] / "config" / "modeling.json"),
-        help="Path to modeling plan JSON",
-    )
-    p_model.add_argument("--pbm", default="", help="Override PBM path in plan")
-    p_model.add_argument("--model", default="", help="Override model path in plan")
-    p_model.add_argument("--save-as", default="", help="Override save_model_as in plan")
-    p_model.add_argument(
-        "--use-active",
-        action="store_true",
-        help="Use active problem if no PBM is provided",
-    )
-    p_model.add_argument("--dry-run", action="store_true", help="Validate plan only")
-    p_model.set_defaults(func=cmd_model)
-
-    p_com = sub.add_parser("com-probe", help="Dump COM method names")
-    p_com.add_argument("--pbm", default="", help="Open PBM if no active problem")
-    p_com.add_argument("--model", default="", help="Optional path to .mod file")
-    p_com.set_defaults(func=cmd_com_probe)
-
-    p_force = sub.add_parser("solve-force", help="Solve and dump mechanical force")
-    p_force.add_argument("--pbm", default="", help="PBM path (optional if a problem is already open)")
-    p_force.add_argument("--label", required=True, help="Block label")
-    p_force.add_argument("--mesh", action="store_true", help="Build mesh before solving")
-    p_force.add_argument("--remesh", action="store_true", help="Remove mesh before rebuild")
-    p_force.add_argument("--solve", action="store_true", help="Force solve before result")
-    p_force.set_defaults(func=cmd_solve_force)
-
-    p_dump = sub.add_parser("result-dump", help="Dump result blocks/force candidates")
-    p_dump.add_argument("--pbm", default="", help="PBM path (optional if a problem is already open)")
-    p_dump.add_argument("--label", default="", help="Block label to inspect")
-    p_dump.add_argument("--solve", action="store_true", help="Force solve before result")
-    p_dump.set_defaults(func=cmd_result_dump)
-
-    p_int = sub.add_parser("solve-integral", help="Solve and evaluate integral")
-    p_int.add_argument("--pbm", default="", help="PBM path (optional if a problem is already open)")
-    p_int.add_argument("--labels", required=True, help="Comma-separated block labels")
-    p_int.add_argument("--model", default="", help="Optional path to .mod file")
-    p_int.add_argument("--integral-id", default="15", help="Integral ID (default 15 = Maxwell force)")
-    p_int.add_argument("--mesh", action="store_true", help="Build mesh before solving")
-    p_int.add_argument("--remesh", action="store_true", help="Remove mesh before rebuild")
-    p_int.add_argument("--solve", action="store_true", help="Force solve before result")
-    p_int.add_argument("--current-label", default="", help="Label to update current")
-    p_int.add_argument("--amps", default="", help="Total Ampere-Turns value")
-    p_int.add_argument("--debug-current", action="store_true", help="Print current update info")
-    p_int.set_defaults(func=cmd_solve_integral)
-
-    p_batch = sub.add_parser("batch-force", help="Interactive sweep: move blocks and compute force table")
-    p_batch.add_argument("--pbm", default="", help="PBM path (optional if a problem is already open)")
-    p_batch.add_argument("--model", default="", help="Optional path to .mod file")
-    p_batch.add_argument("--current-label", default="bobine", help="Current label name (default bobine)")
-    p_batch.add_argument("--integral-id", default="15", help="Integral ID (default 15)")
-    p_batch.add_argument("--mesh", action="store_true", help="Build mesh before solving")
-    p_batch.add_argument("--remesh", action="store_true", help="Remove mesh before rebuild")
-    p_batch.add_argument("--mesh-once", action="store_true", help="Build mesh once per case (faster, less accurate)")
-    p_batch.add_argument("--sleep", default="0", help="Sleep seconds between steps (e.g., 0.5)")
-    p_batch.add_argument("--out", default="", help="Optional CSV output path")
-    p_batch.set_defaults(func=cmd_batch_force)
-
-    p_gui = sub.add_parser("gui", help="Launch GUI for batch force workflow")
-    p_gui.set_defaults(func=cmd_gui)
-
+    for name, help_, arguments, target in SUBCOMMANDS:
+        p = sub.add_parser(name, help=help_)
+        for flag, kwargs in arguments:
+            p.add_argument(flag, **kwargs)
+        p.set_defaults(func=_lazy(*target))
     return parser
 
 
@@ -1,32 +1,115 @@
 from __future__ import annotations
 import argparse
 import csv
+import functools
 import json
-import re
+import os
+import queue
 import subprocess
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional
 
 try:
-    import win32com.client  # type: ignore
-    import pythoncom  # type: ignore
+    import orjson  # type: ignore
 except Exception:
-    win32com = None
-    pythoncom = None
+    orjson = None
+
+# Failures expected from a COM property probe; anything else should surface.
+# pythoncom.com_error is appended once pywin32 is loaded.
+_COM_ERRORS: tuple = (AttributeError, TypeError, ValueError)
+_COM_MODS: Optional[tuple[Any, Any]] = None
+
+def _com_mods() -> tuple[Any, Any]:
+    # pywin32 is imported on first use so --help, the legacy scripts and
+    # tooling that only import this module do not load pythoncom's DLL.
+    global _COM_MODS, _COM_ERRORS
+    if _COM_MODS is None:
+        try:
+            import win32com.client  # type: ignore
+            import pythoncom  # type: ignore
+        except Exception:
+            _COM_MODS = (None, None)
+        else:
+            _COM_MODS = (win32com, pythoncom)
+            _COM_ERRORS += (pythoncom.com_error,)
+    return _COM_MODS
+
+_DISP_E_MEMBERNOTFOUND = -2147352573
+_DISP_E_UNKNOWNNAME = -2147352570
+
+def _member_missing(exc: BaseException) -> bool:
+    # The interface lacks the member, as opposed to one call to it failing;
+    # only this is worth remembering per interface.
+    if isinstance(exc, AttributeError):
+        return True
+    return getattr(exc, "hresult", None) in (_DISP_E_MEMBERNOTFOUND, _DISP_E_UNKNOWNNAME)
+
+def _com_errors() -> tuple:
+    # _COM_ERRORS with pythoncom.com_error included once pywin32 loads; for
+    # modules that cannot see the rebound global through a from-import.
+    _com_mods()
+    return _COM_ERRORS
+
+def __getattr__(name: str) -> Any:
+    # Keeps "from .connection import win32com, pythoncom" working.
+    if name == "win32com":
+        return _com_mods()[0]
+    if name == "pythoncom":
+        return _com_mods()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 DEFAULT_INSTALL = Path(r"C:\Program Files (x86)\Tera Analysis\QuickField 6.2")
 DEFAULT_QLMCALL = DEFAULT_INSTALL / "Tools" / "QLMCall.exe"
+_QLM_SENTINEL = "END"
+_CSV_FLUSH_EVERY = 20
+
+_APP_CACHE = threading.local()
+_ITEM_ACCESSOR: dict[type, str] = {}
+_EARLY_CLASSES: dict[Any, type] = {}
+_LABEL_ATTRS = ("LabelName", "Label", "BlockLabel")
+_LABEL_ATTR_CACHE: dict[type, str] = {}
+_TITLE_ATTRS = ("Caption", "Title", "Name")
+_TITLE_ATTR_CACHE: dict[type, str] = {}
+_LABELED_AS_WORKS: dict[type, bool] = {}
+_SETTINGS_CACHE: dict[tuple[str, int, int], dict] = {}
+_QLMCALL_SEEN: set[str] = set()
+# (qlmcall, option) -> whether QLMCall --help advertises it; probed once.
+_QLMCALL_OPTIONS: dict[tuple[str, str], bool] = {}
+_QLMCALL_OPTIONS_LOCK = threading.Lock()
+_QLMCALL_PROBE_TIMEOUT = 10.0
+# Longest a persistent session may stay silent on one row before it is
+# killed and the row re-run as its own process.
+_QLM_SESSION_TIMEOUT = 300.0
+_REBUILD_ON_APP = False
+# id(model) -> (model, lookups derived from it); dropped on rebuild/save.
+_MODEL_CACHE: dict[int, tuple[Any, dict[str, Any]]] = {}
 
 def load_settings(path: Path) -> dict:
-    if not path.exists():
+    # Re-parse only when the file changed; one stat replaces exists().
+    try:
+        st = path.stat()
+    except OSError:
         return {}
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    settings = _SETTINGS_CACHE.get(key)
+    if settings is not None:
+        return settings
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        if orjson is not None:
+            # orjson parses the bytes directly; its errors subclass JSONDecodeError.
+            settings = orjson.loads(path.read_bytes())
+        else:
+            settings = json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
         print(f"Invalid JSON in {path}: {exc}")
         return {}
+    _SETTINGS_CACHE[key] = settings
+    return settings
 
 def resolve_paths(settings: dict) -> dict:
     qf = settings.get("quickfield", {})
@@ -35,6 +118,7 @@ def resolve_paths(settings: dict) -> dict:
     return {
         "install_dir": install_dir,
         "qlmcall": qlmcall,
+        "qlmcall_stdin": bool(qf.get("qlmcall_stdin", False)),
     }
 
 def cmd_probe(args: argparse.Namespace) -> int:
@@ -69,6 +153,7 @@ def parse_decimal(value: str) -> Decimal:
     except InvalidOperation as exc:
         raise argparse.ArgumentTypeError(f"Invalid number: {value}") from exc
 
+@functools.lru_cache(maxsize=4096)
 def format_decimal(value: Decimal) -> str:
     # Normalize but keep at least one digit.
     text = format(value.normalize(), "f")
@@ -83,30 +168,240 @@ def generate_positions(start: Decimal, end: Decimal, step: Decimal) -> list[Deci
     if direction * (end - start) < 0:
         raise ValueError("step sign does not move from start to end")
 
-    positions: list[Decimal] = []
-    current = start
-    # Use a loop with tolerance on comparison in Decimal space.
-    while (current - end) * direction <= 0:
-        positions.append(current)
-        current += step
-    return positions
+    # Count the steps once and derive each position from the start value, so
+    # no error accumulates from repeated additions. Nudge the count if the
+    # division rounded across the end point.
+    n_steps = int((end - start) / step)
+    while n_steps > 0 and (start + n_steps * step - end) * direction > 0:
+        n_steps -= 1
+    while (start + (n_steps + 1) * step - end) * direction <= 0:
+        n_steps += 1
+    return [start + i * step for i in range(n_steps + 1)]
+
+def format_float(value: float, precision: int) -> str:
+    # Same shape as format_decimal: fixed point, no trailing zeros.
+    text = f"{value:.{precision}f}".rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        text = "0"
+    return text
 
-def run_qlmcall(qlmcall: Path, args_list: list[str]) -> subprocess.CompletedProcess:
+def generate_positions_float(start: float, end: float, step: float) -> list[float]:
+    if step == 0:
+        raise ValueError("step must be non-zero")
+    direction = 1 if step > 0 else -1
+    if direction * (end - start) < 0:
+        raise ValueError("step sign does not move from start to end")
+    # The small slack keeps an end point that float division lands just
+    # below (e.g. 0.3 / 0.1) inside the range.
+    n_steps = int((end - start) / step + 1e-9)
+    return [start + i * step for i in range(n_steps + 1)]
+
+def sweep_positions(start: Decimal, end: Decimal, step: Decimal, precision: Optional[int] = None) -> list[str]:
+    # Formatted sweep positions. Exact Decimal arithmetic by default; with a
+    # precision, float arithmetic rounded to that many decimals.
+    if precision is None:
+        return [format_decimal(pos) for pos in generate_positions(start, end, step)]
+    return [
+        format_float(pos, precision)
+        for pos in generate_positions_float(float(start), float(end), float(step))
+    ]
+
+def _qlmcall_available(qlmcall: str) -> bool:
+    # Batch drivers call sweep/table repeatedly with the same executable;
+    # stat it once per process instead of once per command.
+    if qlmcall in _QLMCALL_SEEN:
+        return True
+    try:
+        os.stat(qlmcall)
+    except OSError:
+        return False
+    _QLMCALL_SEEN.add(qlmcall)
+    return True
+
+def _qlmcall_supports(qlmcall: str, option: str) -> bool:
+    # Ask QLMCall once whether it knows an option instead of trying it on real
+    # parameter rows; a build that hangs on --help counts as not knowing it.
+    key = (qlmcall, option)
+    with _QLMCALL_OPTIONS_LOCK:
+        known = _QLMCALL_OPTIONS.get(key)
+        if known is None:
+            try:
+                probe = subprocess.run(
+                    [qlmcall, "--help"],
+                    text=True,
+                    capture_output=True,
+                    check=False,
+                    timeout=_QLMCALL_PROBE_TIMEOUT,
+                )
+                known = option in (probe.stdout or "") + (probe.stderr or "")
+            except (OSError, subprocess.SubprocessError):
+                known = False
+            _QLMCALL_OPTIONS[key] = known
+    return known
+
+def _forget_qlmcall_option(qlmcall: str, option: str) -> None:
+    with _QLMCALL_OPTIONS_LOCK:
+        _QLMCALL_OPTIONS[(qlmcall, option)] = False
+
+def run_qlmcall(qlmcall: str, args_list: list[str]) -> subprocess.CompletedProcess:
     return subprocess.run(
-        [str(qlmcall), *args_list],
+        [qlmcall, *args_list],
         text=True,
         capture_output=True,
         check=False,
     )
 
+class QlmSession:
+    # One long-lived QLMCall fed a tab-separated parameter row per line on
+    # stdin, answering with result lines closed by _QLM_SENTINEL. Only builds
+    # whose --help advertises --stdin get a session; the others, a session
+    # that dies, or one that stays silent past the timeout fall back to one
+    # process per call.
+    def __init__(self, qlmcall: str, persistent: bool = False, timeout: float = _QLM_SESSION_TIMEOUT) -> None:
+        self.qlmcall = qlmcall
+        self.timeout = timeout
+        self.proc: Optional[subprocess.Popen] = None
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        if persistent and _qlmcall_supports(qlmcall, "--stdin"):
+            try:
+                self.proc = subprocess.Popen(
+                    [qlmcall, "--stdin"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                )
+            except OSError:
+                self.proc = None
+            else:
+                # Reads happen on a daemon thread so call() can wait on a
+                # deadline instead of blocking on the pipe.
+                threading.Thread(target=self._pump, args=(self.proc.stdout, self.lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(stream: Any, lines: "queue.Queue[Optional[str]]") -> None:
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def call(self, args_list: list[str]) -> subprocess.CompletedProcess:
+        proc = self.proc
+        if proc is None or proc.poll() is not None:
+            return run_qlmcall(self.qlmcall, args_list)
+        lines: list[str] = []
+        deadline = time.monotonic() + self.timeout
+        try:
+            proc.stdin.write("\t".join(args_list) + "\n")
+            proc.stdin.flush()
+            while True:
+                line = self.lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                if line is None:
+                    raise EOFError("QLMCall session closed")
+                if line.strip() == _QLM_SENTINEL:
+                    break
+                lines.append(line)
+        except (OSError, ValueError, EOFError, queue.Empty):
+            self.close(kill=True)
+            return run_qlmcall(self.qlmcall, args_list)
+        return subprocess.CompletedProcess(proc.args, 0, "".join(lines), "")
+
+    def close(self, kill: bool = False) -> None:
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        if kill:
+            proc.kill()
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+    def __enter__(self) -> "QlmSession":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+def run_qlmcall_batch(qlmcall: str, chunk: list[list[str]]) -> list[subprocess.CompletedProcess]:
+    # Hand QLMCall several parameter rows at once ("--batch rows.csv", one
+    # result line per row) when its --help advertises --batch. A failed call
+    # or a reply without one line per row marks batch mode unusable for the
+    # rest of the run; those rows, and every later chunk, go one by one.
+    if len(chunk) == 1 or not _qlmcall_supports(qlmcall, "--batch"):
+        return [run_qlmcall(qlmcall, params) for params in chunk]
+    fd, batch_path = tempfile.mkstemp(prefix="qlm_batch_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(chunk)
+        result = run_qlmcall(qlmcall, ["--batch", batch_path])
+    finally:
+        try:
+            os.unlink(batch_path)
+        except OSError:
+            pass
+    lines = [line for line in result.stdout.splitlines() if line.strip()]
+    if result.returncode != 0 or len(lines) != len(chunk):
+        _forget_qlmcall_option(qlmcall, "--batch")
+        return [run_qlmcall(qlmcall, params) for params in chunk]
+    return [subprocess.CompletedProcess(result.args, 0, line, "") for line in lines]
+
+def iter_qlmcall(
+    qlmcall: str,
+    param_lists: list[list[str]],
+    jobs: int = 1,
+    persistent: bool = False,
+    batch_size: int = 1,
+) -> Iterable[subprocess.CompletedProcess]:
+    # Each call is its own QLMCall process, so threads are enough to overlap
+    # them. Results are yielded in input order; when the caller stops early
+    # (e.g. on a failed call) the jobs that have not started are cancelled.
+    # Serial runs can reuse one QlmSession instead of spawning per row, and
+    # batch_size > 1 packs that many rows into each QLMCall invocation.
+    if batch_size > 1 and not _qlmcall_supports(qlmcall, "--batch"):
+        batch_size = 1
+    if batch_size > 1:
+        chunks = [param_lists[i:i + batch_size] for i in range(0, len(param_lists), batch_size)]
+        if jobs <= 1:
+            for chunk in chunks:
+                yield from run_qlmcall_batch(qlmcall, chunk)
+            return
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_qlmcall_batch, qlmcall, chunk) for chunk in chunks]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+        return
+    if jobs <= 1:
+        with QlmSession(qlmcall, persistent) as session:
+            for params in param_lists:
+                yield session.call(params)
+        return
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_qlmcall, qlmcall, params) for params in param_lists]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
 def parse_results(output: str) -> list[float]:
-    tokens = re.split(r"\s+", output.strip())
+    # Called once per QLMCall reply; keep float and append as locals.
     results: list[float] = []
-    for token in tokens:
-        if not token:
-            continue
+    append = results.append
+    to_float = float
+    for token in output.split():
         try:
-            results.append(float(token))
+            append(to_float(token))
         except ValueError:
             continue
     return results
@@ -116,7 +411,9 @@ def cmd_sweep(args: argparse.Namespace) -> int:
     settings = load_settings(settings_path)
     paths = resolve_paths(settings)
 
-    if not paths["qlmcall"].exists():
+    # Converted once; every QLMCall run below reuses the string.
+    qlmcall = str(paths["qlmcall"])
+    if not _qlmcall_available(qlmcall):
         print("QLMCall.exe not found. Fix config/settings.json and re-run.")
         return 1
 
@@ -126,7 +423,7 @@ def cmd_sweep(args: argparse.Namespace) -> int:
     y_offset = parse_decimal(args.y)
 
     try:
-        positions = generate_positions(start, end, step)
+        fmt_positions = sweep_positions(start, end, step, getattr(args, "precision", None))
     except ValueError as exc:
         print(f"Invalid sweep range: {exc}")
         return 1
@@ -135,7 +432,7 @@ def cmd_sweep(args: argparse.Namespace) -> int:
     mode = args.mode
 
     if args.clear_results:
-        clear = run_qlmcall(paths["qlmcall"], ["ClearResults"])
+        clear = run_qlmcall(qlmcall, ["ClearResults"])
         if clear.returncode != 0:
             print("Failed to clear results in LabelMover.")
             print(clear.stderr.strip())
@@ -144,57 +441,85 @@ def cmd_sweep(args: argparse.Namespace) -> int:
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    rows: list[list[str]] = []
-    for pos in positions:
-        params: list[str] = []
-        params.extend(fixed_values)
-        if mode == "any":
-            params.append(format_decimal(pos))
-            params.append(format_decimal(y_offset))
-        elif mode == "x":
-            params.append(format_decimal(pos))
-        else:
-            params.append(format_decimal(y_offset))
-
-        result = run_qlmcall(paths["qlmcall"], params)
-        if result.returncode != 0:
-            print(f"QLMCall failed at position {pos}:")
-            print(result.stderr.strip())
-            return result.returncode
-
-        values = parse_results(result.stdout)
-        rows.append([format_decimal(pos)] + [str(v) for v in values])
-
-        if args.verbose:
-            print(f"{format_decimal(pos)} -> {values}")
+    # Positions are formatted once; the strings are used for the parameters,
+    # the CSV row and the verbose log.
+    fmt_y = format_decimal(y_offset)
 
-    if rows:
-        header = ["x_offset"] + [f"result_{i}" for i in range(len(rows[0]) - 1)]
+    # Pick the parameter layout for the mode once, not per position.
+    build_params: Callable[[str], list[str]]
+    if mode == "any":
+        build_params = lambda fmt_pos: fixed_values + [fmt_pos, fmt_y]
+    elif mode == "x":
+        build_params = lambda fmt_pos: fixed_values + [fmt_pos]
     else:
-        header = ["x_offset"]
+        build_params = lambda fmt_pos: fixed_values + [fmt_y]
+
+    jobs = max(1, int(getattr(args, "jobs", 1) or 1))
+    batch_size = max(1, int(getattr(args, "batch_size", 1) or 1))
+    results = iter_qlmcall(
+        qlmcall,
+        [build_params(fmt_pos) for fmt_pos in fmt_positions],
+        jobs,
+        paths["qlmcall_stdin"],
+        batch_size,
+    )
 
+    # Rows are written as each QLMCall returns so a failed or interrupted
+    # sweep keeps what it already solved. The result_ columns follow the
+    # first row's value count. Every cell is a formatted number, so rows are
+    # joined directly instead of going through csv quoting; the line ending
+    # matches csv.writer's.
+    written = 0
     with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(rows)
-
-    print(f"Wrote {len(rows)} rows to {output_path}")
+        write = f.write
+        for fmt_pos, result in zip(fmt_positions, results):
+            if result.returncode != 0:
+                print(f"QLMCall failed at position {fmt_pos}:")
+                print(result.stderr.strip())
+                print(f"Wrote {written} rows to {output_path}")
+                return result.returncode
+
+            values = parse_results(result.stdout)
+            if not written:
+                write(",".join(["x_offset"] + [f"result_{i}" for i in range(len(values))]) + "\r\n")
+            write(",".join([fmt_pos] + [str(v) for v in values]) + "\r\n")
+            written += 1
+            if written % _CSV_FLUSH_EVERY == 0:
+                f.flush()
+
+            if args.verbose:
+                print(f"{fmt_pos} -> {values}")
+
+        if not written:
+            write("x_offset\r\n")
+
+    print(f"Wrote {written} rows to {output_path}")
     return 0
 
-def read_table(path: Path) -> tuple[list[str], list[dict[str, str]]]:
+def read_table(path: Path) -> tuple[list[str], list[list[str]]]:
+    # Plain rows instead of DictReader dicts; callers map column names to
+    # indices once. Blank lines are skipped as DictReader did.
     with path.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames is None:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
             raise ValueError("CSV has no header")
-        rows = [row for row in reader]
-    return list(reader.fieldnames), rows
+        rows = [row for row in reader if row]
+    return header, rows
+
+def _cells(row: list[str], idx: list[int]) -> list[str]:
+    # Short rows read as empty cells, like DictReader's missing keys.
+    n = len(row)
+    return [row[i] if i < n else "" for i in idx]
 
 def cmd_table(args: argparse.Namespace) -> int:
     settings_path = Path(args.config)
     settings = load_settings(settings_path)
     paths = resolve_paths(settings)
 
-    if not paths["qlmcall"].exists():
+    # Converted once; every QLMCall run below reuses the string.
+    qlmcall = str(paths["qlmcall"])
+    if not _qlmcall_available(qlmcall):
         print("QLMCall.exe not found. Fix config/settings.json and re-run.")
         return 1
 
@@ -223,7 +548,7 @@ def cmd_table(args: argparse.Namespace) -> int:
             return 1
 
     if args.clear_results:
-        clear = run_qlmcall(paths["qlmcall"], ["ClearResults"])
+        clear = run_qlmcall(qlmcall, ["ClearResults"])
         if clear.returncode != 0:
             print("Failed to clear results in LabelMover.")
             print(clear.stderr.strip())
@@ -232,39 +557,45 @@ def cmd_table(args: argparse.Namespace) -> int:
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    out_rows: list[list[str]] = []
-    for row in rows:
-        params: list[str] = []
-        for v in var_order:
-            params.append(row.get(v, "").strip())
-
-        result = run_qlmcall(paths["qlmcall"], params)
-        if result.returncode != 0:
-            print(f"QLMCall failed for row {row}:")
-            if result.stdout.strip():
-                print("stdout:", result.stdout.strip())
-            if result.stderr.strip():
-                print("stderr:", result.stderr.strip())
-            print(f"returncode: {result.returncode}")
-            return result.returncode
-
-        values = parse_results(result.stdout)
-        out_rows.append([row.get(v, "") for v in var_order] + [str(v) for v in values])
-
-        if args.verbose:
-            print(f"{[row.get(v, '') for v in var_order]} -> {values}")
-
-    if out_rows:
-        header_out = var_order + [f"result_{i}" for i in range(len(out_rows[0]) - len(var_order))]
-    else:
-        header_out = var_order
+    # Pick each row's cells once; they feed both the QLMCall parameters and
+    # the output row.
+    idx = [header.index(v) for v in var_order]
+    row_cells = [_cells(row, idx) for row in rows]
+    param_lists = [[c.strip() for c in cells] for cells in row_cells]
+
+    jobs = max(1, int(getattr(args, "jobs", 1) or 1))
+    batch_size = max(1, int(getattr(args, "batch_size", 1) or 1))
+    results = iter_qlmcall(qlmcall, param_lists, jobs, paths["qlmcall_stdin"], batch_size)
 
+    written = 0
     with output_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(header_out)
-        writer.writerows(out_rows)
-
-    print(f"Wrote {len(out_rows)} rows to {output_path}")
+        for row, cells, result in zip(rows, row_cells, results):
+            if result.returncode != 0:
+                print(f"QLMCall failed for row {dict(zip(header, row))}:")
+                if result.stdout.strip():
+                    print("stdout:", result.stdout.strip())
+                if result.stderr.strip():
+                    print("stderr:", result.stderr.strip())
+                print(f"returncode: {result.returncode}")
+                print(f"Wrote {written} rows to {output_path}")
+                return result.returncode
+
+            values = parse_results(result.stdout)
+            if not written:
+                writer.writerow(var_order + [f"result_{i}" for i in range(len(values))])
+            if args.verbose:
+                print(f"{cells} -> {values}")
+            cells.extend(map(str, values))
+            writer.writerow(cells)
+            written += 1
+            if written % _CSV_FLUSH_EVERY == 0:
+                f.flush()
+
+        if not written:
+            writer.writerow(var_order)
+
+    print(f"Wrote {written} rows to {output_path}")
     return 0
 
 def cmd_gen_cases(args: argparse.Namespace) -> int:
@@ -272,7 +603,7 @@ def cmd_gen_cases(args: argparse.Namespace) -> int:
     end = parse_decimal(args.end)
     step = parse_decimal(args.step)
     try:
-        positions = generate_positions(start, end, step)
+        fmt_positions = sweep_positions(start, end, step, getattr(args, "precision", None))
     except ValueError as exc:
         print(f"Invalid sweep range: {exc}")
         return 1
@@ -289,8 +620,8 @@ def cmd_gen_cases(args: argparse.Namespace) -> int:
     header = [args.current_name, "x_offset"]
     rows: list[list[str]] = []
     for i_val in currents:
-        for pos in positions:
-            rows.append([i_val, format_decimal(pos)])
+        for fmt_pos in fmt_positions:
+            rows.append([i_val, fmt_pos])
 
     with output_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
@@ -301,49 +632,155 @@ def cmd_gen_cases(args: argparse.Namespace) -> int:
     return 0
 
 def com_open_problem(pbm_path: Path):
-    if win32com is None:
-        raise RuntimeError("pywin32 is not available. Install with pip install pywin32.")
-    app = win32com.client.Dispatch("QuickField.Application")
+    app = dispatch_qf_app()
     app.Problems.Open(str(pbm_path))
-    return app, app.ActiveProblem
+    return app, remember_problem(app, app.ActiveProblem)
+
+def _early_bound(obj: Any) -> Any:
+    # Route through gencache so attribute access uses makepy DISPIDs instead of
+    # a GetIDsOfNames round-trip per property. The generated class is cached
+    # per interface IID so the typelib lookup only happens once.
+    try:
+        oleobj = obj._oleobj_
+        iid = oleobj.GetTypeInfo().GetTypeAttr()[0]
+        cls = _EARLY_CLASSES.get(iid)
+        if cls is not None:
+            return cls(oleobj)
+        wrapped = _com_mods()[0].client.gencache.EnsureDispatch(obj)
+        _EARLY_CLASSES[iid] = type(wrapped)
+        return wrapped
+    except Exception:
+        return obj
+
+def _is_alive(app: Any) -> bool:
+    try:
+        app._oleobj_.GetTypeInfoCount()
+        return True
+    except Exception:
+        return False
 
 def dispatch_qf_app() -> Any:
+    win32com, pythoncom = _com_mods()
     if win32com is None:
         raise RuntimeError("pywin32 is not available. Install with pip install pywin32.")
+    # COM proxies are apartment-bound, so the cache is per thread.
+    app = getattr(_APP_CACHE, "app", None)
+    if app is not None and _is_alive(app):
+        return app
+
+    app = None
     # Prefer attaching to an already opened QuickField instance.
     try:
-        return win32com.client.GetActiveObject("QuickField.Application")
+        app = win32com.client.GetActiveObject("QuickField.Application")
     except Exception:
         pass
-    try:
-        if pythoncom is not None and hasattr(pythoncom, "GetActiveObject"):
-            return pythoncom.GetActiveObject("QuickField.Application")
-    except Exception:
-        pass
-    try:
-        return win32com.client.gencache.EnsureDispatch("QuickField.Application")
-    except Exception:
-        return win32com.client.Dispatch("QuickField.Application")
+    if app is None:
+        try:
+            if pythoncom is not None and hasattr(pythoncom, "GetActiveObject"):
+                app = pythoncom.GetActiveObject("QuickField.Application")
+        except Exception:
+            pass
+    if app is not None:
+        app = _early_bound(app)
+    else:
+        try:
+            app = win32com.client.gencache.EnsureDispatch("QuickField.Application")
+        except Exception:
+            app = _early_bound(win32com.client.Dispatch("QuickField.Application"))
+    _APP_CACHE.app = app
+    return app
 
 def get_active_problem(qf: Any) -> Optional[Any]:
+    # Batch loops call this once per step; reuse the problem found for this
+    # application until remember_problem()/forget_problem() replaces it.
+    cached = getattr(_APP_CACHE, "problem", None)
+    if cached is not None and cached[0] is qf and _is_alive(cached[1]):
+        return cached[1]
+
+    prb = None
     try:
         prb = qf.ActiveProblem
-        if prb is not None:
-            return prb
     except Exception:
         pass
 
-    try:
-        problems = qf.Problems
-        count = int(problems.Count)
+    if prb is None:
+        try:
+            problems = qf.Problems
+        except _COM_ERRORS:
+            return None
+        count = collection_count(problems)
         if count > 0:
             try:
-                return problems.Item(count)
-            except Exception:
-                return problems(count)
+                prb = item_at(problems, count)
+            except _COM_ERRORS:
+                pass
+    return remember_problem(qf, prb)
+
+def remember_problem(qf: Any, prb: Optional[Any]) -> Optional[Any]:
+    _APP_CACHE.problem = (qf, prb) if prb is not None else None
+    return prb
+
+def forget_problem() -> None:
+    _APP_CACHE.problem = None
+    forget_model_cache()
+
+def model_cache(model: Any) -> dict[str, Any]:
+    # The model is kept in the entry so its id cannot be reused while cached.
+    entry = _MODEL_CACHE.get(id(model))
+    if entry is None or entry[0] is not model:
+        entry = (model, {})
+        _MODEL_CACHE[id(model)] = entry
+    return entry[1]
+
+def forget_model_cache(model: Any = None) -> None:
+    if model is None:
+        _MODEL_CACHE.clear()
+    else:
+        _MODEL_CACHE.pop(id(model), None)
+
+def forget_cached(*keys: str) -> None:
+    # Drop only these entries, for every cached object.
+    for _, cache in _MODEL_CACHE.values():
+        for key in keys:
+            cache.pop(key, None)
+
+def collection_count(col: Any) -> int:
+    try:
+        return int(col.Count)
+    except _COM_ERRORS:
+        return 0
+
+def rebuild_model(qf: Any, problem: Any) -> None:
+    # A successful problem-level Rebuild already covers the model; only fall
+    # back to the application object when that fails, and remember the winner.
+    global _REBUILD_ON_APP
+    forget_model_cache()
+    first, second = (qf, problem) if _REBUILD_ON_APP else (problem, qf)
+    try:
+        first.Rebuild()
+        return
     except Exception:
         pass
-    return None
+    try:
+        second.Rebuild()
+        _REBUILD_ON_APP = second is qf
+    except Exception:
+        pass
+
+def _wait_model(problem: Any, timeout: float = 2.0) -> Optional[Any]:
+    # Poll for the model instead of sleeping a fixed 200 ms; loads of cached
+    # models usually finish well before the first poll interval elapses.
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            model = problem.Model
+            if model is not None:
+                return model
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.01)
 
 def ensure_model_loaded(problem: Any, model_path: Optional[Path]) -> Optional[Any]:
     model = None
@@ -352,21 +789,18 @@ def ensure_model_loaded(problem: Any, model_path: Optional[Path]) -> Optional[An
             raise FileNotFoundError(f"Model not found: {model_path}")
         try:
             problem.App.Models.Open(str(model_path))  # type: ignore[attr-defined]
-            time.sleep(0.2)
-            model = problem.Model
+            model = _wait_model(problem)
         except Exception:
             try:
                 problem.Models.Open(str(model_path))
-                time.sleep(0.2)
-                model = problem.Model
+                model = _wait_model(problem)
             except Exception:
                 model = None
 
     if model is None:
         try:
             problem.LoadModel()
-            time.sleep(0.2)
-            model = problem.Model
+            model = _wait_model(problem)
         except Exception:
             model = None
     return model
@@ -379,7 +813,7 @@ def open_problem(qf: Any, pbm_arg: str) -> Optional[Any]:
             print(f"PBM not found: {pbm_path}")
             return None
         qf.Problems.Open(str(pbm_path))
-        return qf.ActiveProblem
+        return remember_problem(qf, qf.ActiveProblem)
 
     problem = get_active_problem(qf)
     if problem is None:
@@ -396,6 +830,32 @@ def _com_method_names(obj: Any) -> list[str]:
         names = []
     return sorted(names)
 
+# COM interface -> sorted public member names, so dumps and content copies
+# enumerate each interface once.
+_METHOD_NAMES_CACHE: dict[Any, tuple[str, ...]] = {}
+
+def _com_type_key(obj: Any) -> Any:
+    # Early-bound wrappers have one class per interface; late-bound ones all
+    # share CDispatch, so those are told apart by the interface IID. None
+    # when a late-bound object has no type info: callers must not cache
+    # under it, or unrelated interfaces would share members and DISPIDs.
+    cls = type(obj)
+    if cls.__name__ != "CDispatch":
+        return cls
+    try:
+        return obj._oleobj_.GetTypeInfo().GetTypeAttr()[0]
+    except Exception:
+        return None
+
+def _cached_method_names(obj: Any) -> tuple[str, ...]:
+    key = _com_type_key(obj)
+    names = _METHOD_NAMES_CACHE.get(key)
+    if names is None:
+        names = tuple(_com_method_names(obj))
+        if key is not None:
+            _METHOD_NAMES_CACHE[key] = names
+    return names
+
 
 def _numeric_prop(obj: Any, name: str) -> Optional[float]:
     try:
@@ -425,6 +885,51 @@ def _string_prop(obj: Any, name: str) -> Optional[str]:
         return None
 
 
+# COM interface -> {member name: DISPID, or None where the name does not
+# resolve through IDispatch}.
+_DISPID_CACHE: dict[Any, dict[str, Optional[int]]] = {}
+
+def _prop_values(obj: Any, names: Iterable[str]) -> dict[str, Any]:
+    # Raw values of several members in one pass: each DISPID is resolved once
+    # per interface and read with a direct Invoke instead of a getattr name
+    # lookup. Names that cannot be read are left out of the result.
+    _, pythoncom = _com_mods()
+    oleobj = getattr(obj, "_oleobj_", None)
+    out: dict[str, Any] = {}
+    if pythoncom is None or oleobj is None:
+        dispids: dict[str, Optional[int]] = {}
+    else:
+        key = _com_type_key(obj)
+        dispids = _DISPID_CACHE.setdefault(key, {}) if key is not None else {}
+        flags = pythoncom.DISPATCH_PROPERTYGET | pythoncom.DISPATCH_METHOD
+    for name in names:
+        if oleobj is not None and pythoncom is not None:
+            if name not in dispids:
+                try:
+                    dispids[name] = oleobj.GetIDsOfNames(name)
+                except Exception:
+                    dispids[name] = None
+            dispid = dispids[name]
+            if dispid is not None:
+                try:
+                    out[name] = oleobj.Invoke(dispid, 0, flags, True)
+                except Exception:
+                    pass
+                continue
+        # Python-side attributes, or no IDispatch at all.
+        try:
+            val = getattr(obj, name)
+            out[name] = val() if callable(val) else val
+        except Exception:
+            pass
+    return out
+
+def _as_number(val: Any) -> Optional[float]:
+    try:
+        return float(val)
+    except Exception:
+        return None
+
 def close_data_windows(qf: Any) -> int:
     closed = 0
     try:
@@ -432,11 +937,6 @@ def close_data_windows(qf: Any) -> int:
     except Exception:
         return 0
 
-    try:
-        count = int(windows.Count)
-    except Exception:
-        count = -1
-
     def _close(win: Any) -> bool:
         for name in ("Close", "CloseWindow"):
             try:
@@ -449,106 +949,191 @@ def close_data_windows(qf: Any) -> int:
         return False
 
     def _title(win: Any) -> str:
-        for attr in ("Caption", "Title", "Name"):
+        key = type(win)
+        for attr in _attr_order(_TITLE_ATTRS, _TITLE_ATTR_CACHE.get(key)):
             try:
                 val = getattr(win, attr)
                 if isinstance(val, str):
+                    _TITLE_ATTR_CACHE[key] = attr
                     return val
             except Exception:
                 continue
         return ""
 
-    targets = []
-    if count and count > 0:
-        for i in range(1, count + 1):
-            try:
-                targets.append(windows.Item(i))
-            except Exception:
-                try:
-                    targets.append(windows(i))
-                except Exception:
-                    break
-    else:
-        i = 1
-        while True:
-            try:
-                targets.append(windows.Item(i))
-            except Exception:
-                try:
-                    targets.append(windows(i))
-                except Exception:
-                    break
-            i += 1
-
+    # Snapshot first: closing windows shifts the collection indices.
+    targets = list(iter_collection(windows))
     for win in targets:
         title = _title(win).lower()
         if ".dms" in title or "data" in title:
             if _close(win):
                 closed += 1
+    if closed:
+        # Label collections fetched through a closed DataDoc window may be stale.
+        forget_cached("data_doc", "label_collection", "label_index")
     return closed
 
+def item_at(col: Any, index: int) -> Any:
+    # Collections expose either Item(i) or a callable default member; remember
+    # which one worked per wrapper type and only probe the other on failure.
+    key = type(col)
+    if _ITEM_ACCESSOR.get(key, "Item") == "Item":
+        try:
+            return col.Item(index)
+        except Exception:
+            item = col(index)
+            _ITEM_ACCESSOR[key] = "call"
+            return item
+    try:
+        return col(index)
+    except Exception:
+        item = col.Item(index)
+        _ITEM_ACCESSOR[key] = "Item"
+        return item
+
+def _item_getter(col: Any) -> Any:
+    # Bind the accessor item_at found for this wrapper type once per walk
+    # instead of resolving col.Item on every index.
+    if _ITEM_ACCESSOR.get(type(col), "Item") == "Item":
+        try:
+            return col.Item
+        except Exception:
+            pass
+    return col
+
 def iter_collection(col: Any) -> Iterable[Any]:
     try:
         count = int(col.Count)
     except Exception:
         count = -1
+    get = _item_getter(col)
     if count and count > 0:
         for i in range(1, count + 1):
             try:
-                yield col.Item(i)
+                item = get(i)
             except Exception:
                 try:
-                    yield col(i)
+                    item = item_at(col, i)
                 except Exception:
                     break
+            yield item
         return
 
+    # No usable Count: prefer the collection's _NewEnum enumerator, then probe
+    # indices until the collection runs out.
+    try:
+        items = iter(col)
+    except Exception:
+        items = None
+    if items is not None:
+        yielded = False
+        try:
+            for item in items:
+                yielded = True
+                yield item
+            return
+        except Exception:
+            if yielded:
+                return
+
     i = 1
     while True:
         try:
-            yield col.Item(i)
+            item = get(i)
         except Exception:
             try:
-                yield col(i)
+                item = item_at(col, i)
             except Exception:
                 break
+        yield item
         i += 1
 
+def iter_collection_indexed(col: Any, count: Optional[int] = None) -> Iterable[Any]:
+    # Count up front and Item(i) only: no _NewEnum or open-ended index probing
+    # when Count is missing, and stopping early reads nothing further. Callers
+    # that already read Count pass it in to skip the second round-trip.
+    if count is None:
+        try:
+            count = int(col.Count)
+        except Exception:
+            return
+    get = _item_getter(col)
+    for i in range(1, count + 1):
+        try:
+            item = get(i)
+        except Exception:
+            try:
+                item = item_at(col, i)
+            except Exception:
+                return
+        yield item
+
 def iter_all_shapes(shapes: Any) -> Iterable[Any]:
     return iter_collection(shapes)
 
+def _attr_order(attrs: tuple[str, ...], cached: Optional[str]) -> tuple[str, ...]:
+    # Try the attribute that worked last time for this wrapper type first;
+    # the others are only probed if it stops answering.
+    if cached is None:
+        return attrs
+    return (cached,) + tuple(a for a in attrs if a != cached)
+
 def shape_label_name(shape: Any) -> str:
-    for attr in ("LabelName", "Label", "BlockLabel"):
+    key = type(shape)
+    for attr in _attr_order(_LABEL_ATTRS, _LABEL_ATTR_CACHE.get(key)):
         try:
             val = getattr(shape, attr)
             if hasattr(val, "Name"):
-                return str(val.Name)
-            if val is not None:
-                return str(val)
+                name = str(val.Name)
+            elif val is not None:
+                name = str(val)
+            else:
+                continue
         except Exception:
             continue
+        _LABEL_ATTR_CACHE[key] = attr
+        return name
     return ""
 
 def normalize_labels(value: Any) -> list[str]:
+    # Strip each name once and drop repeats (first occurrence wins): every
+    # duplicate would otherwise cost its own block lookup downstream.
     if value is None:
         return []
     if isinstance(value, (list, tuple)):
-        return [str(v).strip() for v in value if str(v).strip()]
-    text = str(value)
-    return [v.strip() for v in text.split(",") if v.strip()]
+        names = (str(v).strip() for v in value)
+    else:
+        names = map(str.strip, str(value).split(","))
+    return list(dict.fromkeys(n for n in names if n))
 
 def find_shapes_by_label(model: Any, label_name: str) -> list[Any]:
     shapes: list[Any] = []
-    try:
-        shape_range = model.Shapes.LabeledAs(label_name)
-    except Exception:
-        shape_range = None
+    shape_range = None
+    key = type(model)
+    if _LABELED_AS_WORKS.get(key, True):
+        try:
+            shape_range = model.Shapes.LabeledAs(label_name)
+        except Exception as exc:
+            # Not supported by this model interface: go straight to the scan
+            # next time. A call that fails for this one label (e.g. an unknown
+            # name) says nothing about the next.
+            if _member_missing(exc):
+                _LABELED_AS_WORKS[key] = False
 
     if shape_range is not None:
         shapes = list(iter_collection(shape_range))
 
     if not shapes:
-        for shp in iter_all_shapes(model.Shapes):
-            if shape_label_name(shp) == label_name:
-                shapes.append(shp)
+        shapes = list(index_shapes_by_label(model).get(label_name, ()))
     return shapes
+
+def index_shapes_by_label(model: Any) -> dict[str, list[Any]]:
+    # One walk over model.Shapes grouped by label name; it lives in the model
+    # cache, so rebuild_model/save drop it when topology can change.
+    cache = model_cache(model)
+    index = cache.get("shapes_by_label")
+    if index is None:
+        index = {}
+        for shp in iter_all_shapes(model.Shapes):
+            index.setdefault(shape_label_name(shp), []).append(shp)
+        cache["shapes_by_label"] = index
+    return index
@@ -1,45 +1,121 @@
 from __future__ import annotations
 import argparse
+import itertools
 import json
+import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional, Sequence
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    ijson = None
 
 from .connection import (
+    _com_mods,
+    _com_type_key,
+    _member_missing,
     win32com,
+    orjson,
     dispatch_qf_app,
     open_problem,
     ensure_model_loaded,
     normalize_labels,
     find_shapes_by_label,
+    index_shapes_by_label,
     iter_collection,
+    iter_collection_indexed,
+    iter_all_shapes,
+    rebuild_model,
+    get_active_problem,
+    remember_problem,
+    model_cache,
+    forget_model_cache,
 )
 
-def try_move(target: Any, qf: Any, dx: float, dy: float) -> Optional[str]:
-    attempts: Sequence[tuple[str, tuple[Any, ...]]] = []
-    try:
-        point = qf.PointXY(dx, dy)
-        origin = qf.PointXY(0.0, 0.0)
-        attempts = [
-            ("Move(dx,dy)", (dx, dy)),
-            ("Move(PointXY)", (point,)),
-            ("Move(PointXY,PointXY)", (origin, point)),
-        ]
-    except Exception:
-        attempts = [
-            ("Move(dx,dy)", (dx, dy)),
-        ]
-
-    attempts = [("Move()", tuple())] + list(attempts)
-
-    for name, params in attempts:
+# (COM interface, method) -> name of the call signature that worked last.
+# Keyed on the interface, not the Python type: late-bound wrappers are all
+# CDispatch whatever they wrap.
+_SIG_CACHE: dict[tuple[Any, str], str] = {}
+
+def _sig_key(target: Any, method: str) -> Optional[tuple[Any, str]]:
+    # None when the interface is unknown; nothing is remembered under it.
+    key = _com_type_key(target)
+    return (key, method) if key is not None else None
+
+def _sig_order(
+    attempts: Sequence[tuple[str, tuple[Any, ...]]], cached: Optional[str]
+) -> Sequence[tuple[str, tuple[Any, ...]]]:
+    if cached is None:
+        return attempts
+    first = [a for a in attempts if a[0] == cached]
+    return first + [a for a in attempts if a[0] != cached]
+
+def _call_sig(
+    target: Any,
+    method: str,
+    attempts: Sequence[tuple[str, tuple[Any, ...]]],
+    pick: Optional[Callable[[Any], Any]] = None,
+) -> tuple[Optional[str], Any]:
+    # Each rejected signature costs a com_error; try the one that worked for
+    # this interface first so steady-state calls raise nothing. With pick, the
+    # return value is mapped through it and a None result counts as a miss,
+    # so only a signature that produced something is remembered.
+    if not hasattr(target, method):
+        return None, None
+    fn = getattr(target, method)
+    key = _sig_key(target, method)
+    for name, params in _sig_order(attempts, _SIG_CACHE.get(key)):
         try:
-            target.Move(*params)
-            return name
+            ret = fn(*params)
+            if pick is not None:
+                ret = pick(ret)
         except Exception:
             continue
-    return None
+        if pick is not None and ret is None:
+            continue
+        if key is not None:
+            _SIG_CACHE[key] = name
+        return name, ret
+    return None, None
 
-def try_point_assign(target: Any, qf: Any, dx: float, dy: float) -> Optional[str]:
+def _point_xy(qf: Any) -> Any:
+    # Resolve qf.PointXY once; loops over vertices pass the bound method on
+    # instead of looking it up through IDispatch for every vertex.
+    try:
+        return qf.PointXY
+    except Exception:
+        return None
+
+def _move_attempts(point_xy: Any, dx: float, dy: float) -> list[tuple[str, tuple[Any, ...]]]:
+    attempts: list[tuple[str, tuple[Any, ...]]] = [("Move()", tuple()), ("Move(dx,dy)", (dx, dy))]
+    try:
+        point = point_xy(dx, dy)
+        origin = point_xy(0.0, 0.0)
+        attempts.append(("Move(PointXY)", (point,)))
+        attempts.append(("Move(PointXY,PointXY)", (origin, point)))
+    except Exception:
+        pass
+    return attempts
+
+def try_move(
+    target: Any,
+    qf: Any,
+    dx: float,
+    dy: float,
+    attempts: Optional[Sequence[tuple[str, tuple[Any, ...]]]] = None,
+) -> Optional[str]:
+    if attempts is None:
+        attempts = _move_attempts(_point_xy(qf), dx, dy)
+
+    name, _ = _call_sig(target, "Move", attempts)
+    return name
+
+def try_point_assign(target: Any, qf: Any, dx: float, dy: float, point_xy: Any = None) -> Optional[str]:
     try:
         pt = target.Point
     except Exception as exc:
@@ -52,10 +128,12 @@ def try_point_assign(target: Any, qf: Any, dx: float, dy: float) -> Optional[str
         return f"Point.X/Y read failed: {exc}"
 
     try:
-        new_pt = qf.PointXY(x0 + dx, y0 + dy)
+        new_pt = (point_xy or qf.PointXY)(x0 + dx, y0 + dy)
     except Exception as exc:
         return f"PointXY failed: {exc}"
 
+    # Always try the real assignment first: X/Y on the Point read above may
+    # only change a detached copy, so it is never made the preferred path.
     try:
         target.Point = new_pt
         return "Point=PointXY"
@@ -69,19 +147,111 @@ def try_point_assign(target: Any, qf: Any, dx: float, dy: float) -> Optional[str
     except Exception as exc:
         return f"Point set failed: {exc}"
 
+def _selection_count(sel: Any) -> Optional[int]:
+    try:
+        return int(getattr(sel, "Count"))
+    except Exception:
+        return None
+
+def _move_selection(sel: Any, qf: Any, dx: float, dy: float) -> bool:
+    # One ShapeRange.Move moves every shape in the range in a single COM call.
+    try:
+        sel.Move(0, qf.PointXY(dx, dy))
+    except Exception:
+        return False
+    key = _sig_key(sel, "Move")
+    if key is not None:
+        _SIG_CACHE[key] = "Move(0,PointXY)"
+    return True
+
+def _move_range(sel: Any, qf: Any, dx: float, dy: float) -> bool:
+    # Start with whichever of Move(0, vec) and the try_move variants last
+    # worked for this range type; the other is only a fallback.
+    if _SIG_CACHE.get(_sig_key(sel, "Move"), "Move(0,PointXY)") == "Move(0,PointXY)":
+        return _move_selection(sel, qf, dx, dy) or try_move(sel, qf, dx, dy) is not None
+    return try_move(sel, qf, dx, dy) is not None or _move_selection(sel, qf, dx, dy)
+
+def _coords_bbox(coords: Sequence[tuple[float, float]]) -> tuple[float, float, float, float]:
+    # Single pass over the cached coordinates; no COM reads.
+    it = iter(coords)
+    left, bottom = next(it)
+    right, top = left, bottom
+    for x, y in it:
+        if x < left:
+            left = x
+        elif x > right:
+            right = x
+        if y < bottom:
+            bottom = y
+        elif y > top:
+            top = y
+    return left, bottom, right, top
+
+def _union_bounds(bounds: Sequence[tuple[float, float, float, float]]) -> tuple[float, float, float, float]:
+    # One pass instead of four min/max generator walks.
+    left, bottom, right, top = bounds[0]
+    for b_left, b_bottom, b_right, b_top in bounds[1:]:
+        if b_left < left:
+            left = b_left
+        if b_bottom < bottom:
+            bottom = b_bottom
+        if b_right > right:
+            right = b_right
+        if b_top > top:
+            top = b_top
+    return left, bottom, right, top
+
+def _move_vertices_in_bbox(model: Any, qf: Any, coords: Sequence[tuple[float, float]], dx: float, dy: float) -> bool:
+    # Select the collected vertices through their bounding box and move them
+    # at once; only used when the box holds exactly those vertices.
+    if not coords:
+        return False
+    left, bottom, right, top = _coords_bbox(coords)
+    eps = 1e-9
+    try:
+        vertices = model.Shapes.Vertices
+    except Exception:
+        return False
+    sel = _try_selection_in_rect(vertices, qf, left - eps, bottom - eps, right + eps, top + eps)
+    if sel is None or _selection_count(sel) != len(coords):
+        return False
+    return _move_selection(sel, qf, dx, dy)
+
 def move_vertices(selection: Any, qf: Any, dx: float, dy: float) -> tuple[int, int]:
     try:
         vertices = selection.Vertices
     except Exception:
         return 0, 0
 
-    moved = 0
-    total = 0
-    for vtx in iter_collection(vertices):
-        total += 1
-        if move_vertex(vtx, qf, dx, dy):
-            moved += 1
-    return moved, total
+    count = _selection_count(vertices)
+    if count and _move_selection(vertices, qf, dx, dy):
+        return count, count
+
+    return _move_vertices_in_collection(vertices, qf, dx, dy)
+
+DEDUP_EPS = 1e-9
+
+class _PointDedup:
+    # Grid-bucket dedup: a point within eps of one already seen is the same
+    # vertex. Neighbouring cells are checked too, so coincident points that
+    # differ in the last bits (1.0000000001 vs 0.9999999998) still match even
+    # when they fall on opposite sides of a cell edge.
+    def __init__(self, eps: float = DEDUP_EPS) -> None:
+        self.eps = eps
+        self._cells: dict[tuple[int, int], list[tuple[float, float]]] = {}
+
+    def add(self, x: float, y: float) -> bool:
+        eps = self.eps
+        cx = math.floor(x / eps)
+        cy = math.floor(y / eps)
+        cells = self._cells
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                for px, py in cells.get((i, j), ()):
+                    if abs(px - x) <= eps and abs(py - y) <= eps:
+                        return False
+        cells.setdefault((cx, cy), []).append((x, y))
+        return True
 
 def _shape_block_label_name(shape: Any) -> str:
     try:
@@ -94,24 +264,27 @@ def _shape_block_label_name(shape: Any) -> str:
         return ""
     return ""
 
-def move_vertices_by_block_label(model: Any, label: str, qf: Any, dx: float, dy: float) -> tuple[int, int]:
-    # Try selection by label first.
-    try:
-        sel = model.Selection
-        sel = sel.LabeledAs(label)
-        moved, total = move_vertices(sel, qf, dx, dy)
-        if total > 0:
-            return moved, total
-    except Exception:
-        pass
-
-    # Fallback: scan shapes and move their vertices by BlockLabel name.
-    moved = 0
-    total = 0
-    seen: set[tuple[float, float]] = set()
-    for shp in iter_all_shapes(model.Shapes):
-        if _shape_block_label_name(shp) != label:
-            continue
+def _shapes_by_block_label(model: Any) -> dict[str, list[Any]]:
+    # One pass over the shapes groups them by block label; later labels on the
+    # same model reuse it until the next rebuild.
+    cache = model_cache(model)
+    index = cache.get("shapes_by_block_label")
+    if index is None:
+        index = {}
+        for shp in iter_all_shapes(model.Shapes):
+            index.setdefault(_shape_block_label_name(shp), []).append(shp)
+        cache["shapes_by_block_label"] = index
+    return index
+
+def _label_vertex_targets(
+    model: Any, label: str, eps: float = DEDUP_EPS
+) -> tuple[list[Any], list[Optional[tuple[float, float]]]]:
+    # Scan shapes and collect their vertices by BlockLabel name, deduped, with
+    # the (x, y) read on the way (None where unreadable).
+    targets: list[Any] = []
+    coords: list[Optional[tuple[float, float]]] = []
+    seen = _PointDedup(eps)
+    for shp in _shapes_by_block_label(model).get(label, ()):
         try:
             vertices = shp.Vertices
         except Exception:
@@ -120,37 +293,69 @@ def move_vertices_by_block_label(model: Any, label: str, qf: Any, dx: float, dy:
             key = None
             try:
                 pt = vtx.Point
-                key = (round(float(getattr(pt, "X")), 9), round(float(getattr(pt, "Y")), 9))
+                key = (float(getattr(pt, "X")), float(getattr(pt, "Y")))
             except Exception:
                 pass
-            if key is not None and key in seen:
+            if key is not None and not seen.add(*key):
                 continue
-            total += 1
-            if move_vertex(vtx, qf, dx, dy):
-                moved += 1
-                if key is not None:
-                    seen.add(key)
-    return moved, total
+            targets.append(vtx)
+            coords.append(key)
+    return targets, coords
 
-def _selection_in_rectangle(selection: Any, qf: Any, x1: float, y1: float, x2: float, y2: float) -> Optional[Any]:
-    # Try common signatures for InRectangle.
-    attempts: Sequence[tuple[str, tuple[Any, ...]]] = []
+def move_vertices_by_block_label(
+    model: Any, label: str, qf: Any, dx: float, dy: float, eps: float = DEDUP_EPS
+) -> tuple[int, int]:
+    # Try selection by label first.
     try:
-        p1 = qf.PointXY(x1, y1)
-        p2 = qf.PointXY(x2, y2)
-        attempts = [
-            ("InRectangle(PointXY,PointXY)", (p1, p2)),
-            ("InRectangle(x1,y1,x2,y2)", (x1, y1, x2, y2)),
-        ]
+        sel = model.Selection
+        sel = sel.LabeledAs(label)
+        moved, total = move_vertices(sel, qf, dx, dy)
+        if total > 0:
+            return moved, total
     except Exception:
-        attempts = [("InRectangle(x1,y1,x2,y2)", (x1, y1, x2, y2))]
+        pass
+
+    # Fallback: scan shapes and collect their vertices by BlockLabel name.
+    targets, coords = _label_vertex_targets(model, label, eps)
+    total = len(targets)
+    if total and None not in coords and _move_vertices_in_bbox(model, qf, coords, dx, dy):
+        return total, total
+
+    point_xy = _point_xy(qf)
+    attempts = _move_attempts(point_xy, dx, dy)
+    mv = move_vertex
+    moved = 0
+    for vtx, xy in zip(targets, coords):
+        if mv(vtx, qf, dx, dy, point_xy, attempts, xy):
+            moved += 1
+    return moved, total
 
-    for _, params in attempts:
+def _selection_in_rectangle(
+    selection: Any,
+    qf: Any,
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    p1: Any = None,
+    p2: Any = None,
+) -> Optional[Any]:
+    # Try common signatures for InRectangle, the remembered one first.
+    # p1/p2 are corner PointXY objects the caller already built.
+    attempts: list[tuple[str, tuple[Any, ...]]] = []
+    if p1 is not None and p2 is not None:
+        attempts.append(("InRectangle(PointXY,PointXY)", (p1, p2)))
+    elif _SIG_CACHE.get(_sig_key(selection, "InRectangle")) != "InRectangle(x1,y1,x2,y2)":
         try:
-            return selection.InRectangle(*params)
+            p1 = qf.PointXY(x1, y1)
+            p2 = qf.PointXY(x2, y2)
+            attempts.append(("InRectangle(PointXY,PointXY)", (p1, p2)))
         except Exception:
-            continue
-    return None
+            pass
+    attempts.append(("InRectangle(x1,y1,x2,y2)", (x1, y1, x2, y2)))
+
+    _, sel = _call_sig(selection, "InRectangle", attempts)
+    return sel
 
 def _rect_with_epsilon(rect: Sequence[float], epsilon: float) -> Optional[tuple[float, float, float, float]]:
     if len(rect) != 4:
@@ -160,16 +365,68 @@ def _rect_with_epsilon(rect: Sequence[float], epsilon: float) -> Optional[tuple[
     y_min, y_max = (y1, y2) if y1 <= y2 else (y2, y1)
     return x_min - epsilon, y_min - epsilon, x_max + epsilon, y_max + epsilon
 
-def _move_vertices_in_collection(col: Any, qf: Any, dx: float, dy: float) -> tuple[int, int]:
+@dataclass
+class RectContext:
+    # One normalized rectangle: its corner PointXY objects are built once and
+    # each InRectangle selection made from it is kept by selector name.
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    qf: Any = None
+    p1: Any = None
+    p2: Any = None
+    selections: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_rect(cls, rect: Sequence[float], epsilon: float, qf: Any) -> Optional["RectContext"]:
+        rect_eps = _rect_with_epsilon(rect, epsilon)
+        if rect_eps is None:
+            return None
+        return cls(*rect_eps, qf=qf)
+
+    def points(self) -> tuple[Any, Any]:
+        if self.p1 is None and self.qf is not None:
+            try:
+                self.p1 = self.qf.PointXY(self.x1, self.y1)
+                self.p2 = self.qf.PointXY(self.x2, self.y2)
+            except Exception:
+                self.p1 = self.p2 = None
+                self.qf = None
+        return self.p1, self.p2
+
+    def select(self, name: str, selector: Any) -> Optional[Any]:
+        if name not in self.selections:
+            self.selections[name] = _try_selection_in_rect(
+                selector, self.qf, self.x1, self.y1, self.x2, self.y2, *self.points()
+            )
+        return self.selections[name]
+
+def _move_vertices_in_collection(
+    col: Any,
+    qf: Any,
+    dx: float,
+    dy: float,
+    point_xy: Any = None,
+    attempts: Optional[Sequence[tuple[str, tuple[Any, ...]]]] = None,
+) -> tuple[int, int]:
+    if point_xy is None:
+        point_xy = _point_xy(qf)
+    if attempts is None:
+        attempts = _move_attempts(point_xy, dx, dy)
+    # Bind the per-vertex call once; the loop body then runs on locals only.
+    mv = move_vertex
     moved = 0
     total = 0
     for vtx in iter_collection(col):
         total += 1
-        if move_vertex(vtx, qf, dx, dy):
+        if mv(vtx, qf, dx, dy, point_xy, attempts):
             moved += 1
     return moved, total
 
 def _move_vertices_in_shapes(shapes: Any, qf: Any, dx: float, dy: float) -> tuple[int, int]:
+    point_xy = _point_xy(qf)
+    attempts = _move_attempts(point_xy, dx, dy)
     moved = 0
     total = 0
     for shp in iter_collection(shapes):
@@ -177,14 +434,16 @@ def _move_vertices_in_shapes(shapes: Any, qf: Any, dx: float, dy: float) -> tupl
             vertices = shp.Vertices
         except Exception:
             continue
-        moved_i, total_i = _move_vertices_in_collection(vertices, qf, dx, dy)
+        moved_i, total_i = _move_vertices_in_collection(vertices, qf, dx, dy, point_xy, attempts)
         moved += moved_i
         total += total_i
     return moved, total
 
-def _try_selection_in_rect(obj: Any, qf: Any, x1: float, y1: float, x2: float, y2: float) -> Optional[Any]:
+def _try_selection_in_rect(
+    obj: Any, qf: Any, x1: float, y1: float, x2: float, y2: float, p1: Any = None, p2: Any = None
+) -> Optional[Any]:
     try:
-        sel = _selection_in_rectangle(obj, qf, x1, y1, x2, y2)
+        sel = _selection_in_rectangle(obj, qf, x1, y1, x2, y2, p1, p2)
         if sel is not None:
             return sel
     except Exception:
@@ -192,16 +451,16 @@ def _try_selection_in_rect(obj: Any, qf: Any, x1: float, y1: float, x2: float, y
     return None
 
 def move_vertices_in_rect(model: Any, qf: Any, rect: Sequence[float], dx: float, dy: float, epsilon: float = 0.0) -> tuple[int, int]:
-    rect_eps = _rect_with_epsilon(rect, epsilon)
-    if rect_eps is None:
+    ctx = RectContext.from_rect(rect, epsilon, qf)
+    if ctx is None:
         return 0, 0
-    x1, y1, x2, y2 = rect_eps
 
     # Try selection on Shapes first (it knows geometry).
-    for selector in (getattr(model, "Shapes", None), getattr(model, "Selection", None)):
+    for name in ("Shapes", "Selection"):
+        selector = getattr(model, name, None)
         if selector is None:
             continue
-        sel = _try_selection_in_rect(selector, qf, x1, y1, x2, y2)
+        sel = ctx.select(name, selector)
         if sel is None:
             continue
         # If selection supports Move, try that first.
@@ -220,8 +479,7 @@ def move_vertices_in_rect(model: Any, qf: Any, rect: Sequence[float], dx: float,
 
     # Fallback: attempt on model.Shapes.Blocks / Vertices directly.
     try:
-        blocks = model.Shapes.Blocks
-        sel = _try_selection_in_rect(blocks, qf, x1, y1, x2, y2)
+        sel = ctx.select("Shapes.Blocks", model.Shapes.Blocks)
         if sel is not None:
             try:
                 vertices = sel.Vertices
@@ -230,82 +488,154 @@ def move_vertices_in_rect(model: Any, qf: Any, rect: Sequence[float], dx: float,
                 return _move_vertices_in_shapes(sel, qf, dx, dy)
     except Exception:
         pass
-    return 0, 0
 
-def move_blocks_in_rect(model: Any, qf: Any, rect: Sequence[float], dx: float, dy: float, epsilon: float = 0.0) -> tuple[int, int]:
-    rect_eps = _rect_with_epsilon(rect, epsilon)
-    if rect_eps is None:
+    # No InRectangle at all: answer the rect from a local grid over the
+    # vertex coordinates, read once per model.
+    grid = _vertex_grid(model)
+    if grid is None:
         return 0, 0
-    x1, y1, x2, y2 = rect_eps
-
-    def _selection_count(sel: Any) -> Optional[int]:
+    hits = grid.query(ctx.x1, ctx.y1, ctx.x2, ctx.y2)
+    point_xy = _point_xy(qf)
+    attempts = _move_attempts(point_xy, dx, dy)
+    moved = 0
+    for i in hits:
+        vtx, x, y = grid.items[i]
+        if move_vertex(vtx, qf, dx, dy, point_xy, attempts, (x, y)):
+            grid.move(i, dx, dy)
+            moved += 1
+    return moved, len(hits)
+
+class _VertexGrid:
+    # Uniform grid over vertex coordinates: a rect query visits only the
+    # cells it overlaps, then checks each candidate exactly.
+    def __init__(self, items: list[list[Any]]) -> None:
+        self.items = items
+        xs = [it[1] for it in items]
+        ys = [it[2] for it in items]
+        span = max(max(xs) - min(xs), max(ys) - min(ys))
+        self.cell = span / math.sqrt(len(items)) if span > 0 else 1.0
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for i, (_, x, y) in enumerate(items):
+            self.cells.setdefault(self._key(x, y), []).append(i)
+
+    def _key(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell), math.floor(y / self.cell)
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> list[int]:
+        (i1, j1), (i2, j2) = self._key(x1, y1), self._key(x2, y2)
+        items = self.items
+        hits = []
+        # A rect wider than the occupied cells walks the occupied cells
+        # instead, so the cost never exceeds the vertex count.
+        if (i2 - i1 + 1) * (j2 - j1 + 1) > len(self.cells):
+            buckets = (
+                ks for (i, j), ks in self.cells.items() if i1 <= i <= i2 and j1 <= j <= j2
+            )
+        else:
+            buckets = (
+                self.cells.get((i, j), ()) for i in range(i1, i2 + 1) for j in range(j1, j2 + 1)
+            )
+        for ks in buckets:
+            for k in ks:
+                _, x, y = items[k]
+                if x1 <= x <= x2 and y1 <= y <= y2:
+                    hits.append(k)
+        return sorted(hits)
+
+    def move(self, k: int, dx: float, dy: float) -> None:
+        item = self.items[k]
+        old = self._key(item[1], item[2])
+        item[1] += dx
+        item[2] += dy
+        new = self._key(item[1], item[2])
+        if new != old:
+            self.cells[old].remove(k)
+            self.cells.setdefault(new, []).append(k)
+
+def _vertex_grid(model: Any) -> Optional[_VertexGrid]:
+    # Cached with the model; cmd_model drops it after any action that can
+    # move vertices behind its back.
+    cache = model_cache(model)
+    if "vertex_grid" not in cache:
+        items: list[list[Any]] = []
         try:
-            return int(getattr(sel, "Count"))
+            for vtx in iter_collection(model.Shapes.Vertices):
+                try:
+                    pt = vtx.Point
+                    items.append([vtx, float(getattr(pt, "X")), float(getattr(pt, "Y"))])
+                except Exception:
+                    continue
         except Exception:
-            return None
+            pass
+        cache["vertex_grid"] = _VertexGrid(items) if items else None
+    return cache["vertex_grid"]
+
+def move_blocks_in_rect(model: Any, qf: Any, rect: Sequence[float], dx: float, dy: float, epsilon: float = 0.0) -> tuple[int, int]:
+    ctx = RectContext.from_rect(rect, epsilon, qf)
+    if ctx is None:
+        return 0, 0
 
     # Try Blocks.InRectangle to get a shape range, then move it.
     try:
-        blocks = model.Shapes.Blocks
-        sel = _try_selection_in_rect(blocks, qf, x1, y1, x2, y2)
+        sel = ctx.select("Shapes.Blocks", model.Shapes.Blocks)
         if sel is not None:
             count = _selection_count(sel)
             if count == 0:
                 sel = None
             else:
-                try:
-                    vec = qf.PointXY(dx, dy)
-                    sel.Move(0, vec)
+                if _move_range(sel, qf, dx, dy):
                     moved = count if count is not None else 1
                     return moved, moved
-                except Exception:
-                    if try_move(sel, qf, dx, dy) is not None:
-                        moved = count if count is not None else 1
-                        return moved, moved
     except Exception:
         pass
 
     # Try Selection.InRectangle then Move.
     try:
-        sel = _try_selection_in_rect(model.Selection, qf, x1, y1, x2, y2)
+        sel = ctx.select("Selection", model.Selection)
         if sel is not None:
             count = _selection_count(sel)
             if count == 0:
                 sel = None
             else:
-                try:
-                    vec = qf.PointXY(dx, dy)
-                    sel.Move(0, vec)
+                if _move_range(sel, qf, dx, dy):
                     moved = count if count is not None else 1
                     return moved, moved
-                except Exception:
-                    if try_move(sel, qf, dx, dy) is not None:
-                        moved = count if count is not None else 1
-                        return moved, moved
     except Exception:
         pass
 
     return 0, 0
 
-def _add_edge(shapes: Any, qf: Any, x1: float, y1: float, x2: float, y2: float, v1: Any = None, v2: Any = None) -> bool:
-    attempts: Sequence[tuple[str, tuple[Any, ...]]] = []
+def _add_edge(
+    shapes: Any,
+    qf: Any,
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    v1: Any = None,
+    v2: Any = None,
+    p1: Any = None,
+    p2: Any = None,
+) -> bool:
+    attempts: list[tuple[str, tuple[Any, ...]]] = []
     if v1 is not None and v2 is not None:
         attempts.append(("AddEdge(v1,v2)", (v1, v2)))
-    try:
-        p1 = qf.PointXY(x1, y1)
-        p2 = qf.PointXY(x2, y2)
+    # Skip building PointXY pairs when the caller passed them, or once a
+    # non-point signature is known to work.
+    cached = _SIG_CACHE.get(_sig_key(shapes, "AddEdge"))
+    if p1 is not None and p2 is not None:
         attempts.append(("AddEdge(PointXY,PointXY)", (p1, p2)))
-    except Exception:
-        pass
-    attempts.append(("AddEdge(x1,y1,x2,y2)", (x1, y1, x2, y2)))
-
-    for _, params in attempts:
+    elif cached is None or cached == "AddEdge(PointXY,PointXY)" or not attempts:
         try:
-            shapes.AddEdge(*params)
-            return True
+            p1 = qf.PointXY(x1, y1)
+            p2 = qf.PointXY(x2, y2)
+            attempts.append(("AddEdge(PointXY,PointXY)", (p1, p2)))
         except Exception:
-            continue
-    return False
+            pass
+    attempts.append(("AddEdge(x1,y1,x2,y2)", (x1, y1, x2, y2)))
+
+    name, _ = _call_sig(shapes, "AddEdge", attempts)
+    return name is not None
 
 def _set_selection_label(selection: Any, label: str) -> bool:
     try:
@@ -350,42 +680,64 @@ def _try_add_block_label(problem: Any, qf: Any, x: float, y: float, label: str)
         point = None
 
     method_names = ("Add", "Insert")
-    arg_sets: list[tuple[Any, ...]] = []
+    arg_sets: list[tuple[str, tuple[Any, ...]]] = []
     if point is not None:
-        arg_sets.append((point,))
-        arg_sets.append((point, label))
-        arg_sets.append((label, point))
-    arg_sets.append((x, y))
-    arg_sets.append((x, y, label))
-    arg_sets.append((label, x, y))
+        arg_sets.append(("(point)", (point,)))
+        arg_sets.append(("(point,label)", (point, label)))
+        arg_sets.append(("(label,point)", (label, point)))
+    arg_sets.append(("(x,y)", (x, y)))
+    arg_sets.append(("(x,y,label)", (x, y, label)))
+    arg_sets.append(("(label,x,y)", (label, x, y)))
 
     for obj in candidates:
         for m in method_names:
-            if not hasattr(obj, m):
+            name, lbl = _call_sig(obj, m, arg_sets)
+            if name is None:
                 continue
-            fn = getattr(obj, m)
-            for args in arg_sets:
+            # If Add returns None, try last item.
+            if lbl is None:
                 try:
-                    ret = fn(*args)
-                    lbl = ret
-                    # If Add returns None, try last item.
-                    if lbl is None:
-                        try:
-                            count = int(obj.Count)
-                            lbl = obj.Item(count)
-                        except Exception:
-                            lbl = None
-                    if lbl is not None and label:
-                        try:
-                            setattr(lbl, "Name", label)
-                        except Exception:
-                            pass
-                    return True
+                    count = int(obj.Count)
+                    lbl = obj.Item(count)
                 except Exception:
-                    continue
+                    lbl = None
+            if lbl is not None and label:
+                try:
+                    setattr(lbl, "Name", label)
+                except Exception:
+                    pass
+            return True
     return False
 
-def add_rect_with_block_label(model: Any, qf: Any, problem: Any, rect: Sequence[float], inset: float, label: str) -> tuple[bool, str]:
+def _label_rect(model: Any, qf: Any, problem: Any, ctx: RectContext, label: str) -> None:
+    if not label:
+        return
+    # Try to assign label to a block selection inside the rectangle.
+    rect_sel = None
+    try:
+        rect_sel = ctx.select("Shapes.Blocks", model.Shapes.Blocks)
+    except Exception:
+        rect_sel = None
+    if rect_sel is None:
+        rect_sel = ctx.select("Selection", model.Selection)
+    if rect_sel is not None:
+        _set_selection_label(rect_sel, label)
+
+    # Also try to drop a block label point at the center.
+    cx = (ctx.x1 + ctx.x2) / 2.0
+    cy = (ctx.y1 + ctx.y2) / 2.0
+    _try_add_block_label(problem, qf, cx, cy, label)
+
+def add_rect_with_block_label(
+    model: Any,
+    qf: Any,
+    problem: Any,
+    rect: Sequence[float],
+    inset: float,
+    label: str,
+    defer_rebuild: bool = False,
+    after_rebuild: Optional[list[Callable[[], None]]] = None,
+) -> tuple[bool, str]:
     if len(rect) != 4:
         return False, "rect must have 4 numbers"
     x1, y1, x2, y2 = [float(v) for v in rect]
@@ -407,40 +759,66 @@ def add_rect_with_block_label(model: Any, qf: Any, problem: Any, rect: Sequence[
     except Exception as exc:
         return False, f"AddVertexXY failed: {exc}"
 
+    # Build the four corner points once; every edge and the label
+    # selection below reuse them.
+    p_bl = p_tl = p_tr = p_br = None
+    try:
+        pxy = qf.PointXY
+        p_bl = pxy(x_min, y_min)
+        p_tl = pxy(x_min, y_max)
+        p_tr = pxy(x_max, y_max)
+        p_br = pxy(x_max, y_min)
+    except Exception:
+        p_bl = p_tl = p_tr = p_br = None
+
     edges_ok = True
-    edges_ok &= _add_edge(shapes, qf, x_min, y_min, x_min, y_max, v1, v2)
-    edges_ok &= _add_edge(shapes, qf, x_min, y_max, x_max, y_max, v2, v3)
-    edges_ok &= _add_edge(shapes, qf, x_max, y_max, x_max, y_min, v3, v4)
-    edges_ok &= _add_edge(shapes, qf, x_max, y_min, x_min, y_min, v4, v1)
+    edges_ok &= _add_edge(shapes, qf, x_min, y_min, x_min, y_max, v1, v2, p_bl, p_tl)
+    edges_ok &= _add_edge(shapes, qf, x_min, y_max, x_max, y_max, v2, v3, p_tl, p_tr)
+    edges_ok &= _add_edge(shapes, qf, x_max, y_max, x_max, y_min, v3, v4, p_tr, p_br)
+    edges_ok &= _add_edge(shapes, qf, x_max, y_min, x_min, y_min, v4, v1, p_br, p_bl)
     if not edges_ok:
         return False, "AddEdge failed for one or more edges"
 
-    rebuild_model(qf, problem)
-
-    if label:
-        # Try to assign label to a block selection inside the rectangle.
-        rect_sel = None
-        try:
-            rect_sel = _selection_in_rectangle(model.Shapes.Blocks, qf, x_min, y_min, x_max, y_max)
-        except Exception:
-            rect_sel = None
-        if rect_sel is None:
-            rect_sel = _selection_in_rectangle(model.Selection, qf, x_min, y_min, x_max, y_max)
-        if rect_sel is not None:
-            _set_selection_label(rect_sel, label)
-
-        # Also try to drop a block label point at the center.
-        cx = (x_min + x_max) / 2.0
-        cy = (y_min + y_max) / 2.0
-        _try_add_block_label(problem, qf, cx, cy, label)
+    msg = f"rect=({x_min},{y_min})-({x_max},{y_max}) label={label}"
+    ctx = RectContext(x_min, y_min, x_max, y_max, qf, p_bl, p_tr)
+    if defer_rebuild:
+        # The blocks only exist after a rebuild; the caller rebuilds once for
+        # the whole batch and then runs the queued label steps.
+        if after_rebuild is not None:
+            after_rebuild.append(lambda: _label_rect(model, qf, problem, ctx, label))
+        return True, msg
 
-    return True, f"rect=({x_min},{y_min})-({x_max},{y_max}) label={label}"
+    rebuild_model(qf, problem)
+    _label_rect(model, qf, problem, ctx, label)
+    return True, msg
+
+def move_vertex(
+    vtx: Any,
+    qf: Any,
+    dx: float,
+    dy: float,
+    point_xy: Any = None,
+    attempts: Optional[Sequence[tuple[str, tuple[Any, ...]]]] = None,
+    xy: Optional[tuple[float, float]] = None,
+) -> bool:
+    # Callers looping over many vertices pass point_xy/attempts built once,
+    # and xy when the vertex coordinates were already read.
+    if point_xy is None:
+        point_xy = _point_xy(qf)
+    if attempts is None:
+        attempts = _move_attempts(point_xy, dx, dy)
 
-def move_vertex(vtx: Any, qf: Any, dx: float, dy: float) -> bool:
     # Try Move with explicit delta first (some versions require it).
-    if try_move(vtx, qf, dx, dy) is not None:
+    if try_move(vtx, qf, dx, dy, attempts) is not None:
         return True
 
+    if xy is not None:
+        try:
+            vtx.Point = point_xy(xy[0] + dx, xy[1] + dy)
+            return True
+        except Exception:
+            pass
+
     try:
         pt = vtx.Point
     except Exception:
@@ -448,10 +826,9 @@ def move_vertex(vtx: Any, qf: Any, dx: float, dy: float) -> bool:
 
     if pt is not None:
         try:
-            x0 = float(getattr(pt, "X"))
-            y0 = float(getattr(pt, "Y"))
+            x0, y0 = xy if xy is not None else (float(getattr(pt, "X")), float(getattr(pt, "Y")))
             try:
-                new_pt = qf.PointXY(x0 + dx, y0 + dy)
+                new_pt = point_xy(x0 + dx, y0 + dy)
                 vtx.Point = new_pt
                 return True
             except Exception:
@@ -467,16 +844,67 @@ def move_vertex(vtx: Any, qf: Any, dx: float, dy: float) -> bool:
     except Exception:
         return False
 
-def move_block_labels(problem: Any, qf: Any, names: list[str], dx: float, dy: float, debug: bool = False) -> int:
-    moved = 0
-    target_names = {n.lower(): n for n in names}
-    for lbl in iter_labels_by_type(problem, 3):
+def _block_labels_by_name(problem: Any, names: list[str]) -> Optional[list[tuple[str, Any]]]:
+    # Look each name up with Labels(3).Item(name): K calls instead of reading
+    # every block label. None means the caller must scan this time (a name
+    # Item(name) rejects, e.g. one that only matches case-insensitively); only
+    # a collection without an Item member is never asked again.
+    try:
+        data_doc = problem.DataDoc
+    except Exception:
+        data_doc = problem
+    try:
+        labels = data_doc.Labels(3)
+    except Exception:
+        return None
+    if labels is None:
+        return None
+    key = _sig_key(labels, "Item(name)")
+    if _SIG_CACHE.get(key) == "unsupported":
+        return None
+    found: list[tuple[str, Any]] = []
+    for name in names:
+        try:
+            lbl = labels.Item(name)
+        except Exception as exc:
+            if _member_missing(exc) and key is not None:
+                _SIG_CACHE[key] = "unsupported"
+            return None
+        if lbl is None:
+            return None
+        if key is not None:
+            _SIG_CACHE[key] = "Item(name)"
+        # Report the label's own name, as the scan path does.
         try:
-            name = str(getattr(lbl, "Name"))
+            found.append((str(lbl.Name), lbl))
         except Exception:
-            continue
-        if name.lower() not in target_names:
-            continue
+            found.append((name, lbl))
+    return found
+
+def _find_block_labels(problem: Any, names: Sequence[str]) -> list[tuple[str, Any]]:
+    from .labels import iter_labels_by_type
+
+    targets = _block_labels_by_name(problem, list(names))
+    if targets is None:
+        targets = []
+        target_names = {n.lower(): n for n in names}
+        for lbl in iter_labels_by_type(problem, 3):
+            try:
+                name = str(getattr(lbl, "Name"))
+            except Exception:
+                continue
+            if name.lower() in target_names:
+                targets.append((name, lbl))
+    return targets
+
+def move_block_labels(problem: Any, qf: Any, names: list[str], dx: float, dy: float, debug: bool = False) -> int:
+    return _move_label_targets(_find_block_labels(problem, names), qf, dx, dy, debug)
+
+def _move_label_targets(targets: Sequence[tuple[str, Any]], qf: Any, dx: float, dy: float, debug: bool = False) -> int:
+    from .labels import _label_point
+
+    moved = 0
+    for name, lbl in targets:
         before = _label_point(lbl)
         moved_name = try_point_assign(lbl, qf, dx, dy)
         if moved_name is None:
@@ -492,39 +920,56 @@ def move_block_labels(problem: Any, qf: Any, names: list[str], dx: float, dy: fl
     return moved
 
 def _find_block_by_label(model: Any, label: str) -> Optional[Any]:
-    # Try Blocks.LabeledAs("", "", label) first (as in official sample).
+    cache = model_cache(model)
+    found = cache.setdefault("block_by_label", {})
+    if label not in found:
+        found[label] = _lookup_block_by_label(model, label, cache)
+    return found[label]
+
+def _first_item(sel: Any) -> Optional[Any]:
+    if sel is None:
+        return None
     try:
-        blocks = model.Shapes.Blocks
-        for method_name in ("LabeledAs", "GetLabeledAs"):
-            if not hasattr(blocks, method_name):
-                continue
-            method = getattr(blocks, method_name)
-            for args in ((label,), ("", "", label), ("", label, "")):
-                try:
-                    sel = method(*args)
-                    if sel is None:
-                        continue
-                    try:
-                        return sel.Item(1)
-                    except Exception:
-                        return sel(1)
-                except Exception:
-                    continue
+        return sel.Item(1)
     except Exception:
         pass
+    try:
+        return sel(1)
+    except Exception:
+        return None
 
-    # Fallback: scan blocks and compare Label name.
+def _lookup_block_by_label(model: Any, label: str, cache: dict[str, Any]) -> Optional[Any]:
+    # Try Blocks.LabeledAs with each signature (("", "", label) is the one in
+    # the official sample); an empty range moves on to the next signature.
     try:
         blocks = model.Shapes.Blocks
-        for blk in iter_collection(blocks):
-            try:
-                if str(getattr(blk, "Label")).strip().lower() == label.lower():
-                    return blk
-            except Exception:
-                continue
+        arg_sets = (
+            ("(label)", (label,)),
+            ("('','',label)", ("", "", label)),
+            ("('',label,'')", ("", label, "")),
+        )
+        for method_name in ("LabeledAs", "GetLabeledAs"):
+            name, blk = _call_sig(blocks, method_name, arg_sets, pick=_first_item)
+            if name is not None:
+                return blk
     except Exception:
         pass
-    return None
+
+    # Fallback: index every block by Label name in one scan, shared by all
+    # labels looked up on this model.
+    index = cache.get("block_scan")
+    if index is None:
+        index = {}
+        try:
+            for blk in iter_collection_indexed(model.Shapes.Blocks):
+                try:
+                    index.setdefault(str(getattr(blk, "Label")).strip().lower(), blk)
+                except Exception:
+                    continue
+        except Exception:
+            pass
+        cache["block_scan"] = index
+    return index.get(label.lower())
 
 def cmd_move_block(args: argparse.Namespace) -> int:
     if win32com is None:
@@ -571,33 +1016,37 @@ def cmd_move_block(args: argparse.Namespace) -> int:
     print(f"Moved block '{label}' by dx={dx}, dy={dy} using {moved}.")
     return 0
 
-def _collect_vertices_for_labels(model: Any, labels: list[str]) -> list[Any]:
+def _collect_vertices_for_labels(
+    model: Any, labels: list[str], eps: float = DEDUP_EPS
+) -> tuple[list[Any], list[Optional[tuple[float, float]]]]:
+    # Returns the vertices with a parallel list of the (x, y) read while
+    # deduping (None where unreadable), so callers never read them again.
     vertices: list[Any] = []
-    seen: set[tuple[float, float]] = set()
+    coords: list[Optional[tuple[float, float]]] = []
+    seen = _PointDedup(eps)
 
     def _add_vertex(vtx: Any) -> None:
         key = None
         try:
             pt = vtx.Point
-            key = (round(float(getattr(pt, "X")), 9), round(float(getattr(pt, "Y")), 9))
+            key = (float(getattr(pt, "X")), float(getattr(pt, "Y")))
         except Exception:
             key = None
-        if key is not None and key in seen:
+        if key is not None and not seen.add(*key):
             return
-        if key is not None:
-            seen.add(key)
         vertices.append(vtx)
+        coords.append(key)
 
     def _add_point_obj(pt: Any) -> None:
         try:
-            key = (round(float(getattr(pt, "X")), 9), round(float(getattr(pt, "Y")), 9))
+            key = (float(getattr(pt, "X")), float(getattr(pt, "Y")))
         except Exception:
             return
-        if key in seen:
+        if not seen.add(*key):
             return
-        seen.add(key)
         # Create a temporary PointXY vertex-like object if possible.
         vertices.append(pt)
+        coords.append(key)
 
     for label in labels:
         blk = _find_block_by_label(model, label)
@@ -649,7 +1098,127 @@ def _collect_vertices_for_labels(model: Any, labels: list[str]) -> list[Any]:
                 if pt is not None:
                     _add_point_obj(pt)
 
-    return vertices
+    return vertices, coords
+
+LabelBounds = tuple[str, bool, Optional[tuple[float, float, float, float]]]
+
+def _label_bounds(model: Any, labels: Sequence[str]) -> list[LabelBounds]:
+    out: list[LabelBounds] = []
+    for label in labels:
+        blk = _find_block_by_label(model, label)
+        out.append((label, blk is not None, _block_bounds(blk) if blk is not None else None))
+    return out
+
+def _label_bounds_worker(stream: Any, labels: Sequence[str]) -> list[LabelBounds]:
+    # Runs on a pool thread: join COM there and unmarshal a private proxy for
+    # the model, so the lookups overlap with the other workers' round-trips.
+    _, pythoncom = _com_mods()
+    pythoncom.CoInitialize()
+    try:
+        disp = pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch)
+        model = win32com.client.Dispatch(disp)
+        try:
+            return _label_bounds(model, labels)
+        finally:
+            forget_model_cache(model)
+            del model, disp
+    finally:
+        pythoncom.CoUninitialize()
+
+def _bounds_for_labels(model: Any, labels: Sequence[str], jobs: int = 1) -> list[LabelBounds]:
+    # (label, block found, bounds) per label, in label order. With jobs > 1
+    # the labels are split across that many threads.
+    _, pythoncom = _com_mods()
+    jobs = min(max(int(jobs or 1), 1), len(labels))
+    if jobs <= 1 or pythoncom is None:
+        return _label_bounds(model, labels)
+    groups = [labels[i::jobs] for i in range(jobs)]
+    try:
+        oleobj = getattr(model, "_oleobj_", model)
+        streams = [
+            pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, oleobj)
+            for _ in groups
+        ]
+    except Exception:
+        return _label_bounds(model, labels)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(_label_bounds_worker, streams, groups))
+    by_label = {r[0]: r for group in results for r in group}
+    return [by_label[label] for label in labels]
+
+def _vertex_moves_worker(
+    streams: tuple[Any, Any], work: Sequence[tuple[str, list[tuple[float, float]]]], dx: float, dy: float
+) -> list[tuple[str, bool]]:
+    # Same apartment setup as _label_bounds_worker; the PointXY factory on the
+    # application is needed here too, so both proxies are unmarshalled. Only
+    # the bounding-box move of coordinates collected by the caller runs here;
+    # whatever it cannot move is finished on the calling thread.
+    _, pythoncom = _com_mods()
+    pythoncom.CoInitialize()
+    try:
+        model, qf = (
+            win32com.client.Dispatch(pythoncom.CoGetInterfaceAndReleaseStream(s, pythoncom.IID_IDispatch))
+            for s in streams
+        )
+        try:
+            return [(name, _move_vertices_in_bbox(model, qf, coords, dx, dy)) for name, coords in work]
+        finally:
+            del model, qf
+    finally:
+        pythoncom.CoUninitialize()
+
+def _moves_stay_apart(boxes: Sequence[tuple[float, float, float, float]], dx: float, dy: float, pad: float) -> bool:
+    # True when no two labels' areas, before or after the move, touch; only
+    # then can their moves run concurrently without racing on a vertex or
+    # catching each other's vertices in a rect selection.
+    swept = [
+        (min(l, l + dx) - pad, min(b, b + dy) - pad, max(r, r + dx) + pad, max(t, t + dy) + pad)
+        for l, b, r, t in boxes
+    ]
+    for i, (l1, b1, r1, t1) in enumerate(swept):
+        for l2, b2, r2, t2 in swept[i + 1:]:
+            if l1 <= r2 and l2 <= r1 and b1 <= t2 and b2 <= t1:
+                return False
+    return True
+
+def _vertex_moves_by_labels(
+    model: Any, qf: Any, labels: Sequence[str], dx: float, dy: float, eps: float = DEDUP_EPS, jobs: int = 1
+) -> list[tuple[str, int, int]]:
+    # (label, moved, total) per label, in label order. With jobs > 1 the
+    # vertices are collected here, through the one shared shape scan, and the
+    # moves are spread over threads only when the labels are well apart;
+    # labels sharing a vertex (adjacent blocks) are always moved one by one.
+    _, pythoncom = _com_mods()
+    jobs = min(max(int(jobs or 1), 1), len(labels))
+    done: dict[str, tuple[int, int]] = {}
+    if jobs > 1 and pythoncom is not None:
+        work = [(name, _label_vertex_targets(model, name, eps)[1]) for name in labels]
+        boxes = [_coords_bbox(coords) for _, coords in work if coords and None not in coords]
+        # Labels without readable vertices fall through to the serial path.
+        apart = len(boxes) == len(work) and _moves_stay_apart(boxes, dx, dy, max(eps, 1e-9))
+        if apart:
+            groups = [work[i::jobs] for i in range(jobs)]
+            try:
+                streams = [
+                    tuple(
+                        pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, getattr(obj, "_oleobj_", obj))
+                        for obj in (model, qf)
+                    )
+                    for _ in groups
+                ]
+            except Exception:
+                streams = None
+            if streams is not None:
+                with ThreadPoolExecutor(max_workers=jobs) as pool:
+                    results = list(pool.map(lambda st, group: _vertex_moves_worker(st, group, dx, dy), streams, groups))
+                sizes = {name: len(coords) for name, coords in work}
+                done = {name: (sizes[name], sizes[name]) for group in results for name, ok in group if ok}
+        elif len(boxes) == len(work):
+            print("Note: labels share or neighbour vertices; moving them with one job.")
+    return [
+        (name, *done[name]) if name in done else (name, *move_vertices_by_block_label(model, name, qf, dx, dy, eps=eps))
+        for name in labels
+    ]
 
 def cmd_move_blocks_once(args: argparse.Namespace) -> int:
     if win32com is None:
@@ -666,24 +1235,22 @@ def cmd_move_blocks_once(args: argparse.Namespace) -> int:
         print("Failed to load model.")
         return 3
 
-    labels = [v.strip() for v in args.labels.split(",") if v.strip()]
+    labels = normalize_labels(args.labels)
     if not labels:
         print("Missing --labels.")
         return 4
 
     dx = float(args.dx)
     dy = float(args.dy)
-    verts = _collect_vertices_for_labels(model, labels)
+    verts, coords = _collect_vertices_for_labels(model, labels, getattr(args, "eps", DEDUP_EPS))
     if not verts:
         # Fallback: compute union bounds and move selection once.
         bounds = []
-        for label in labels:
-            blk = _find_block_by_label(model, label)
-            if blk is None:
+        for label, found, b in _bounds_for_labels(model, labels, getattr(args, "jobs", 1)):
+            if not found:
                 if args.debug:
                     print(f"Debug: block not found for label '{label}'")
                 continue
-            b = _block_bounds(blk)
             if b is not None:
                 bounds.append(b)
                 if args.debug:
@@ -691,16 +1258,14 @@ def cmd_move_blocks_once(args: argparse.Namespace) -> int:
             elif args.debug:
                 print(f"Debug: bounds unavailable for '{label}'")
         if bounds:
-            left = min(b[0] for b in bounds)
-            bottom = min(b[1] for b in bounds)
-            right = max(b[2] for b in bounds)
-            top = max(b[3] for b in bounds)
+            left, bottom, right, top = _union_bounds(bounds)
             if args.debug:
                 print(f"Debug: union rect=({left},{bottom})-({right},{top})")
 
+            ctx = RectContext(left, bottom, right, top, qf)
             sel = None
             try:
-                sel = _selection_in_rectangle(model.Shapes.Blocks, qf, left, bottom, right, top)
+                sel = ctx.select("Shapes.Blocks", model.Shapes.Blocks)
                 if args.debug and sel is not None:
                     try:
                         print(f"Debug: Blocks.InRectangle Count={int(sel.Count)}")
@@ -713,7 +1278,7 @@ def cmd_move_blocks_once(args: argparse.Namespace) -> int:
 
             if sel is None:
                 try:
-                    sel = _selection_in_rectangle(model.Selection, qf, left, bottom, right, top)
+                    sel = ctx.select("Selection", model.Selection)
                     if args.debug and sel is not None:
                         try:
                             print(f"Debug: Selection.InRectangle Count={int(sel.Count)}")
@@ -725,29 +1290,33 @@ def cmd_move_blocks_once(args: argparse.Namespace) -> int:
                     sel = None
 
             if sel is not None:
-                try:
-                    vec = qf.PointXY(dx, dy)
-                    sel.Move(0, vec)
+                if _move_selection(sel, qf, dx, dy):
                     print(f"Moved selection in rect ({left},{bottom})-({right},{top}) by dx={dx}, dy={dy}.")
                     return 0
-                except Exception as exc:
-                    if args.debug:
-                        print(f"Debug: Selection.Move failed: {exc}")
+                if args.debug:
+                    print("Debug: Selection.Move failed")
 
         print("No vertices found for the given labels.")
         return 5
 
+    # Every vertex is a plain Vertex with known coordinates: move them with one
+    # Selection.Move when their bounding box selects exactly them.
+    if None not in coords and _move_vertices_in_bbox(model, qf, coords, dx, dy):
+        print(f"Moved {len(verts)}/{len(verts)} unique vertices by dx={dx}, dy={dy} (selection).")
+        return 0
+
+    point_xy = _point_xy(qf)
+    attempts = _move_attempts(point_xy, dx, dy)
     moved = 0
-    for vtx in verts:
+    for vtx, xy in zip(verts, coords):
         # Handle Vertex objects first.
         if hasattr(vtx, "Point"):
-            if move_vertex(vtx, qf, dx, dy):
+            if move_vertex(vtx, qf, dx, dy, point_xy, attempts, xy):
                 moved += 1
                 continue
         # Fallback: move Point objects by setting X/Y.
         try:
-            x0 = float(getattr(vtx, "X"))
-            y0 = float(getattr(vtx, "Y"))
+            x0, y0 = xy if xy is not None else (float(getattr(vtx, "X")), float(getattr(vtx, "Y")))
             setattr(vtx, "X", x0 + dx)
             setattr(vtx, "Y", y0 + dy)
             moved += 1
@@ -761,6 +1330,28 @@ def cmd_move_blocks_once(args: argparse.Namespace) -> int:
     print(f"Moved {moved}/{len(verts)} unique vertices by dx={dx}, dy={dy}.")
     return 0
 
+# (COM interface, attr) pairs that raised AttributeError: the interface has
+# no such member, so later blocks skip it. Errors reading a value are not
+# remembered; they say nothing about the next block.
+_BLOCK_ATTR_MISSING: set[tuple[Any, str]] = set()
+
+def _read_block_label(blk: Any, attrs: tuple[str, ...] = ("Label", "Name")) -> str:
+    key = _com_type_key(blk)
+    for attr in attrs:
+        if (key, attr) in _BLOCK_ATTR_MISSING:
+            continue
+        try:
+            val = getattr(blk, attr)
+        except AttributeError:
+            if key is not None:
+                _BLOCK_ATTR_MISSING.add((key, attr))
+            continue
+        except Exception:
+            continue
+        if val is not None:
+            return str(val)
+    return ""
+
 def cmd_list_blocks(args: argparse.Namespace) -> int:
     if win32com is None:
         print("pywin32 is not available. Install with: pip install pywin32")
@@ -783,8 +1374,8 @@ def cmd_list_blocks(args: argparse.Namespace) -> int:
         return 4
 
     names = []
-    for blk in iter_collection(blocks):
-        name = _block_label(blk)
+    for blk in iter_collection_indexed(blocks):
+        name = _read_block_label(blk)
         if name:
             names.append(name)
     if not names:
@@ -796,41 +1387,55 @@ def cmd_list_blocks(args: argparse.Namespace) -> int:
         print(f"- {n}")
     return 0
 
-def _block_bounds(block: Any) -> Optional[tuple[float, float, float, float]]:
+def _bounds_of(obj: Any) -> tuple[float, float, float, float]:
+    left = float(getattr(obj, "Left"))
+    right = float(getattr(obj, "Right"))
+    top = float(getattr(obj, "Top"))
+    bottom = float(getattr(obj, "Bottom"))
+    return left, bottom, right, top
+
+def _bounds_direct(block: Any) -> Optional[tuple[float, float, float, float]]:
     # Try direct Left/Right/Top/Bottom
-    try:
-        left = float(getattr(block, "Left"))
-        right = float(getattr(block, "Right"))
-        top = float(getattr(block, "Top"))
-        bottom = float(getattr(block, "Bottom"))
-        return left, bottom, right, top
-    except Exception:
-        pass
+    return _bounds_of(block)
 
+def _bounds_dimensions(block: Any) -> Optional[tuple[float, float, float, float]]:
     # Try Dimensions object
-    try:
-        dims = block.Dimensions
-        left = float(getattr(dims, "Left"))
-        right = float(getattr(dims, "Right"))
-        top = float(getattr(dims, "Top"))
-        bottom = float(getattr(dims, "Bottom"))
-        return left, bottom, right, top
-    except Exception:
-        pass
+    return _bounds_of(block.Dimensions)
 
+def _bounds_vertices(block: Any) -> Optional[tuple[float, float, float, float]]:
     # Fallback: compute from vertices
-    try:
-        verts = block.Vertices
-        xs = []
-        ys = []
-        for vtx in iter_collection(verts):
-            pt = vtx.Point
-            xs.append(float(getattr(pt, "X")))
-            ys.append(float(getattr(pt, "Y")))
-        if xs and ys:
-            return min(xs), min(ys), max(xs), max(ys)
-    except Exception:
-        pass
+    coords = []
+    for vtx in iter_collection(block.Vertices):
+        pt = vtx.Point
+        coords.append((float(getattr(pt, "X")), float(getattr(pt, "Y"))))
+    return _coords_bbox(coords) if coords else None
+
+_BOUNDS_READERS = (
+    ("direct", _bounds_direct),
+    ("Dimensions", _bounds_dimensions),
+    ("vertices", _bounds_vertices),
+)
+# Block wrapper type -> name of the reader that answered last time.
+_BOUNDS_SOURCE: dict[type, str] = {}
+
+def _block_bounds(block: Any) -> Optional[tuple[float, float, float, float]]:
+    # Start with the source that worked for this block type so the failed
+    # property reads before it are not repeated for every block.
+    key = type(block)
+    cached = _BOUNDS_SOURCE.get(key)
+    readers = _BOUNDS_READERS
+    if cached is not None:
+        readers = tuple(r for r in _BOUNDS_READERS if r[0] == cached) + tuple(
+            r for r in _BOUNDS_READERS if r[0] != cached
+        )
+    for name, reader in readers:
+        try:
+            bounds = reader(block)
+        except Exception:
+            continue
+        if bounds is not None:
+            _BOUNDS_SOURCE[key] = name
+            return bounds
     return None
 
 
@@ -840,11 +1445,8 @@ def list_block_labels(model: Any) -> list[str]:
         blocks = model.Shapes.Blocks
     except Exception:
         return labels
-    for blk in iter_collection(blocks):
-        try:
-            name = str(getattr(blk, "Label"))
-        except Exception:
-            name = ""
+    for blk in iter_collection_indexed(blocks):
+        name = _read_block_label(blk, ("Label",))
         if name:
             labels.append(name)
     # de-dup while preserving order
@@ -873,7 +1475,7 @@ def cmd_block_bounds(args: argparse.Namespace) -> int:
         print("Failed to load model.")
         return 3
 
-    labels = [v.strip() for v in args.labels.split(",") if v.strip()]
+    labels = normalize_labels(args.labels)
     if not labels:
         print("Missing --labels.")
         return 4
@@ -892,6 +1494,7 @@ def cmd_block_bounds(args: argparse.Namespace) -> int:
     return 0
 
 def save_model(problem: Any, model: Any, save_as: Path) -> bool:
+    forget_model_cache()
     saved = False
     for obj in (model, problem):
         try:
@@ -909,16 +1512,312 @@ def save_model(problem: Any, model: Any, save_as: Path) -> bool:
             saved = False
     return saved
 
+# Steps queued by an action until cmd_model's next batched rebuild; None when
+# every action must rebuild for itself.
+Deferred = Optional[list[Callable[[], None]]]
+ModelAction = Callable[[int, dict, list[str], float, float, Any, Any, Any, Deferred], int]
+# (idx, action, labels, dx, dy) as prepared by _action_args.
+ActionArgs = tuple[int, dict, list[str], float, float]
+ModelBatch = Callable[[Sequence[ActionArgs], Any, Any, Any, Deferred], int]
+
+def _action_args(idx: int, action: dict) -> ActionArgs:
+    dx = float(action.get("dx", 0.0))
+    dy = float(action.get("dy", 0.0))
+    labels = normalize_labels(action.get("labels") or action.get("label"))
+    return idx, action, labels, dx, dy
+
+def _action_type(item: tuple[int, dict]) -> str:
+    return str(item[1].get("type", "")).strip()
+
+def _is_noop_move(action_type: str, dx: float, dy: float) -> bool:
+    # A move by (0, 0) leaves the geometry alone, so it neither runs nor
+    # marks the model as needing a rebuild.
+    return action_type.startswith("move") and dx == 0.0 and dy == 0.0
+
+def _action_move_shapes(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    if not labels:
+        print(f"[{idx}] Missing label for move_shape.")
+        return 3
+    moved_total = 0
+    shape_index = index_shapes_by_label(model)
+    for name in labels:
+        shapes = shape_index.get(name) or find_shapes_by_label(model, name)
+        if not shapes:
+            print(f"[{idx}] No shapes found for label '{name}'.")
+            return 4
+        for shp in shapes:
+            moved = try_move(shp, qf, dx, dy)
+            if moved is None:
+                moved = try_point_assign(shp, qf, dx, dy)
+            if moved is None:
+                print(f"[{idx}] Move failed for '{name}'.")
+                return 5
+            moved_total += 1
+    print(f"[{idx}] Moved shapes ({moved_total}) by dx={dx}, dy={dy}.")
+    return 0
+
+def _action_move_vertices(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    if not labels:
+        print(f"[{idx}] Missing labels for move_vertices.")
+        return 3
+    sel = model.Selection
+    for name in labels:
+        try:
+            ret = sel.LabeledAs(name)
+            if hasattr(ret, "Vertices"):
+                sel = ret
+        except Exception as exc:
+            print(f"[{idx}] Selection.LabeledAs failed for '{name}': {exc}")
+            return 5
+    moved, total = move_vertices(sel, qf, dx, dy)
+    print(f"[{idx}] Vertices moved: {moved}/{total} (dx={dx}, dy={dy}).")
+    if total == 0:
+        print(f"[{idx}] No vertices found for labels: {', '.join(labels)}")
+        return 6
+    return 0
+
+def _action_move_block_labels(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    if not labels:
+        print(f"[{idx}] Missing labels for move_block_labels.")
+        return 3
+    debug = bool(action.get("debug", False))
+    moved = move_block_labels(problem, qf, labels, dx, dy, debug=debug)
+    print(f"[{idx}] Block labels moved: {moved}/{len(labels)} (dx={dx}, dy={dy}).")
+    if moved == 0:
+        print(f"[{idx}] No block labels found for: {', '.join(labels)}")
+        return 6
+    return 0
+
+def _batch_move_block_labels(group: Sequence[ActionArgs], model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    # Resolve every label named anywhere in the run with one lookup pass, then
+    # apply each action's move in order with the usual per-action report.
+    names = dict.fromkeys(name for _, _, labels, _, _ in group for name in labels)
+    by_name: dict[str, list[tuple[str, Any]]] = {}
+    for name, lbl in _find_block_labels(problem, list(names)):
+        by_name.setdefault(name.lower(), []).append((name, lbl))
+
+    for idx, action, labels, dx, dy in group:
+        if not labels:
+            print(f"[{idx}] Missing labels for move_block_labels.")
+            return 3
+        debug = bool(action.get("debug", False))
+        targets = [t for key in dict.fromkeys(n.lower() for n in labels) for t in by_name.get(key, ())]
+        moved = _move_label_targets(targets, qf, dx, dy, debug)
+        print(f"[{idx}] Block labels moved: {moved}/{len(labels)} (dx={dx}, dy={dy}).")
+        if moved == 0:
+            print(f"[{idx}] No block labels found for: {', '.join(labels)}")
+            return 6
+    return 0
+
+def _action_move_vertices_by_block_label(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    if not labels:
+        print(f"[{idx}] Missing labels for move_vertices_by_block_label.")
+        return 3
+    total_all = 0
+    moved_all = 0
+    eps = float(action.get("eps", DEDUP_EPS))
+    if not eps > 0:
+        print(f"[{idx}] eps must be > 0 for move_vertices_by_block_label (got {eps}).")
+        return 3
+    jobs = int(action.get("jobs", 1))
+    for name, moved, total in _vertex_moves_by_labels(model, qf, labels, dx, dy, eps, jobs):
+        moved_all += moved
+        total_all += total
+        print(f"[{idx}] Vertices for '{name}': {moved}/{total} (dx={dx}, dy={dy}).")
+    if total_all == 0:
+        print(f"[{idx}] No vertices found for block labels: {', '.join(labels)}")
+        return 6
+    return 0
+
+def _action_move_vertices_in_rect(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    rect = action.get("rect")
+    if not rect:
+        print(f"[{idx}] Missing rect for move_vertices_in_rect.")
+        return 3
+    epsilon = float(action.get("epsilon", 0.0))
+    moved, total = move_vertices_in_rect(model, qf, rect, dx, dy, epsilon=epsilon)
+    print(f"[{idx}] Vertices in rect moved: {moved}/{total} (dx={dx}, dy={dy}).")
+    if total == 0:
+        print(f"[{idx}] No vertices found in rect: {rect}")
+        return 6
+    return 0
+
+def _action_move_blocks_in_rect(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    rect = action.get("rect")
+    if not rect:
+        print(f"[{idx}] Missing rect for move_blocks_in_rect.")
+        return 3
+    epsilon = float(action.get("epsilon", 0.0))
+    moved, total = move_blocks_in_rect(model, qf, rect, dx, dy, epsilon=epsilon)
+    print(f"[{idx}] Blocks in rect moved: {moved}/{total} (dx={dx}, dy={dy}).")
+    if total == 0:
+        print(f"[{idx}] No blocks found in rect: {rect}")
+        return 6
+    return 0
+
+def _action_add_rect_with_block_label(idx: int, action: dict, labels: list[str], dx: float, dy: float, model: Any, qf: Any, problem: Any, deferred: Deferred) -> int:
+    rect = action.get("rect")
+    label = str(action.get("label", "")).strip()
+    inset = float(action.get("inset", 0.0))
+    ok, msg = add_rect_with_block_label(
+        model, qf, problem, rect, inset, label, defer_rebuild=deferred is not None, after_rebuild=deferred
+    )
+    if ok:
+        print(f"[{idx}] Added rectangle: {msg}")
+        return 0
+    print(f"[{idx}] Add rectangle failed: {msg}")
+    return 6
+
+# Plan action type -> handler; each returns 0 or the exit code to stop with.
+_MODEL_ACTIONS: dict[str, ModelAction] = {
+    "move_shape": _action_move_shapes,
+    "move_shapes": _action_move_shapes,
+    "move_vertices": _action_move_vertices,
+    "move_block_labels": _action_move_block_labels,
+    "move_vertices_by_block_label": _action_move_vertices_by_block_label,
+    "move_vertices_in_rect": _action_move_vertices_in_rect,
+    "move_blocks_in_rect": _action_move_blocks_in_rect,
+    "add_rect_with_block_label": _action_add_rect_with_block_label,
+}
+# Action types whose consecutive runs can share one COM lookup pass.
+_MODEL_BATCHES: dict[str, ModelBatch] = {
+    "move_block_labels": _batch_move_block_labels,
+}
+# Upper bound on actions resolved together, so streamed plans stay bounded.
+_BATCH_MAX = 256
+
+# Plans at least this large stream their actions when ijson is installed.
+_STREAM_PLAN_BYTES = 8 * 1024 * 1024
+_PLAN_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError,)
+if ijson is not None:
+    _PLAN_ERRORS += (ijson.JSONError,)
+
+def _open_plan(plan_path: Path) -> Any:
+    f = plan_path.open("rb")
+    # Allow UTF-8 with BOM (common on Windows); ijson rejects it.
+    if f.read(3) != b"\xef\xbb\xbf":
+        f.seek(0)
+    return f
+
+# Top-level plan settings that pick the problem and the rebuild mode; a
+# streamed plan must state them before "actions" for them to take effect.
+_PLAN_SETUP_KEYS = frozenset(("pbm", "model", "use_active_problem", "rebuild_each_action"))
+
+class _PlanActions:
+    # Yields plan["actions"] while a helper thread is still parsing the rest
+    # of the file, so the COM work on this thread starts with the first
+    # action. One ijson pass feeds both the top-level settings (self.header)
+    # and the actions; the queue is bounded to keep memory flat on huge plans.
+    _END = object()
+
+    def __init__(self, plan_path: Path) -> None:
+        self.error: Optional[Exception] = None
+        self.header: dict = {}
+        self._setup: dict = {}
+        # Setup keys that only showed up after the actions began.
+        self.late_keys: set[str] = set()
+        self._header_ready = threading.Event()
+        self._queue: queue.Queue = queue.Queue(maxsize=256)
+        self._stop = threading.Event()
+        self._head: list[Any] = []
+        threading.Thread(target=self._produce, args=(plan_path,), daemon=True).start()
+
+    def wait_header(self) -> dict:
+        # The settings written before "actions" (or all of them, for a plan
+        # without actions), as they stood when the first action was reached.
+        self._header_ready.wait()
+        return self._setup
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, plan_path: Path) -> None:
+        header = self.header
+        in_actions = False
+        builder = None
+        try:
+            with _open_plan(plan_path) as f:
+                for prefix, event, value in ijson.parse(f):
+                    if builder is not None:
+                        builder.event(event, value)
+                        if prefix == "actions.item" and event in ("end_map", "end_array"):
+                            if not self._put(builder.value):
+                                return
+                            builder = None
+                    elif prefix == "actions.item":
+                        if event in ("start_map", "start_array"):
+                            builder = ijson.ObjectBuilder()
+                            builder.event(event, value)
+                        elif not self._put(value):
+                            return
+                    elif prefix == "actions" and event == "start_array" and not in_actions:
+                        in_actions = True
+                        self._setup = dict(header)
+                        self._header_ready.set()
+                    elif prefix and "." not in prefix and event in ("string", "number", "boolean", "null"):
+                        header[prefix] = value
+                        if in_actions and prefix in _PLAN_SETUP_KEYS:
+                            self.late_keys.add(prefix)
+        except Exception as exc:
+            self._put(exc)
+        finally:
+            if not in_actions:
+                self._setup = dict(header)
+            self._header_ready.set()
+        self._put(self._END)
+
+    def _next(self) -> Any:
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            self.error = item
+            return self._END
+        return item
+
+    def __bool__(self) -> bool:
+        if not self._head:
+            item = self._next()
+            if item is self._END:
+                return False
+            self._head.append(item)
+        return True
+
+    def __iter__(self) -> Iterator[dict]:
+        try:
+            yield from self._head
+            self._head = []
+            while True:
+                item = self._next()
+                if item is self._END:
+                    return
+                yield item
+        finally:
+            self._stop.set()
+
 def cmd_model(args: argparse.Namespace) -> int:
     plan_path = Path(args.plan)
     if not plan_path.exists():
         print(f"Plan not found: {plan_path}")
         return 1
 
+    stream: Optional[_PlanActions] = None
     try:
-        # Allow UTF-8 with BOM (common on Windows).
-        plan = json.loads(plan_path.read_text(encoding="utf-8-sig"))
-    except json.JSONDecodeError as exc:
+        if ijson is not None and plan_path.stat().st_size >= _STREAM_PLAN_BYTES:
+            stream = _PlanActions(plan_path)
+            plan = stream.wait_header()
+        else:
+            # Allow UTF-8 with BOM (common on Windows). Both parsers take the
+            # bytes directly, so there is no separate text decode pass.
+            raw = plan_path.read_bytes()
+            if raw[:3] == b"\xef\xbb\xbf":
+                raw = raw[3:]
+            plan = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except _PLAN_ERRORS as exc:
         print(f"Invalid JSON in {plan_path}: {exc}")
         return 1
 
@@ -930,16 +1829,13 @@ def cmd_model(args: argparse.Namespace) -> int:
     if model_path is None and plan.get("model"):
         model_path = Path(plan["model"])
 
-    save_as = Path(args.save_as) if args.save_as else None
-    if save_as is None:
-        plan_save = plan.get("save_model_as")
-        if isinstance(plan_save, str) and plan_save.strip():
-            save_as = Path(plan_save)
-    actions = plan.get("actions", [])
+    actions = stream if stream is not None else plan.get("actions", [])
     rebuild_each = bool(plan.get("rebuild_each_action", False))
-    rebuild_end = bool(plan.get("rebuild_at_end", True))
 
     if not actions:
+        if stream is not None and stream.error is not None:
+            print(f"Invalid JSON in {plan_path}: {stream.error}")
+            return 1
         print("No actions in modeling plan.")
         return 1
 
@@ -954,7 +1850,7 @@ def cmd_model(args: argparse.Namespace) -> int:
             print(f"PBM not found: {pbm_path}")
             return 1
         qf.Problems.Open(str(pbm_path))
-        problem = qf.ActiveProblem
+        problem = remember_problem(qf, qf.ActiveProblem)
     elif use_active:
         problem = get_active_problem(qf)
         if problem is None:
@@ -971,123 +1867,90 @@ def cmd_model(args: argparse.Namespace) -> int:
 
     if args.dry_run:
         print(f"Plan: {plan_path}")
-        print(f"Actions: {len(actions)}")
+        print(f"Actions: {len(actions) if stream is None else sum(1 for _ in actions)}")
         return 0
 
-    for idx, action in enumerate(actions, start=1):
-        action_type = str(action.get("type", "")).strip()
-        dx = float(action.get("dx", 0.0))
-        dy = float(action.get("dy", 0.0))
-        labels = normalize_labels(action.get("labels") or action.get("label"))
-
-        if action_type in ("move_shape", "move_shapes"):
-            if not labels:
-                print(f"[{idx}] Missing label for move_shape.")
-                return 3
-            moved_total = 0
-            for name in labels:
-                shapes = find_shapes_by_label(model, name)
-                if not shapes:
-                    print(f"[{idx}] No shapes found for label '{name}'.")
-                    return 4
-                for shp in shapes:
-                    moved = try_move(shp, qf, dx, dy)
-                    if moved is None:
-                        moved = try_point_assign(shp, qf, dx, dy)
-                    if moved is None:
-                        print(f"[{idx}] Move failed for '{name}'.")
-                        return 5
-                    moved_total += 1
-            print(f"[{idx}] Moved shapes ({moved_total}) by dx={dx}, dy={dy}.")
-
-        elif action_type == "move_vertices":
-            if not labels:
-                print(f"[{idx}] Missing labels for move_vertices.")
-                return 3
-            sel = model.Selection
-            for name in labels:
-                try:
-                    ret = sel.LabeledAs(name)
-                    if hasattr(ret, "Vertices"):
-                        sel = ret
-                except Exception as exc:
-                    print(f"[{idx}] Selection.LabeledAs failed for '{name}': {exc}")
-                    return 5
-            moved, total = move_vertices(sel, qf, dx, dy)
-            print(f"[{idx}] Vertices moved: {moved}/{total} (dx={dx}, dy={dy}).")
-            if total == 0:
-                print(f"[{idx}] No vertices found for labels: {', '.join(labels)}")
-                return 6
-
-        elif action_type == "move_block_labels":
-            if not labels:
-                print(f"[{idx}] Missing labels for move_block_labels.")
-                return 3
-            debug = bool(action.get("debug", False))
-            moved = move_block_labels(problem, qf, labels, dx, dy, debug=debug)
-            print(f"[{idx}] Block labels moved: {moved}/{len(labels)} (dx={dx}, dy={dy}).")
-            if moved == 0:
-                print(f"[{idx}] No block labels found for: {', '.join(labels)}")
-                return 6
-
-        elif action_type == "move_vertices_by_block_label":
-            if not labels:
-                print(f"[{idx}] Missing labels for move_vertices_by_block_label.")
-                return 3
-            total_all = 0
-            moved_all = 0
-            for name in labels:
-                moved, total = move_vertices_by_block_label(model, name, qf, dx, dy)
-                moved_all += moved
-                total_all += total
-                print(f"[{idx}] Vertices for '{name}': {moved}/{total} (dx={dx}, dy={dy}).")
-            if total_all == 0:
-                print(f"[{idx}] No vertices found for block labels: {', '.join(labels)}")
-                return 6
-
-        elif action_type == "move_vertices_in_rect":
-            rect = action.get("rect")
-            if not rect:
-                print(f"[{idx}] Missing rect for move_vertices_in_rect.")
-                return 3
-            epsilon = float(action.get("epsilon", 0.0))
-            moved, total = move_vertices_in_rect(model, qf, rect, dx, dy, epsilon=epsilon)
-            print(f"[{idx}] Vertices in rect moved: {moved}/{total} (dx={dx}, dy={dy}).")
-            if total == 0:
-                print(f"[{idx}] No vertices found in rect: {rect}")
-                return 6
-
-        elif action_type == "move_blocks_in_rect":
-            rect = action.get("rect")
-            if not rect:
-                print(f"[{idx}] Missing rect for move_blocks_in_rect.")
-                return 3
-            epsilon = float(action.get("epsilon", 0.0))
-            moved, total = move_blocks_in_rect(model, qf, rect, dx, dy, epsilon=epsilon)
-            print(f"[{idx}] Blocks in rect moved: {moved}/{total} (dx={dx}, dy={dy}).")
-            if total == 0:
-                print(f"[{idx}] No blocks found in rect: {rect}")
-                return 6
-
-        elif action_type == "add_rect_with_block_label":
-            rect = action.get("rect")
-            label = str(action.get("label", "")).strip()
-            inset = float(action.get("inset", 0.0))
-            ok, msg = add_rect_with_block_label(model, qf, problem, rect, inset, label)
-            if ok:
-                print(f"[{idx}] Added rectangle: {msg}")
-            else:
-                print(f"[{idx}] Add rectangle failed: {msg}")
-                return 6
+    # Consecutive rectangles share one rebuild; it runs before the next action
+    # of another type (which may need the new blocks) or after the last one.
+    deferred: Deferred = None if rebuild_each else []
+    # Set by anything that changed the model since the last rebuild.
+    dirty = False
 
-        else:
-            print(f"[{idx}] Unsupported action type: {action_type}")
-            return 7
-
-        if rebuild_each:
+    def _flush_deferred() -> None:
+        nonlocal dirty
+        if deferred:
             rebuild_model(qf, problem)
+            for step in deferred:
+                step()
+            deferred.clear()
+            dirty = True
+
+    # Walk the plan in runs of consecutive same-type actions; types with a
+    # batch handler resolve their COM objects once per run.
+    for action_type, run in itertools.groupby(enumerate(actions, start=1), key=_action_type):
+        handler = _MODEL_ACTIONS.get(action_type)
+        if handler is not _action_add_rect_with_block_label:
+            _flush_deferred()
+        batch = None if rebuild_each else _MODEL_BATCHES.get(action_type)
+        if batch is not None:
+            while True:
+                chunk = [_action_args(idx, action) for idx, action in itertools.islice(run, _BATCH_MAX)]
+                if not chunk:
+                    break
+                kept = []
+                for a in chunk:
+                    if _is_noop_move(action_type, a[3], a[4]):
+                        print(f"[{a[0]}] Skipped {action_type}: zero offset.")
+                    else:
+                        kept.append(a)
+                chunk = kept
+                if not chunk:
+                    continue
+                rc = batch(chunk, model, qf, problem, deferred)
+                if rc:
+                    return rc
+                dirty = True
+            continue
+
+        for idx, action in run:
+            if handler is None:
+                print(f"[{idx}] Unsupported action type: {action_type}")
+                return 7
+            args = _action_args(idx, action)
+            if _is_noop_move(action_type, args[3], args[4]):
+                print(f"[{idx}] Skipped {action_type}: zero offset.")
+                continue
+            rc = handler(*args, model, qf, problem, deferred)
+            if rc:
+                return rc
+            dirty = True
+            if handler is not _action_move_vertices_in_rect:
+                # Anything else may have moved vertices the grid still holds.
+                model_cache(model).pop("vertex_grid", None)
+
+            if rebuild_each:
+                rebuild_model(qf, problem)
+                dirty = False
+
+    if stream is not None and stream.error is not None:
+        print(f"Invalid JSON in {plan_path}: {stream.error}")
+        return 1
+
+    _flush_deferred()
+    # Read after the actions: a streamed plan may state these after them.
+    if stream is not None and stream.late_keys:
+        keys = ", ".join(sorted(stream.late_keys))
+        print(f"Note: {keys} came after \"actions\" in {plan_path} and were ignored.")
+    if stream is not None:
+        plan = stream.header
+    rebuild_end = bool(plan.get("rebuild_at_end", True))
+    save_as = Path(args.save_as) if args.save_as else None
+    if save_as is None:
+        plan_save = plan.get("save_model_as")
+        if isinstance(plan_save, str) and plan_save.strip():
+            save_as = Path(plan_save)
 
-    if rebuild_end:
+    if rebuild_end and dirty:
         rebuild_model(qf, problem)
 
     if save_as is not None:
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import argparse
+import codecs
 import csv
+import functools
 import os
 import queue
+import re
 import threading
-from typing import Optional
+from itertools import islice
+from typing import Any, Iterable, Optional
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-from .connection import pythoncom, win32com, dispatch_qf_app, ensure_model_loaded, open_problem
+from .connection import pythoncom, win32com, _is_alive, dispatch_qf_app, ensure_model_loaded, open_problem
 from .geometry import list_block_labels
 from .workflow import (
     _cases_from_mapping_all,
@@ -21,10 +25,59 @@ from .workflow import (
 )
 
 
+# (qf, problem, model) reused across "Load labels" clicks; reset by "Clear all".
+_qf_session: dict[str, tuple[Any, Any, Any]] = {}
+
+
+_XY_SEP = re.compile(r"[,\uff0c;]")
+
+
+# Enough of a result CSV to cover the previewed rows when sniffing.
+_SNIFF_BYTES = 1 << 18
+
+
+def _sniff_encoding(path: str) -> str:
+    # Pick the encoding from a BOM or a UTF-8 trial decode of the head, so the
+    # file is opened once instead of re-read after a UnicodeDecodeError.
+    with open(path, "rb") as f:
+        head = f.read(_SNIFF_BYTES)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "mbcs"
+
+
+def _read_preview(path: str, max_rows: int) -> tuple[list[str], list[list[str]]]:
+    # Header plus up to max_rows rows as text. pandas' C parser is used when it
+    # is installed (imported here so it does not slow down GUI startup); files
+    # it rejects, e.g. ragged rows, go through csv.reader.
+    encoding = _sniff_encoding(path)
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        try:
+            df = pd.read_csv(
+                path, header=None, nrows=max_rows + 1, dtype=str, na_filter=False, encoding=encoding, engine="c"
+            )
+            table = df.values.tolist()
+            return (table[0] if table else []), table[1:]
+        except Exception:
+            pass
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, list(islice(reader, max_rows))
+
+
 def _parse_xy(text: str) -> tuple[float, float]:
-    raw = text.strip()
-    raw = raw.replace("\uff0c", ",").replace(";", ",")
-    parts = [p.strip() for p in raw.split(",") if p.strip()]
+    parts = [p for p in (p.strip() for p in _XY_SEP.split(text)) if p]
     if len(parts) != 2:
         raise ValueError("Expected x,y")
     return float(parts[0]), float(parts[1])
@@ -47,21 +100,26 @@ def launch_gui() -> int:
     BORDER = "#E1E1E1"
     ACCENT = "#BFC5CC"
 
-    style.configure("TFrame", background=BG)
-    style.configure("TLabel", background=PANEL, foreground=TEXT)
-    style.configure("TLabelframe", background=PANEL)
-    style.configure("TLabelframe.Label", background=PANEL, foreground=TEXT)
-    style.configure("App.TFrame", background=BG)
-    style.configure("Card.TFrame", background=PANEL)
-    style.configure("Card.TLabelframe", background=PANEL, bordercolor=BORDER, relief="solid")
-    style.configure("Card.TLabelframe.Label", background=PANEL, foreground=TEXT, font=("Segoe UI", 9, "bold"))
-    style.configure("App.TLabel", background=BG, foreground=TEXT)
-    style.configure("Card.TLabel", background=PANEL, foreground=TEXT)
-    style.configure("Gray.TButton", padding=(10, 5), foreground=TEXT, background=ACCENT)
-    style.configure("App.TRadiobutton", background=BG, foreground=TEXT)
-    style.configure("Card.TRadiobutton", background=PANEL, foreground=TEXT)
-    style.configure("App.TEntry", fieldbackground=PANEL, foreground=TEXT, font=("Segoe UI", 9))
-    style.configure("App.TCombobox", fieldbackground=PANEL, foreground=TEXT, font=("Segoe UI", 9))
+    # One pass over the style table. Foreground is set once on the root style;
+    # App.TFrame and Card.TLabel inherit everything from TFrame / TLabel.
+    style.configure(".", foreground=TEXT)
+    styles: dict[str, dict[str, Any]] = {
+        "TFrame": {"background": BG},
+        "TLabel": {"background": PANEL},
+        "TLabelframe": {"background": PANEL},
+        "TLabelframe.Label": {"background": PANEL},
+        "Card.TFrame": {"background": PANEL},
+        "Card.TLabelframe": {"background": PANEL, "bordercolor": BORDER, "relief": "solid"},
+        "Card.TLabelframe.Label": {"background": PANEL, "font": ("Segoe UI", 9, "bold")},
+        "App.TLabel": {"background": BG},
+        "Gray.TButton": {"padding": (10, 5), "background": ACCENT},
+        "App.TRadiobutton": {"background": BG},
+        "Card.TRadiobutton": {"background": PANEL},
+        "App.TEntry": {"fieldbackground": PANEL, "font": ("Segoe UI", 9)},
+        "App.TCombobox": {"fieldbackground": PANEL, "font": ("Segoe UI", 9)},
+    }
+    for name, options in styles.items():
+        style.configure(name, **options)
     style.map("Gray.TButton", background=[("active", "#B3B8BE"), ("disabled", "#E4E6E9")])
     style.map(
         "App.TCombobox",
@@ -75,7 +133,6 @@ def launch_gui() -> int:
     main = ttk.Frame(root, padding=(12, 10), style="App.TFrame")
     main.pack(fill="both", expand=True)
     main.columnconfigure(0, weight=1)
-    main.rowconfigure(0, weight=0)
     main.rowconfigure(3, weight=1)
 
     INTEGRAL_CHOICES = [
@@ -132,7 +189,6 @@ def launch_gui() -> int:
     values = ttk.LabelFrame(content, text="Values", padding=10, style="Card.TLabelframe")
     values.grid(row=0, column=0, sticky="nsew", padx=(0, 6))
     values.columnconfigure(0, weight=1)
-    values.rowconfigure(5, weight=0)
 
     top_row = ttk.Frame(values, style="Card.TFrame")
     top_row.grid(row=0, column=0, sticky="ew")
@@ -153,7 +209,6 @@ def launch_gui() -> int:
     ttk.Label(values, text="Input", style="Card.TLabel").grid(row=2, column=0, sticky="w", pady=(6, 0))
     values_row = ttk.Frame(values, style="Card.TFrame")
     values_row.grid(row=3, column=0, sticky="ew", pady=(0, 6))
-    values_row.columnconfigure(1, weight=0)
 
     value_label_combo = ttk.Combobox(values_row, state="readonly", values=[], style="App.TCombobox", width=9)
     value_label_combo.grid(row=0, column=0, sticky="ew", padx=(0, 6))
@@ -202,8 +257,6 @@ def launch_gui() -> int:
     movement = ttk.LabelFrame(content, text="Select", padding=10, style="Card.TLabelframe")
     movement.grid(row=0, column=1, sticky="nsew")
     movement.columnconfigure(0, weight=1)
-    movement.rowconfigure(1, weight=0)
-    movement.rowconfigure(4, weight=0)
 
     ttk.Label(movement, text="Move labels", style="Card.TLabel").grid(row=0, column=0, sticky="w")
     labels_row = ttk.Frame(movement, style="Card.TFrame")
@@ -274,9 +327,10 @@ def launch_gui() -> int:
     outputs_list.configure(yscrollcommand=out_scroll.set)
 
     display_to_integral: dict[str, tuple[str, int]] = {name: (name, int_id) for name, int_id in INTEGRAL_CHOICES}
+    integral_keys = frozenset(display_to_integral)
     if INTEGRAL_CHOICES:
         outputs_combo.current(0)
-        outputs_list.insert("end", INTEGRAL_CHOICES[0][0])
+        _extend_listbox(outputs_list, INTEGRAL_CHOICES[0][:1])
 
     # Motion
     motion = ttk.LabelFrame(main, text="Motion", padding=10, style="Card.TLabelframe")
@@ -393,22 +447,27 @@ def launch_gui() -> int:
 
     def append_log(msg: str) -> None:
         log_q.put(msg)
+        # Wake the Tk thread only when there is something to show; with a
+        # threaded Tcl this is safe from the worker thread.
+        try:
+            root.event_generate("<<LogUpdate>>", when="tail")
+        except Exception:
+            pass
 
     def flush_log() -> None:
-        updated = False
+        batch: list[str] = []
         while True:
             try:
-                msg = log_q.get_nowait()
+                batch.append(log_q.get_nowait())
             except queue.Empty:
                 break
-            log_text.configure(state="normal")
-            log_text.insert("end", msg + "\n")
-            log_text.see("end")
-            log_text.configure(state="disabled")
-            updated = True
-        if updated:
-            log_text.see("end")
-        root.after(200, flush_log)
+        if not batch:
+            return
+        # One insert and one scroll per drain, however many lines arrived.
+        log_text.configure(state="normal")
+        log_text.insert("end", "\n".join(batch) + "\n")
+        log_text.configure(state="disabled")
+        log_text.see("end")
 
     def set_running(running: bool) -> None:
         run_btn.configure(state="disabled" if running else "normal")
@@ -422,9 +481,10 @@ def launch_gui() -> int:
 
     def clear_all() -> None:
         clear_log()
-        values_list.delete(0, "end")
-        labels_list.delete(0, "end")
-        outputs_list.delete(0, "end")
+        _forget_label_session()
+        _clear_listbox(values_list)
+        _clear_listbox(labels_list)
+        _clear_listbox(outputs_list)
         value_entry.delete(0, "end")
         value_label_combo.set("")
         labels_combo.set("")
@@ -438,7 +498,7 @@ def launch_gui() -> int:
         labels_combo["values"] = []
         if INTEGRAL_CHOICES:
             outputs_combo.current(0)
-            outputs_list.insert("end", INTEGRAL_CHOICES[0][0])
+            _extend_listbox(outputs_list, INTEGRAL_CHOICES[0][:1])
 
     def show_table() -> None:
         path = _build_out_path()
@@ -449,16 +509,10 @@ def launch_gui() -> int:
             messagebox.showerror("Output", f"File not found:\n{path}")
             return
 
+        # Only the previewed rows (plus one to detect truncation) are read.
+        max_rows = 500
         try:
-            with open(path, newline="", encoding="utf-8-sig") as f:
-                reader = csv.reader(f)
-                header = next(reader, [])
-                rows = list(reader)
-        except UnicodeDecodeError:
-            with open(path, newline="", encoding="mbcs") as f:
-                reader = csv.reader(f)
-                header = next(reader, [])
-                rows = list(reader)
+            header, rows = _read_preview(path, max_rows + 1)
         except Exception as exc:
             messagebox.showerror("Output", f"Failed to read file:\n{exc}")
             return
@@ -478,9 +532,12 @@ def launch_gui() -> int:
         preview_main.columnconfigure(0, weight=1)
 
         tree = ttk.Treeview(preview_main, columns=header, show="headings")
-        for col in header:
+        # Size each column to its header and the first rows (about 7 px per char).
+        sample = rows[:50]
+        for i, col in enumerate(header):
+            chars = max(len(col), max((len(r[i]) for r in sample if i < len(r)), default=0))
             tree.heading(col, text=col)
-            tree.column(col, width=110, anchor="w")
+            tree.column(col, width=min(300, 7 * chars + 20), anchor="w")
 
         y_scroll = ttk.Scrollbar(preview_main, orient="vertical", command=tree.yview)
         x_scroll = ttk.Scrollbar(preview_main, orient="horizontal", command=tree.xview)
@@ -490,17 +547,24 @@ def launch_gui() -> int:
         y_scroll.grid(row=0, column=1, sticky="ns")
         x_scroll.grid(row=1, column=0, sticky="ew")
 
-        max_rows = 500
-        shown = 0
-        for row in rows:
-            if shown >= max_rows:
-                break
-            if len(row) < len(header):
-                row = row + [""] * (len(header) - len(row))
-            tree.insert("", "end", values=row[: len(header)])
-            shown += 1
+        width = len(header)
+        truncated = len(rows) > max_rows
+        del rows[max_rows:]
+
+        # Insert in chunks from idle callbacks so the window paints right away.
+        def _insert_chunk(start: int) -> None:
+            if not tree.winfo_exists():
+                return
+            for row in rows[start : start + 100]:
+                if len(row) < width:
+                    row = row + [""] * (width - len(row))
+                tree.insert("", "end", values=tuple(row[:width]))
+            if start + 100 < len(rows):
+                tree.after_idle(_insert_chunk, start + 100)
 
-        if shown == max_rows:
+        tree.after_idle(_insert_chunk, 0)
+
+        if truncated:
             ttk.Label(
                 preview_main,
                 text=f"Showing first {max_rows} rows.",
@@ -533,12 +597,13 @@ def launch_gui() -> int:
         selected_outputs = list(outputs_list.get(0, "end"))
         if not selected_outputs:
             raise ValueError("Select at least one output value.")
-        integrals = [display_to_integral[name] for name in selected_outputs if name in display_to_integral]
+        integrals = list(map(display_to_integral.__getitem__, filter(integral_keys.__contains__, selected_outputs)))
 
         x0, y0 = _parse_xy(start_var.get())
         x1, y1 = _parse_xy(end_var.get())
         step = float(step_var.get().strip())
-        positions = _positions_line(x0, y0, x1, y1, step)
+        if step <= 0:
+            raise ValueError("step must be > 0")
 
         out_path = _build_out_path()
 
@@ -548,7 +613,8 @@ def launch_gui() -> int:
             "move_labels": move_labels,
             "cases": cases,
             "field_name": field_name,
-            "positions": positions,
+            # Expanded by _positions_line on the worker thread.
+            "line": (x0, y0, x1, y1, step),
             "integrals": integrals,
             "mesh": True,
             "remesh": True,
@@ -577,9 +643,11 @@ def launch_gui() -> int:
                 except Exception:
                     pass
             try:
+                line = params.pop("line")
                 rc = run_batch_force_plan(
                     log=append_log,
                     cancel=cancel_event,
+                    positions=_positions_line(*line),
                     **params,
                 )
                 append_log(f"Done. Exit code: {rc}")
@@ -606,20 +674,43 @@ def launch_gui() -> int:
     stop_btn.configure(command=stop_clicked)
     show_btn.configure(command=show_table)
     clear_btn.configure(command=clear_all)
+    root.bind("<<LogUpdate>>", lambda _event: flush_log())
 
     flush_log()
     root.mainloop()
     return 0
 
 
+def _listbox_seen(listbox: tk.Listbox) -> set[str]:
+    # Python-side mirror of the listbox items, kept in step by the helpers
+    # below so duplicate checks never read the items back from Tcl.
+    seen = getattr(listbox, "_seen", None)
+    if seen is None:
+        seen = set(listbox.get(0, "end"))
+        listbox._seen = seen  # type: ignore[attr-defined]
+    return seen
+
+
+def _extend_listbox(listbox: tk.Listbox, items: Iterable[str]) -> int:
+    # One membership check per item and a single insert call.
+    seen = _listbox_seen(listbox)
+    new_items = [item for item in dict.fromkeys(items) if item not in seen]
+    if new_items:
+        listbox.insert("end", *new_items)
+        seen.update(new_items)
+    return len(new_items)
+
+
+def _clear_listbox(listbox: tk.Listbox) -> None:
+    listbox.delete(0, "end")
+    _listbox_seen(listbox).clear()
+
+
 def _add_choice(combo: ttk.Combobox, listbox: tk.Listbox) -> None:
     choice = combo.get().strip()
     if not choice:
         return
-    existing = set(listbox.get(0, "end"))
-    if choice in existing:
-        return
-    listbox.insert("end", choice)
+    _extend_listbox(listbox, (choice,))
 
 
 def _add_value_pair(combo: ttk.Combobox, entry: ttk.Entry, listbox: tk.Listbox) -> None:
@@ -627,17 +718,15 @@ def _add_value_pair(combo: ttk.Combobox, entry: ttk.Entry, listbox: tk.Listbox)
     values = entry.get().strip()
     if not label or not values:
         return
-    text = f"{label}={values}"
-    existing = set(listbox.get(0, "end"))
-    if text in existing:
-        return
-    listbox.insert("end", text)
-    entry.delete(0, "end")
+    if _extend_listbox(listbox, (f"{label}={values}",)):
+        entry.delete(0, "end")
 
 
 def _clear_selected(listbox: tk.Listbox) -> None:
     selected = list(listbox.curselection())
+    seen = _listbox_seen(listbox)
     for idx in reversed(selected):
+        seen.discard(listbox.get(idx))
         listbox.delete(idx)
 
 
@@ -646,23 +735,51 @@ def _clear_selected_multi(*listboxes: tk.Listbox) -> None:
         _clear_selected(lb)
 
 
+def _model_file_key(problem: Any, model: Any) -> Optional[tuple[str, float]]:
+    for obj, attr in ((problem, "ModelFile"), (model, "FileName"), (problem, "FileName")):
+        try:
+            path = str(getattr(obj, attr) or "")
+            if path and os.path.isfile(path):
+                return path, os.path.getmtime(path)
+        except Exception:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_block_labels(path: str, mtime: float) -> tuple[str, ...]:
+    # Keyed on the model file so a saved edit (new mtime) reads the labels again.
+    _ = path, mtime
+    return tuple(list_block_labels(_qf_session["session"][2]))
+
+
+def _forget_label_session() -> None:
+    _qf_session.clear()
+    _cached_block_labels.cache_clear()
+
+
 def _load_label_choices(*combos: ttk.Combobox) -> None:
     if win32com is None:
         messagebox.showerror("Missing dependency", "pywin32 is not available.")
         return
 
     qf = dispatch_qf_app()
-    problem = open_problem(qf, "")
-    if problem is None:
-        messagebox.showerror("QuickField", "No active problem found or PBM not found.")
-        return
+    session = _qf_session.get("session")
+    if session is None or session[0] is not qf or not _is_alive(session[2]):
+        problem = open_problem(qf, "")
+        if problem is None:
+            messagebox.showerror("QuickField", "No active problem found or PBM not found.")
+            return
 
-    model = ensure_model_loaded(problem, None)
-    if model is None:
-        messagebox.showerror("QuickField", "Failed to load model.")
-        return
+        model = ensure_model_loaded(problem, None)
+        if model is None:
+            messagebox.showerror("QuickField", "Failed to load model.")
+            return
+        session = _qf_session["session"] = (qf, problem, model)
 
-    labels = list_block_labels(model)
+    _, problem, model = session
+    key = _model_file_key(problem, model)
+    labels = list(_cached_block_labels(*key)) if key else list_block_labels(model)
     for combo in combos:
         combo["values"] = labels
         if labels:
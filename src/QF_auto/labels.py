@@ -1,17 +1,29 @@
 from __future__ import annotations
 import argparse
+import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Iterable, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from .connection import (
+    _com_mods,
+    _com_errors,
     win32com,
     dispatch_qf_app,
     open_problem,
     ensure_model_loaded,
     iter_collection,
+    iter_collection_indexed,
+    collection_count,
+    model_cache,
     close_data_windows,
-    _com_method_names,
+    _cached_method_names,
+    _com_type_key,
+    _early_bound,
     _numeric_prop,
+    forget_problem,
+    remember_problem,
 )
 from .geometry import _find_block_by_label
 
@@ -30,87 +42,237 @@ def iter_labels_by_type(problem: Any, label_type: int) -> Iterable[Any]:
         return []
     return iter_collection(labels)
 
+# getattr default for attributes a label may simply not have.
+_MISSING = object()
+
 def _label_point(label: Any) -> Optional[tuple[float, float]]:
+    errors = _com_errors()
     try:
-        pt = label.Point
-    except Exception:
+        pt = getattr(label, "Point", None)
+    except errors:
         pt = None
 
-    if pt is not None:
+    # label.Point.X/Y first, then X/Y on the label itself.
+    for holder in (pt, label):
+        if holder is None:
+            continue
         try:
-            x0 = float(getattr(pt, "X"))
-            y0 = float(getattr(pt, "Y"))
-            return x0, y0
-        except Exception:
-            pass
+            x0 = getattr(holder, "X", _MISSING)
+            y0 = getattr(holder, "Y", _MISSING) if x0 is not _MISSING else _MISSING
+            if y0 is not _MISSING:
+                return float(x0), float(y0)
+        except errors:
+            continue
+    return None
 
-    for attr in ("X", "Y"):
-        if not hasattr(label, attr):
-            return None
+def _label_key(name: str) -> str:
+    # Case-insensitive label key; the search name is keyed once per command and
+    # each label name once per index build.
+    return name.strip().casefold()
+
+def _name_reader(sample: Any) -> Callable[[Any], str]:
+    # Read label names with InvokeTypes on a DISPID resolved once from the
+    # first label, instead of an attribute lookup on every wrapper.
+    _, pythoncom = _com_mods()
     try:
-        return float(getattr(label, "X")), float(getattr(label, "Y"))
+        dispid = sample._oleobj_.GetIDsOfNames("Name")
     except Exception:
-        return None
+        return lambda lbl: str(lbl.Name)
+    get = pythoncom.DISPATCH_PROPERTYGET
+    return lambda lbl: str(lbl._oleobj_.InvokeTypes(dispid, 0, get, (8, 0), ()))
+
+def _label_index(labels: Any, owner: Any = None) -> dict[str, list[Any]]:
+    # _label_key(name) -> labels with that name, in collection order, from
+    # one pass over Name. With an owner (the problem) the index is kept in its
+    # model_cache and reused until the label count changes.
+    count = collection_count(labels)
+    cache = model_cache(owner) if owner is not None else None
+    hit = cache.get("label_index") if cache is not None else None
+    if hit is not None and hit[0] == count:
+        return hit[1]
+    index: dict[str, list[Any]] = {}
+    name_of: Optional[Callable[[Any], str]] = None
+    # Count was just read for the cache token; iter_collection re-reads it and
+    # also covers collections without a usable Count.
+    items = iter_collection_indexed(labels, count) if count > 0 else iter_collection(labels)
+    for lbl in items:
+        if name_of is None:
+            name_of = _name_reader(lbl)
+        try:
+            key = _label_key(name_of(lbl))
+        except Exception:
+            continue
+        index.setdefault(key, []).append(lbl)
+    if cache is not None:
+        cache["label_index"] = (count, index)
+    return index
+
+def _data_doc(problem: Any) -> Optional[Any]:
+    # problem.DataDoc, fetched once per problem and kept next to the label
+    # collection in its model_cache.
+    cache = model_cache(problem)
+    doc = cache.get("data_doc")
+    if doc is None:
+        try:
+            doc = problem.DataDoc
+        except Exception:
+            return None
+        cache["data_doc"] = doc
+    return doc
 
 def _label_collection(problem: Any) -> Optional[Any]:
-    try:
-        return problem.DataDoc.Labels(3)
-    except Exception:
-        pass
-    try:
-        return problem.Labels(3)
-    except Exception:
+    # Kept in the problem's model_cache; forget_problem and close_data_windows
+    # drop it.
+    cache = model_cache(problem)
+    labels = cache.get("label_collection")
+    if labels is not None:
+        return labels
+    # Prefer DataDoc (AM34.dms) labels, then problem-level labels.
+    errors = _com_errors()
+    labels = None
+    for holder in (_data_doc(problem), problem):
+        try:
+            get_labels = getattr(holder, "Labels", _MISSING)
+            labels = get_labels(3) if get_labels is not _MISSING else None
+        except errors:
+            labels = None
+        if labels is not None:
+            break
+    if labels is None:
         return None
+    cache["label_collection"] = labels
+    return labels
+
+# Content interface -> {member name: (DISPID, invoke kind)} for writes. Filled
+# one name at a time, so each member is resolved once per interface, not per
+# label or per write.
+_CONTENT_SCHEMA_CACHE: dict[Any, dict[str, tuple[int, int]]] = {}
+_DISP_E_MEMBERNOTFOUND = -2147352573
+
+def _schema_for(content: Any) -> dict[str, tuple[int, int]]:
+    key = _com_type_key(content)
+    return _CONTENT_SCHEMA_CACHE.setdefault(key, {}) if key is not None else {}
+
+def _label_content(label: Any) -> Any:
+    # Route Content through the gencache wrapper (fixed DISPIDs, static
+    # property maps); labels that are already early-bound return one directly.
+    content = label.Content
+    if type(content).__name__ == "CDispatch":
+        content = _early_bound(content)
+    return content
+
+def _set_prop(content: Any, name: str, value: Any, schema: Optional[dict[str, tuple[int, int]]] = None) -> None:
+    # Write through IDispatch::Invoke with a cached DISPID instead of getattr.
+    # Some QuickField COM schemas expose fields as setter methods: a property
+    # put they reject as DISP_E_MEMBERNOTFOUND is retried as a method call and
+    # remembered. Raises like the plain call/setattr would.
+    _, pythoncom = _com_mods()
+    oleobj = getattr(content, "_oleobj_", None)
+    if pythoncom is None or oleobj is None:
+        if callable(getattr(content, name, None)):
+            getattr(content, name)(value)
+        else:
+            setattr(content, name, value)
+        return
+    if schema is None:
+        schema = _schema_for(content)
+    entry = schema.get(name)
+    if entry is None:
+        # Generated wrappers carry the DISPIDs of settable properties as
+        # ((memid, lcid, invkind, 0), defargs) entries.
+        puts = getattr(type(content), "_prop_map_put_", None) or {}
+        dispid = puts[name][0][0] if name in puts else oleobj.GetIDsOfNames(name)
+        entry = schema[name] = (dispid, pythoncom.DISPATCH_PROPERTYPUT)
+    dispid, kind = entry
+    try:
+        oleobj.Invoke(dispid, 0, kind, False, value)
+    except pythoncom.com_error as exc:
+        if kind != pythoncom.DISPATCH_PROPERTYPUT or exc.hresult != _DISP_E_MEMBERNOTFOUND:
+            raise
+        oleobj.Invoke(dispid, 0, pythoncom.DISPATCH_METHOD, False, value)
+        schema[name] = (dispid, pythoncom.DISPATCH_METHOD)
+
+def _write_current(
+    content: Any, amps: float, total_flag: Any = True, schema: Optional[dict[str, tuple[int, int]]] = None
+) -> None:
+    # QuickField 6.2 uses Loading/LoadingEx for Total Ampere-Turns in block label,
+    # and the TotalCurrent flag must be ON for ampere-turns mode.
+    if schema is None:
+        schema = _schema_for(content)
+    for name, val in (("Loading", amps), ("LoadingEx", amps), ("TotalCurrent", total_flag)):
+        try:
+            _set_prop(content, name, val, schema)
+        except Exception:
+            pass
 
-def _copy_label_content(src: Any, dst: Any) -> None:
-    # Copy numeric properties from src.Content to dst.Content.
+_COMMON_FIELDS = (
+    "Kxx",
+    "Kyy",
+    "NonLinear",
+    "Anisotropic",
+    "Polar",
+    "Radial",
+    "Serial",
+    "Coercive",
+    "Conductivity",
+    "ConductivityEx",
+    "TemperatureEx",
+    "Loading",
+    "LoadingEx",
+    "TotalCurrent",
+)
+_COMMON_SET = frozenset(_COMMON_FIELDS)
+# Content interface -> member names outside _COMMON_FIELDS.
+_EXTRA_NAMES_CACHE: dict[Any, tuple[str, ...]] = {}
+# Content interface -> names whose value did not read as a number (methods,
+# strings, sub-objects); later copies skip them without a COM call.
+_NON_NUMERIC: dict[Any, set[str]] = {}
+
+def _extra_content_names(content: Any) -> tuple[str, ...]:
+    key = _com_type_key(content)
+    names = _EXTRA_NAMES_CACHE.get(key)
+    if names is None:
+        names = tuple(n for n in _cached_method_names(content) if n not in _COMMON_SET)
+        if key is not None:
+            _EXTRA_NAMES_CACHE[key] = names
+    return names
+
+def _copy_label_content(src: Any, dst: Any) -> Optional[Any]:
+    # Copy numeric properties from src.Content to dst.Content; returns the
+    # destination Content so callers can keep writing to it.
+    errors = _com_errors()
     try:
-        src_c = src.Content
-        dst_c = dst.Content
-    except Exception:
-        return
+        src_c = _label_content(src)
+        dst_c = _label_content(dst)
+    except errors:
+        return None
+    schema = _schema_for(dst_c)
 
     # Explicit common fields first (more reliable than blind setattr).
-    common = [
-        "Kxx",
-        "Kyy",
-        "NonLinear",
-        "Anisotropic",
-        "Polar",
-        "Radial",
-        "Serial",
-        "Coercive",
-        "Conductivity",
-        "ConductivityEx",
-        "TemperatureEx",
-        "Loading",
-        "LoadingEx",
-        "TotalCurrent",
-    ]
-    for name in common:
+    for name in _COMMON_FIELDS:
         val = _numeric_prop(src_c, name)
         if val is None:
             continue
         try:
-            if callable(getattr(dst_c, name, None)):
-                getattr(dst_c, name)(val)
-            else:
-                setattr(dst_c, name, val)
-        except Exception:
+            _set_prop(dst_c, name, val, schema)
+        except errors:
             continue
 
     # Fallback: try to copy any other numeric props.
-    for name in _com_method_names(src_c):
+    src_key = _com_type_key(src_c)
+    non_numeric = _NON_NUMERIC.setdefault(src_key, set()) if src_key is not None else set()
+    for name in _extra_content_names(src_c):
+        if name in non_numeric:
+            continue
         val = _numeric_prop(src_c, name)
         if val is None:
+            non_numeric.add(name)
             continue
         try:
-            if callable(getattr(dst_c, name, None)):
-                getattr(dst_c, name)(val)
-            else:
-                setattr(dst_c, name, val)
-        except Exception:
+            _set_prop(dst_c, name, val, schema)
+        except errors:
             continue
+    return dst_c
 
 def cmd_clone_label(args: argparse.Namespace) -> int:
     if win32com is None:
@@ -134,19 +296,16 @@ def cmd_clone_label(args: argparse.Namespace) -> int:
         print("Failed to access block labels.")
         return 4
 
-    src_lbl = None
-    for lbl in iter_collection(labels):
-        try:
-            if str(lbl.Name).strip().lower() == src_name.lower():
-                src_lbl = lbl
-                break
-        except Exception:
-            continue
+    src_lbl = next(iter(_label_index(labels, problem).get(_label_key(src_name), ())), None)
     if src_lbl is None:
         print(f"Source label not found: {src_name}")
         return 5
 
-    # Create new label.
+    # Create new label; the slot it lands in is known up front.
+    try:
+        count_before = int(labels.Count)
+    except Exception:
+        count_before = None
     new_lbl = None
     try:
         new_lbl = labels.Add()
@@ -155,6 +314,11 @@ def cmd_clone_label(args: argparse.Namespace) -> int:
             new_lbl = labels.Insert()
         except Exception:
             new_lbl = None
+    if new_lbl is None and count_before is not None:
+        try:
+            new_lbl = labels.Item(count_before + 1)
+        except Exception:
+            new_lbl = None
     if new_lbl is None:
         try:
             new_lbl = labels.Item(int(labels.Count))
@@ -167,41 +331,21 @@ def cmd_clone_label(args: argparse.Namespace) -> int:
     except Exception:
         pass
 
-    _copy_label_content(src_lbl, new_lbl)
+    content = _copy_label_content(src_lbl, new_lbl)
 
     # Optionally override current in the cloned label.
     if amps is not None:
         try:
-            content = new_lbl.Content
-            try:
-                if callable(getattr(content, "Loading", None)):
-                    content.Loading(amps)
-                else:
-                    content.Loading = amps
-            except Exception:
-                pass
-            try:
-                if callable(getattr(content, "LoadingEx", None)):
-                    content.LoadingEx(amps)
-                else:
-                    content.LoadingEx = amps
-            except Exception:
-                pass
-            try:
-                if callable(getattr(content, "TotalCurrent", None)):
-                    content.TotalCurrent(amps)
-                else:
-                    content.TotalCurrent = amps
-            except Exception:
-                pass
+            _write_current(content if content is not None else _label_content(new_lbl), amps, amps)
         except Exception:
             pass
 
-    try:
-        problem.DataDoc.Save()
-    except Exception:
-        pass
-    close_data_windows(qf)
+    if not (getattr(args, "no_save", False) or _saving_deferred()):
+        try:
+            _data_doc(problem).Save()
+        except Exception:
+            pass
+        close_data_windows(qf)
 
     if amps is not None:
         print(f"Cloned label '{src_name}' -> '{dst_name}' with current {amps}.")
@@ -209,58 +353,44 @@ def cmd_clone_label(args: argparse.Namespace) -> int:
         print(f"Cloned label '{src_name}' -> '{dst_name}'.")
     return 0
 
+# Field writes for a coil label before its current, in order; "mu_r" is
+# filled in per call.
+_COIL_WRITES: tuple[tuple[str, Any], ...] = (
+    # Permeability (relative)
+    ("Kxx", "mu_r"),
+    ("Kyy", "mu_r"),
+    # Basic flags
+    ("NonLinear", 0.0),
+    ("Anisotropic", 0.0),
+    ("Polar", 0.0),
+    ("Radial", 0.0),
+    ("Serial", 0.0),
+    # Zero magnet/coercive and conductivity
+    ("Coercive", 0.0),
+    ("Conductivity", 0.0),
+    ("ConductivityEx", 0.0),
+)
+
 def _set_coil_label_values(label_obj: Any, amps: float, mu_r: float = 1.0) -> None:
     try:
-        content = label_obj.Content
+        content = _label_content(label_obj)
     except Exception:
         return
+    schema = _schema_for(content)
 
-    # Permeability (relative)
-    for name, val in (("Kxx", mu_r), ("Kyy", mu_r)):
-        try:
-            if callable(getattr(content, name, None)):
-                getattr(content, name)(val)
-            else:
-                setattr(content, name, val)
-        except Exception:
-            pass
-
-    # Basic flags
-    for name in ("NonLinear", "Anisotropic", "Polar", "Radial", "Serial"):
+    params = {"mu_r": mu_r}
+    for name, val in _COIL_WRITES:
         try:
-            if callable(getattr(content, name, None)):
-                getattr(content, name)(0.0)
-            else:
-                setattr(content, name, 0.0)
-        except Exception:
-            pass
-
-    # Zero magnet/coercive and conductivity
-    for name in ("Coercive", "Conductivity", "ConductivityEx"):
-        try:
-            if callable(getattr(content, name, None)):
-                getattr(content, name)(0.0)
-            else:
-                setattr(content, name, 0.0)
+            _set_prop(content, name, params.get(val, val), schema)
         except Exception:
             pass
 
     # Total Ampere-Turns
-    for name in ("Loading", "LoadingEx", "TotalCurrent"):
-        try:
-            if callable(getattr(content, name, None)):
-                getattr(content, name)(amps)
-            else:
-                setattr(content, name, amps)
-        except Exception:
-            pass
+    _write_current(content, amps, amps, schema)
 
     # Ensure type if writable
     try:
-        if callable(getattr(content, "Type", None)):
-            content.Type(3)
-        else:
-            content.Type = 3
+        _set_prop(content, "Type", 3, schema)
     except Exception:
         pass
 
@@ -304,15 +434,19 @@ def cmd_create_coil_label(args: argparse.Namespace) -> int:
 
     _set_coil_label_values(new_lbl, float(args.amps), float(args.mu))
 
-    try:
-        problem.DataDoc.Save()
-    except Exception:
-        pass
-    close_data_windows(qf)
+    if not (getattr(args, "no_save", False) or _saving_deferred()):
+        try:
+            _data_doc(problem).Save()
+        except Exception:
+            pass
+        close_data_windows(qf)
 
     print(f"Created coil label '{name}' with mu_r={args.mu} and amps={args.amps}.")
     return 0
 
+# Blocks selection method per collection type: LabeledAs, GetLabeledAs or None.
+_LABELEDAS_METHOD: dict[type, Optional[str]] = {}
+
 def cmd_assign_label(args: argparse.Namespace) -> int:
     if win32com is None:
         print("pywin32 is not available. Install with: pip install pywin32")
@@ -341,13 +475,27 @@ def cmd_assign_label(args: argparse.Namespace) -> int:
         return 5
 
     sel = None
-    for method_name in ("LabeledAs", "GetLabeledAs"):
-        if hasattr(blocks, method_name):
+    kind = type(blocks)
+    if kind in _LABELEDAS_METHOD:
+        method_name = _LABELEDAS_METHOD[kind]
+        if method_name is not None:
             try:
                 sel = getattr(blocks, method_name)("", "", src_name)
-                break
             except Exception:
                 sel = None
+    else:
+        found = False
+        for method_name in ("LabeledAs", "GetLabeledAs"):
+            if hasattr(blocks, method_name):
+                found = True
+                try:
+                    sel = getattr(blocks, method_name)("", "", src_name)
+                    _LABELEDAS_METHOD[kind] = method_name
+                    break
+                except Exception:
+                    sel = None
+        if not found:
+            _LABELEDAS_METHOD[kind] = None
 
     if sel is None:
         print(f"No blocks found for label: {src_name}")
@@ -371,6 +519,93 @@ def cmd_assign_label(args: argparse.Namespace) -> int:
     print(f"Assigned label '{dst_name}' to blocks previously labeled '{src_name}'.")
     return 0
 
+_CURRENT_FIELDS = ("Loading", "LoadingEx", "TotalCurrent")
+
+@contextmanager
+def _doc_batch(problem: Any) -> Iterator[None]:
+    # Group a run of label writes in one BeginUpdate/EndUpdate on the DataDoc
+    # when this QuickField version exposes them; a no-op otherwise.
+    doc = None
+    try:
+        doc = _data_doc(problem)
+        doc.BeginUpdate()
+    except Exception:
+        doc = None
+    try:
+        yield
+    finally:
+        if doc is not None:
+            try:
+                doc.EndUpdate()
+            except Exception:
+                pass
+
+_BATCH = threading.local()
+
+def _saving_deferred() -> bool:
+    return getattr(_BATCH, "depth", 0) > 0
+
+@contextmanager
+def batch_labels(problem: Any, qf: Any = None) -> Iterator[None]:
+    # Chain several label commands against one problem and save the DataDoc
+    # once on the way out instead of after every command.
+    _BATCH.depth = getattr(_BATCH, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _BATCH.depth -= 1
+        if _BATCH.depth == 0:
+            try:
+                _data_doc(problem).Save()
+            except Exception:
+                pass
+            try:
+                problem.Save()
+            except Exception:
+                pass
+            if qf is not None:
+                close_data_windows(qf)
+
+def _read_fields(content: Any, names: Iterable[str]) -> dict[str, Optional[float]]:
+    # Numeric reads for the verbose report, through the same cached DISPIDs
+    # _set_prop writes with; None where a field does not read as a number.
+    _, pythoncom = _com_mods()
+    oleobj = getattr(content, "_oleobj_", None)
+    if pythoncom is None or oleobj is None:
+        return {name: _numeric_prop(content, name) for name in names}
+    schema = _schema_for(content)
+    flags = pythoncom.DISPATCH_PROPERTYGET | pythoncom.DISPATCH_METHOD
+    out: dict[str, Optional[float]] = {}
+    for name in names:
+        try:
+            entry = schema.get(name)
+            dispid = entry[0] if entry is not None else oleobj.GetIDsOfNames(name)
+            out[name] = float(oleobj.Invoke(dispid, 0, flags, True))
+        except Exception:
+            out[name] = None
+    return out
+
+def _write_label_current(target: Any, label: str, amps: float, verbose: bool = True) -> None:
+    content = _label_content(target)
+    before = _read_fields(content, _CURRENT_FIELDS) if verbose else {}
+
+    _write_current(content, amps)
+
+    # IMPORTANT: reassign content back to label (per official COM samples).
+    try:
+        target.Content = content
+    except Exception:
+        pass
+
+    if not verbose:
+        return
+    after = {key: val for key, val in _read_fields(content, _CURRENT_FIELDS).items() if val is not None}
+    if before["TotalCurrent"] is not None:
+        print(f"Label '{label}': TotalCurrent {before['TotalCurrent']} -> {after.get('TotalCurrent', 'n/a')}")
+    if before["Loading"] is not None or before["LoadingEx"] is not None:
+        print(f"Label '{label}': Loading {before['Loading']} -> {after.get('Loading','n/a')}, LoadingEx {before['LoadingEx']} -> {after.get('LoadingEx','n/a')}")
+    print(f"Label '{label}': Loading={after.get('Loading','n/a')}, LoadingEx={after.get('LoadingEx','n/a')}")
+
 def cmd_set_current(args: argparse.Namespace) -> int:
     if win32com is None:
         print("pywin32 is not available. Install with: pip install pywin32")
@@ -386,107 +621,44 @@ def cmd_set_current(args: argparse.Namespace) -> int:
         print("Missing --label.")
         return 3
 
-    labels = None
-    # Prefer DataDoc (AM34.dms) labels
-    try:
-        labels = problem.DataDoc.Labels(3)
-    except Exception:
-        labels = None
-    # Fallback: problem-level labels
-    if labels is None:
-        try:
-            labels = problem.Labels(3)
-        except Exception:
-            labels = None
+    labels = _label_collection(problem)
     if labels is None:
         print("Failed to access block labels.")
         return 4
 
-    targets = []
-    for lbl in iter_collection(labels):
-        try:
-            if str(lbl.Name).strip().lower() == label.lower():
-                targets.append(lbl)
-        except Exception:
-            continue
-
+    targets = _label_index(labels, problem).get(_label_key(label), [])
     if not targets:
         print(f"Block label not found: {label}")
         return 5
 
     amps = float(args.amps)
+    verbose = bool(getattr(args, "verbose", False))
     changed = 0
-    for target in targets:
-        try:
-            content = target.Content
-            before_loading = _numeric_prop(content, "Loading")
-            before_loading_ex = _numeric_prop(content, "LoadingEx")
-            before_total_flag = _numeric_prop(content, "TotalCurrent")
-
-            # QuickField 6.2 uses Loading/LoadingEx for Total Ampere-Turns in block label.
-            # Loading / LoadingEx may be methods in some COM schemas.
+    with _doc_batch(problem):
+        for target in targets:
             try:
-                if callable(getattr(content, "Loading", None)):
-                    content.Loading(amps)
-                else:
-                    content.Loading = amps
-            except Exception:
-                pass
-            try:
-                if callable(getattr(content, "LoadingEx", None)):
-                    content.LoadingEx(amps)
-                else:
-                    content.LoadingEx = amps
-            except Exception:
-                pass
-
-            # Ensure TotalCurrent flag is ON for ampere-turns mode.
-            try:
-                if callable(getattr(content, "TotalCurrent", None)):
-                    content.TotalCurrent(True)
-                else:
-                    content.TotalCurrent = True
-            except Exception:
-                pass
-
-            # IMPORTANT: reassign content back to label (per official COM samples).
-            try:
-                target.Content = content
-            except Exception:
-                pass
-
-            after = {}
-            for key in ("Loading", "LoadingEx", "TotalCurrent"):
-                try:
-                    after[key] = float(getattr(content, key))
-                except Exception:
-                    pass
-
-            if before_total_flag is not None:
-                print(f"Label '{label}': TotalCurrent {before_total_flag} -> {after.get('TotalCurrent', 'n/a')}")
-            if before_loading is not None or before_loading_ex is not None:
-                print(f"Label '{label}': Loading {before_loading} -> {after.get('Loading','n/a')}, LoadingEx {before_loading_ex} -> {after.get('LoadingEx','n/a')}")
-            print(f"Label '{label}': Loading={after.get('Loading','n/a')}, LoadingEx={after.get('LoadingEx','n/a')}")
-            changed += 1
-        except Exception as exc:
-            print(f"Failed to set current for one label '{label}': {exc}")
+                _write_label_current(target, label, amps, verbose)
+                changed += 1
+            except Exception as exc:
+                print(f"Failed to set current for one label '{label}': {exc}")
 
     # Persist changes (DataDoc is where block labels live).
-    try:
-        problem.DataDoc.Save()
-    except Exception:
-        pass
-    close_data_windows(qf)
-    try:
-        problem.Save()
-    except Exception:
-        pass
+    if not (getattr(args, "no_save", False) or _saving_deferred()):
+        try:
+            _data_doc(problem).Save()
+        except Exception:
+            pass
+        close_data_windows(qf)
+        try:
+            problem.Save()
+        except Exception:
+            pass
 
     # Optional: save DataDoc to a new .dms file.
     if getattr(args, "save_dms", ""):
         dms_path = str(args.save_dms)
         try:
-            problem.DataDoc.SaveAs(dms_path)
+            _data_doc(problem).SaveAs(dms_path)
             print(f"DataDoc saved as: {dms_path}")
         except Exception as exc:
             print(f"DataDoc.SaveAs failed: {exc}")
@@ -505,35 +677,31 @@ def cmd_set_current(args: argparse.Namespace) -> int:
             problem.Close()
         except Exception:
             pass
+        forget_problem()
         if pbm_path:
             try:
                 qf.Problems.Open(pbm_path)
-                problem = qf.ActiveProblem
+                problem = remember_problem(qf, qf.ActiveProblem)
             except Exception:
                 problem = None
         if problem is not None:
             try:
-                labels = problem.DataDoc.Labels(3)
+                labels = _data_doc(problem).Labels(3)
             except Exception:
                 labels = None
             if labels is not None:
-                for lbl in iter_collection(labels):
+                for lbl in _label_index(labels, problem).get(_label_key(label), [])[:1]:
                     try:
-                        if str(lbl.Name).strip().lower() == label.lower():
-                            content = lbl.Content
-                            try:
-                                print(
-                                    "Reopen check:",
-                                    "Loading",
-                                    getattr(content, "Loading", "n/a"),
-                                    "LoadingEx",
-                                    getattr(content, "LoadingEx", "n/a"),
-                                )
-                            except Exception:
-                                pass
-                            break
+                        content = lbl.Content
+                        print(
+                            "Reopen check:",
+                            "Loading",
+                            getattr(content, "Loading", "n/a"),
+                            "LoadingEx",
+                            getattr(content, "LoadingEx", "n/a"),
+                        )
                     except Exception:
-                        continue
+                        pass
 
     if changed == 0:
         return 6
@@ -542,93 +710,36 @@ def cmd_set_current(args: argparse.Namespace) -> int:
 
 
 def set_label_current(problem: Any, label: str, amps: float, qf: Optional[Any] = None) -> int:
-    labels = None
-    try:
-        labels = problem.DataDoc.Labels(3)
-    except Exception:
-        labels = None
-    if labels is None:
-        try:
-            labels = problem.Labels(3)
-        except Exception:
-            labels = None
+    labels = _label_collection(problem)
     if labels is None:
         print("Failed to access block labels.")
         return 0
 
-    targets = []
-    for lbl in iter_collection(labels):
-        try:
-            if str(lbl.Name).strip().lower() == label.lower():
-                targets.append(lbl)
-        except Exception:
-            continue
-
+    targets = _label_index(labels, problem).get(_label_key(label), [])
     if not targets:
         print(f"Block label not found: {label}")
         return 0
 
     changed = 0
-    for target in targets:
-        try:
-            content = target.Content
-            before_loading = _numeric_prop(content, "Loading")
-            before_loading_ex = _numeric_prop(content, "LoadingEx")
-            before_total_flag = _numeric_prop(content, "TotalCurrent")
-
-            try:
-                if callable(getattr(content, "Loading", None)):
-                    content.Loading(amps)
-                else:
-                    content.Loading = amps
-            except Exception:
-                pass
-            try:
-                if callable(getattr(content, "LoadingEx", None)):
-                    content.LoadingEx(amps)
-                else:
-                    content.LoadingEx = amps
-            except Exception:
-                pass
+    with _doc_batch(problem):
+        for target in targets:
             try:
-                if callable(getattr(content, "TotalCurrent", None)):
-                    content.TotalCurrent(True)
-                else:
-                    content.TotalCurrent = True
-            except Exception:
-                pass
+                _write_label_current(target, label, amps)
+                changed += 1
+            except Exception as exc:
+                print(f"Failed to set current for one label '{label}': {exc}")
 
-            try:
-                target.Content = content
-            except Exception:
-                pass
-
-            after = {}
-            for key in ("Loading", "LoadingEx", "TotalCurrent"):
-                try:
-                    after[key] = float(getattr(content, key))
-                except Exception:
-                    pass
-
-            if before_total_flag is not None:
-                print(f"Label '{label}': TotalCurrent {before_total_flag} -> {after.get('TotalCurrent', 'n/a')}")
-            if before_loading is not None or before_loading_ex is not None:
-                print(f"Label '{label}': Loading {before_loading} -> {after.get('Loading','n/a')}, LoadingEx {before_loading_ex} -> {after.get('LoadingEx','n/a')}")
-            print(f"Label '{label}': Loading={after.get('Loading','n/a')}, LoadingEx={after.get('LoadingEx','n/a')}")
-            changed += 1
-        except Exception as exc:
-            print(f"Failed to set current for one label '{label}': {exc}")
-
-    try:
-        problem.DataDoc.Save()
-    except Exception:
-        pass
-    try:
-        problem.Save()
-    except Exception:
-        pass
-    if qf is not None:
-        close_data_windows(qf)
+    if not _saving_deferred():
+        try:
+            _data_doc(problem).Save()
+        except Exception:
+            pass
+        try:
+            problem.Save()
+        except Exception:
+            pass
+        if qf is not None:
+            close_data_windows(qf)
     print(f"Updated {changed} label(s) named '{label}'.")
     return changed
 
@@ -653,7 +764,7 @@ def set_label_field(
         emit("Missing field name.")
         return 0
 
-    label_set = {name.strip().lower() for name in labels if name.strip()}
+    label_set = {_label_key(name) for name in labels if name.strip()}
     if not label_set:
         emit("No label names provided.")
         return 0
@@ -662,81 +773,57 @@ def set_label_field(
         label_coll = problem.Labels(3)
     except Exception:
         try:
-            label_coll = problem.DataDoc.Labels(3)
+            label_coll = _data_doc(problem).Labels(3)
         except Exception:
             label_coll = None
     if label_coll is None:
         emit("Failed to access block labels.")
         return 0
 
-    targets = []
-    for lbl in iter_collection(label_coll):
-        try:
-            name = str(lbl.Name).strip().lower()
-        except Exception:
-            continue
-        if name in label_set:
-            targets.append(lbl)
+    index = _label_index(label_coll, problem)
+    targets = [lbl for name in label_set for lbl in index.get(name, ())]
 
     if not targets:
         emit(f"No matching labels found: {', '.join(labels)}")
         return 0
 
     changed = 0
-    for target in targets:
-        try:
-            content = target.Content
-
-            # Special cases for common fields
-            if field_key.lower() in ("loading", "loadingex", "current", "amps"):
-                for name in ("Loading", "LoadingEx"):
+    with _doc_batch(problem):
+        for target in targets:
+            try:
+                content = _label_content(target)
+                schema = _schema_for(content)
+
+                # Special cases for common fields
+                if field_key.lower() in ("loading", "loadingex", "current", "amps"):
+                    _write_current(content, value, True, schema)
+                elif field_key.lower() in ("k", "mu", "mur", "kxx", "kyy"):
+                    for name in ("Kxx", "Kyy"):
+                        try:
+                            _set_prop(content, name, value, schema)
+                        except Exception:
+                            pass
+                else:
                     try:
-                        if callable(getattr(content, name, None)):
-                            getattr(content, name)(value)
-                        else:
-                            setattr(content, name, value)
-                    except Exception:
-                        pass
+                        _set_prop(content, field_key, value, schema)
+                    except Exception as exc:
+                        emit(f"Failed to set {field_key} on '{target.Name}': {exc}")
+                        continue
+
                 try:
-                    if callable(getattr(content, "TotalCurrent", None)):
-                        content.TotalCurrent(True)
-                    else:
-                        content.TotalCurrent = True
+                    target.Content = content
                 except Exception:
                     pass
-            elif field_key.lower() in ("k", "mu", "mur", "kxx", "kyy"):
-                for name in ("Kxx", "Kyy"):
-                    try:
-                        if callable(getattr(content, name, None)):
-                            getattr(content, name)(value)
-                        else:
-                            setattr(content, name, value)
-                    except Exception:
-                        pass
-            else:
-                try:
-                    if callable(getattr(content, field_key, None)):
-                        getattr(content, field_key)(value)
-                    else:
-                        setattr(content, field_key, value)
-                except Exception as exc:
-                    emit(f"Failed to set {field_key} on '{target.Name}': {exc}")
-                    continue
+                changed += 1
+            except Exception as exc:
+                emit(f"Failed to update '{target.Name}': {exc}")
 
-            try:
-                target.Content = content
-            except Exception:
-                pass
-            changed += 1
-        except Exception as exc:
-            emit(f"Failed to update '{target.Name}': {exc}")
-
-    if save:
+    if save and not _saving_deferred():
         try:
             problem.Save()
         except Exception:
             try:
-                problem.DataDoc.Save()
+                _data_doc(problem).Save()
             except Exception:
                 pass
         if qf is not None:
@@ -760,29 +847,12 @@ def cmd_label_dump(args: argparse.Namespace) -> int:
         print("Missing --label.")
         return 3
 
-    labels = None
-    try:
-        labels = problem.DataDoc.Labels(3)
-    except Exception:
-        labels = None
-    if labels is None:
-        try:
-            labels = problem.Labels(3)
-        except Exception:
-            labels = None
+    labels = _label_collection(problem)
     if labels is None:
         print("Failed to access block labels.")
         return 4
 
-    target = None
-    for lbl in iter_collection(labels):
-        try:
-            if str(lbl.Name).strip().lower() == label.lower():
-                target = lbl
-                break
-        except Exception:
-            continue
-
+    target = next(iter(_label_index(labels, problem).get(_label_key(label), ())), None)
     if target is None:
         print(f"Block label not found: {label}")
         return 5
@@ -798,14 +868,15 @@ def cmd_label_dump(args: argparse.Namespace) -> int:
         return 6
 
     # Dump COM properties/methods and numeric values.
-    names = _com_method_names(content)
-    print(f"Label.Content properties ({len(names)}):")
+    names = _cached_method_names(content)
+    lines = [f"Label.Content properties ({len(names)}):"]
     for name in names:
         val = _numeric_prop(content, name)
         if val is not None:
-            print(f"- {name}: {val}")
+            lines.append(f"- {name}: {val}")
         else:
-            print(f"- {name}")
+            lines.append(f"- {name}")
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 def cmd_label_pos(args: argparse.Namespace) -> int:
@@ -818,21 +889,29 @@ def cmd_label_pos(args: argparse.Namespace) -> int:
     if problem is None:
         return 2
 
-    target = args.name.strip().lower() if args.name else ""
+    target = _label_key(args.name) if args.name else ""
     found = 0
-    for lbl in iter_labels_by_type(problem, 3):
+    candidates: Iterable[Any] = iter_labels_by_type(problem, 3)
+    if target:
+        labels = _label_collection(problem)
+        candidates = _label_index(labels, problem).get(target, []) if labels is not None else []
+    name_of: Optional[Callable[[Any], str]] = None
+    lines: list[str] = []
+    for lbl in candidates:
+        if name_of is None:
+            name_of = _name_reader(lbl)
         try:
-            name = str(getattr(lbl, "Name"))
+            name = name_of(lbl)
         except Exception:
             continue
-        if target and name.lower() != target:
-            continue
         pt = _label_point(lbl)
         if pt is None:
-            print(f"{name}: (point unavailable)")
+            lines.append(f"{name}: (point unavailable)")
         else:
-            print(f"{name}: ({pt[0]}, {pt[1]})")
+            lines.append(f"{name}: ({pt[0]}, {pt[1]})")
         found += 1
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
     if found == 0:
         if target:
@@ -13,19 +13,15 @@ from .connection import (
     normalize_labels,
     close_data_windows,
     iter_collection,
-    _com_method_names,
-    _numeric_prop,
+    _cached_method_names,
+    _com_type_key,
     _string_prop,
+    _prop_values,
+    _as_number,
+    rebuild_model,
 )
 from .labels import _label_collection
 
-def rebuild_model(qf: Any, problem: Any) -> None:
-    for obj in (problem, qf):
-        try:
-            obj.Rebuild()
-        except Exception:
-            pass
-
 def build_mesh(model: Any) -> bool:
     def _try_build(target: Any) -> bool:
         if target is None:
@@ -97,14 +93,20 @@ def solve_problem(problem: Any, model: Optional[Any] = None) -> bool:
         print(f"SolveProblem failed: {exc}")
         return False
 
-    # Wait for solver if busy.
-    for _ in range(600):
+    # Wait for solver if busy: poll from 10 ms, backing off to 500 ms, for at
+    # most the old 300 s. Problems without IsBusy are not waited on.
+    deadline = time.monotonic() + 300.0
+    delay = 0.01
+    sleep = time.sleep
+    monotonic = time.monotonic
+    while monotonic() < deadline:
         try:
-            if hasattr(problem, "IsBusy") and not bool(problem.IsBusy):
+            if not bool(problem.IsBusy):
                 break
         except Exception:
             break
-        time.sleep(0.5)
+        sleep(delay)
+        delay = min(delay * 1.7, 0.5)
 
     # Analyze results if needed.
     try:
@@ -140,19 +142,28 @@ def _iter_circuit_items(circuit: Any) -> Iterable[Any]:
                 break
         i += 1
 
+# COM interface -> member names containing "force", filtered once per type.
+_FORCE_NAMES_CACHE: dict[Any, tuple[str, ...]] = {}
+
+def _force_names(obj: Any) -> tuple[str, ...]:
+    key = _com_type_key(obj)
+    names = _FORCE_NAMES_CACHE.get(key)
+    if names is None:
+        names = tuple(n for n in _cached_method_names(obj) if "force" in n.lower())
+        if key is not None:
+            _FORCE_NAMES_CACHE[key] = names
+    return names
+
+_FORCE_KEYS = ("Fx", "Fy", "Fz", "ForceX", "ForceY", "ForceZ", "Force", "MagneticForce")
+
 def dump_force_candidates(obj: Any) -> list[tuple[str, float]]:
+    # Common names first, then any other member containing "Force"; all read
+    # in one _prop_values pass.
+    names = _FORCE_KEYS + tuple(n for n in _force_names(obj) if n not in _FORCE_KEYS)
+    values = _prop_values(obj, names)
     candidates = []
-    # Common names to try first.
-    for key in ("Fx", "Fy", "Fz", "ForceX", "ForceY", "ForceZ", "Force", "MagneticForce"):
-        val = _numeric_prop(obj, key)
-        if val is not None:
-            candidates.append((key, val))
-
-    # Also scan COM property names containing "Force".
-    for name in _com_method_names(obj):
-        if "force" not in name.lower():
-            continue
-        val = _numeric_prop(obj, name)
+    for name in names:
+        val = _as_number(values[name]) if name in values else None
         if val is not None and (name, val) not in candidates:
             candidates.append((name, val))
     return candidates
@@ -227,16 +238,15 @@ def cmd_circuit_dump(args: argparse.Namespace) -> int:
         return 4
 
     print("Circuit properties:")
-    for name in _com_method_names(circuit):
-        val = _numeric_prop(circuit, name)
-        if val is not None:
-            print(f"- {name}: {val}")
-        else:
-            s = _string_prop(circuit, name)
-            if s is not None:
-                print(f"- {name}: {s}")
-            else:
-                print(f"- {name}")
+    names = _cached_method_names(circuit)
+    values = _prop_values(circuit, names)
+    for name in names:
+        if name not in values:
+            print(f"- {name}")
+            continue
+        raw = values[name]
+        val = _as_number(raw)
+        print(f"- {name}: {val if val is not None else raw}")
 
     # Try list items if this is a collection.
     try:
@@ -435,10 +445,11 @@ def cmd_result_dump(args: argparse.Namespace) -> int:
         print(f"Result block not found for label: {label}")
         return 5
 
-    names = _com_method_names(target)
+    names = _cached_method_names(target)
+    values = _prop_values(target, names)
     print(f"Result block properties ({len(names)}):")
     for name in names:
-        val = _numeric_prop(target, name)
+        val = _as_number(values[name]) if name in values else None
         if val is not None:
             print(f"- {name}: {val}")
         else:
@@ -542,7 +553,7 @@ def cmd_solve_integral(args: argparse.Namespace) -> int:
         print(f"Failed to access FieldWindow/Contour: {exc}")
         return 7
 
-    labels = [v.strip() for v in args.labels.split(",") if v.strip()]
+    labels = normalize_labels(args.labels)
     if not labels:
         print("No labels provided. Use --labels \"steel mover\"")
         return 8
@@ -180,12 +180,13 @@ def _positions_line(x0: float, y0: float, x1: float, y1: float, step: float) ->
     length = (dx * dx + dy * dy) ** 0.5
     if length <= 1e-9:
         return [(round(x0, 6), round(y0, 6))]
-    steps = max(1, int(length / step))
-    out: list[tuple[float, float]] = []
-    for i in range(steps + 1):
-        t = i / steps
-        out.append((round(x0 + dx * t, 6), round(y0 + dy * t, 6)))
-    return out
+    # Same slack as generate_positions_float, so a length float division
+    # lands just below (e.g. 0.3 / 0.1) keeps its last step.
+    steps = max(1, int(length / step + 1e-9))
+    # Each point is computed from its index, so no error accumulates.
+    sx = dx / steps
+    sy = dy / steps
+    return [(round(x0 + sx * i, 6), round(y0 + sy * i, 6)) for i in range(steps + 1)]
 
 
 def _union_bounds(bounds: Sequence[tuple[float, float, float, float]]) -> tuple[float, float, float, float]:
@@ -405,11 +406,38 @@ def run_batch_force_plan(
         cur_y = cur_y + dy
         return True, rect_now, cur_x, cur_y
 
+    def _build_contour(res: Any) -> Any:
+        # Contour on the result's field window holding the moving labels.
+        contour = res.GetFieldWindow(1).Contour
+        try:
+            contour.Clear()
+        except Exception:
+            pass
+        try:
+            add_block = contour.AddBlock1
+        except Exception:
+            add_block = None
+        if add_block is not None:
+            for name in contour_labels:
+                try:
+                    add_block(name)
+                except Exception:
+                    pass
+        return contour
+
     table: dict[tuple[float, float], dict[int, dict[str, float]]] = {}
     seen_components: dict[str, list[str]] = {name: [] for name, _ in integrals}
 
     step_sleep = max(0.0, float(sleep_s or 0))
     cancelled = False
+    mesh = bool(mesh)
+    remesh = bool(remesh)
+    integral_ids = tuple((name, int(integral_id)) for name, integral_id in integrals)
+    contour_labels = tuple(move_labels)
+    # The moving labels never change in this loop, so the contour built on a
+    # Result is reused for as long as solves hand back that same Result.
+    contour_res: Any = None
+    contour: Any = None
 
     for idx, case in enumerate(cases, start=1):
         if is_cancelled():
@@ -418,6 +446,7 @@ def run_batch_force_plan(
         for name, val in case.items():
             # Avoid closing QuickField windows during batch runs.
             set_label_field(problem, [name], field_name, val, qf=None, log=log, save=False)
+        case_label = ",".join(f"{k}={v}" for k, v in case.items())
 
         rect = base_rect
         cur_x = 0.0
@@ -460,43 +489,52 @@ def run_batch_force_plan(
                     return 11
 
                 try:
-                    field = res.GetFieldWindow(1)
-                    contour = field.Contour
-                except Exception as exc:
-                    emit(f"Failed to access FieldWindow/Contour: {exc}")
-                    return 12
-
-                try:
-                    contour.Clear()
+                    same_res = contour is not None and res == contour_res
                 except Exception:
-                    pass
-                for name in move_labels:
+                    same_res = False
+                # A reused contour may have gone stale in the re-solve; the
+                # first integral that fails on it rebuilds it and retries once.
+                reused = same_res
+                if not same_res:
                     try:
-                        contour.AddBlock1(name)
-                    except Exception:
-                        pass
+                        contour = _build_contour(res)
+                    except Exception as exc:
+                        emit(f"Failed to access FieldWindow/Contour: {exc}")
+                        return 12
+                    contour_res = res
 
                 key = (float(dx), float(dy))
-                table.setdefault(key, {}).setdefault(idx, {})
+                cells = table.setdefault(key, {}).setdefault(idx, {})
                 outputs: list[str] = []
-                for integral_name, integral_id in integrals:
-                    try:
-                        val = res.GetIntegral(integral_id, contour)
-                        if hasattr(val, "Value"):
-                            val = val.Value
-                        comps = _integral_components(val)
-                    except Exception as exc:
-                        emit(f"Integral failed ({integral_name}) at dx={dx}, dy={dy}: {exc}")
-                        return 13
-
+                for integral_name, integral_id in integral_ids:
+                    while True:
+                        try:
+                            val = res.GetIntegral(integral_id, contour)
+                            if hasattr(val, "Value"):
+                                val = val.Value
+                            comps = _integral_components(val)
+                            break
+                        except Exception as exc:
+                            if not reused:
+                                emit(f"Integral failed ({integral_name}) at dx={dx}, dy={dy}: {exc}")
+                                return 13
+                        reused = False
+                        contour = contour_res = None
+                        try:
+                            contour = _build_contour(res)
+                        except Exception as exc:
+                            emit(f"Failed to access FieldWindow/Contour: {exc}")
+                            return 12
+                        contour_res = res
+
+                    seen = seen_components[integral_name]
                     for comp_name, comp_val in comps.items():
-                        if comp_name not in seen_components[integral_name]:
-                            seen_components[integral_name].append(comp_name)
+                        if comp_name not in seen:
+                            seen.append(comp_name)
                         col_name = integral_name if comp_name == "" else f"{integral_name}.{comp_name}"
-                        table[key][idx][col_name] = comp_val
+                        cells[col_name] = comp_val
                         outputs.append(f"{col_name}={comp_val}")
 
-                case_label = ",".join(f"{k}={v}" for k, v in case.items())
                 emit(f"{case_label} dx={dx} dy={dy}: " + ", ".join(outputs))
                 if step_sleep > 0:
                     time.sleep(step_sleep)
@@ -0,0 +1,65 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from QF_auto import labels  # noqa: E402
+
+
+class _ComError(Exception):
+    def __init__(self, hresult: int) -> None:
+        super().__init__(hresult)
+        self.hresult = hresult
+
+
+class _FakePythoncom:
+    DISPATCH_METHOD = 1
+    DISPATCH_PROPERTYGET = 2
+    DISPATCH_PROPERTYPUT = 4
+    com_error = _ComError
+
+
+class _FakeOle:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def GetIDsOfNames(self, name):
+        return {"Loading": 10, "Kxx": 11}[name]
+
+    def Invoke(self, dispid, lcid, flags, want_result, *args):
+        if not isinstance(dispid, int):
+            raise TypeError("dispid must be an int")
+        self.calls.append((dispid, flags, args))
+
+
+class _GeneratedContent:
+    # Shaped like a makepy wrapper: ((memid, lcid, invkind, 0), defargs).
+    _prop_map_put_ = {"Loading": ((10, 0, 4, 0), ())}
+
+    def __init__(self) -> None:
+        self._oleobj_ = _FakeOle()
+
+
+class SetPropTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(labels, "_com_mods", return_value=(None, _FakePythoncom))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_generated_put_map_yields_int_dispid(self) -> None:
+        content = _GeneratedContent()
+        schema = {}
+        labels._set_prop(content, "Loading", 5.0, schema)
+        self.assertEqual(content._oleobj_.calls, [(10, _FakePythoncom.DISPATCH_PROPERTYPUT, (5.0,))])
+        self.assertEqual(schema["Loading"], (10, _FakePythoncom.DISPATCH_PROPERTYPUT))
+
+    def test_name_outside_put_map_resolves_through_idispatch(self) -> None:
+        content = _GeneratedContent()
+        labels._set_prop(content, "Kxx", 2.0, {})
+        self.assertEqual(content._oleobj_.calls, [(11, _FakePythoncom.DISPATCH_PROPERTYPUT, (2.0,))])
+
+
+if __name__ == "__main__":
+    unittest.main()